@@ -1,34 +1,22 @@
 from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from app.database import SessionLocal
+from app.database import get_db
 from app.models.user import User
 from app.schemas.auth import Token, LoginData
 from app.core.security import create_access_token
-from passlib.context import CryptContext
+from app.core.passwords import PasswordHasherBusyError, password_busy_error, verify_password
 from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
 
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     login_data: LoginData,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Autentica o usuário e retorna um token JWT.
@@ -37,7 +25,7 @@ def login(
     password = login_data.password
 
     # Busca o usuário no banco pelo e-mail
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,14 +33,24 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Verifica se a senha está correta
-    if not verify_password(password, user.hashed_password):
+    # Verifica se a senha está correta (bcrypt roda no pool dedicado, fora do event loop)
+    try:
+        valid, new_hash = await verify_password(password, user.hashed_password)
+    except PasswordHasherBusyError:
+        raise password_busy_error()
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuário ou senha inválidos",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # O custo do bcrypt mudou desde que a senha foi gravada: salva o hash refeito
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+
     # Gera o token JWT
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
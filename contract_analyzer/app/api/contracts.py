@@ -1,37 +1,106 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from app.core.security import get_current_user
+from fastapi import APIRouter, UploadFile, File, Depends, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from app.core.security import get_current_user, get_events_user, create_events_token
+from app.core.user_cache import CurrentUser
+from app.core.metrics import STAGE_SECONDS
+import asyncio
+import json
+from decimal import Decimal
 from typing import Annotated
-from app.services.file_parser import extract_text
-from app.services.ai_service import GROQ_ENABLED, extract_contract_info_groq
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.models.contract import Contract
+from app.services.upload_spool import spool_upload, UploadTooLargeError
+from app.services.batch_upload import spool_batch, mark_duplicates, cleanup_batch
+from app.services.contract_pipeline import (
+    process_contract_upload, process_contract_batch, reanalyze_contract, save_contract, analyze_cached_upload
+)
+from app.services.file_parser import ALLOWED_EXTENSIONS
+from app.services.job_queue import job_queue, QueueFullError, JobError
+from app.services.contract_entities import replace_contract_entities, normalize_party_name
+from app.services.search_index import search_enabled, search_contracts, update_indexed_fields, remove_contract
+from app.services.near_duplicates import find_similar_contracts, unpack_signature
+from app.services.contract_events import contract_events, contract_event_data
+from sqlalchemy import and_, case, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal, get_db
+from app.models.contract import Contract, ContractParty, ContractAmount, next_row_version
+from app.models.contract_document import ContractDocument
+from app.models.contract_fingerprint import ContractFingerprint
 from app.schemas.contracts import ContractUpdate
+from app.core.config import (
+    CONTRACTS_PAGE_SIZE, CONTRACTS_MAX_PAGE_SIZE, CONTRACTS_STREAM_BATCH_SIZE, NEAR_DUPLICATE_MIN_SIMILARITY,
+    CONTRACT_EVENTS_TOKEN_SECONDS
+)
 
 
+router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Campos de um contrato que podem ser retornados na listagem
+CONTRACT_FIELDS = [
+    "id", "filename", "uploaded_by", "nomes_partes", "valores_monetarios",
+    "obrigacoes_principais", "dados_adicionais", "clausulas_rescisao"
+]
 
+# Leituras de um contrato ficam em cache no navegador, mas são sempre revalidadas
+# com If-None-Match (o servidor responde 304, sem corpo, se a versão não mudou)
+CONTRACT_CACHE_CONTROL = "private, no-cache"
+
+
+def contract_etag(contract_id: int, version: int) -> str:
+    return f'"{contract_id}-{version}"'
+
+
+def _etag_versions(header: str, contract_id: int) -> set[int] | None:
+    """
+    Versões do contrato citadas em um If-Match/If-None-Match (ex.: '"12-3", W/"12-4"').
+    Retorna None para "*" (qualquer versão); ETags de outros contratos são ignorados.
+    """
+    if header.strip() == "*":
+        return None
+    versions = set()
+    for tag in header.split(","):
+        prefix, _, version = tag.strip().removeprefix("W/").strip('"').partition("-")
+        if prefix == str(contract_id) and version.isdigit():
+            versions.add(int(version))
+    return versions
+
+
+def _etag_matches(header: str, contract_id: int, version: int) -> bool:
+    versions = _etag_versions(header, contract_id)
+    return versions is None or version in versions
 
-router = APIRouter()
 
-# Tipos de arquivos permitidos
-ALLOWED_EXTENSIONS = [".pdf", ".docx"]
+def _version_headers(contract_id: int, version: int) -> dict:
+    return {"ETag": contract_etag(contract_id, version), "Cache-Control": CONTRACT_CACHE_CONTROL}
 
 
-@router.post("/contracts/upload")
+def _contract_response(contract: Contract) -> JSONResponse:
+    return JSONResponse(
+        content={
+            "id": contract.id,
+            "filename": contract.filename,
+            "uploaded_by": contract.uploaded_by,
+            "nomes_partes": contract.nomes_partes,
+            "valores_monetarios": contract.valores_monetarios,
+            "obrigacoes_principais": contract.obrigacoes_principais,
+            "dados_adicionais": contract.dados_adicionais,
+            "clausulas_rescisao": contract.clausulas_rescisao
+        },
+        headers=_version_headers(contract.id, contract.version)
+    )
+
+
+@router.post("/contracts/upload", status_code=202)
 async def upload_contract(
     file: Annotated[UploadFile, File(..., description="Arquivo .pdf ou .docx do contrato")],
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Faz upload de um contrato, extrai o texto e simula análise por IA.
+    Recebe um contrato e agenda a extração do texto e a análise por IA.
+
+    Retorna imediatamente o ID do job; o resultado é consultado em /contracts/jobs/{job_id}.
+    Se o mesmo arquivo já foi analisado, o contrato é criado na hora (201) a partir do cache.
     """
     filename = file.filename
     extension = filename.lower().split(".")[-1]
@@ -42,72 +111,323 @@ async def upload_contract(
             detail=f"Tipo de arquivo não suportado: .{extension}. Apenas PDF e DOCX são permitidos.",
         )
 
-    # Verifica se o nome do arquivo já existe no banco
-    existing_contract = db.query(Contract).filter(Contract.filename == filename).first()
-    if existing_contract:
+    # Verifica se o nome do arquivo já existe no banco ou está sendo processado
+    existing_contract = await db.scalar(select(Contract.id).where(Contract.filename == filename))
+    if existing_contract or job_queue.has_pending_filename(filename):
         raise HTTPException(
             status_code=409,
             detail=f"Já existe um contrato com o nome de arquivo '{filename}'. Por favor, escolha outro nome."
         )
 
-    # Lê o conteúdo do arquivo
-    content = await file.read()
+    # Grava o arquivo em disco em blocos (sem carregá-lo inteiro na memória) e calcula o hash
+    try:
+        with STAGE_SECONDS.time(stage="spool"):
+            upload = await spool_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
     try:
-        # Extrai o texto do arquivo
-        extracted_text = extract_text(content, f".{extension}")
-    except ValueError as e:
-        raise HTTPException(status_code=422, detail=str(e))
+        # Arquivo idêntico já analisado (com o texto guardado): salva direto, sem extrair texto nem chamar a IA
+        cached = await analyze_cached_upload(upload)
+        if cached is not None:
+            try:
+                with STAGE_SECONDS.time(stage="db"):
+                    contract_id = await asyncio.to_thread(save_contract, filename, current_user.id, cached.analysis, cached.document)
+            except JobError as e:
+                raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+            return JSONResponse(status_code=201, content={
+                "id": contract_id,
+                "filename": filename,
+                "uploaded_by": current_user.username,
+                "analysis": cached.analysis,
+                "cached": True,
+                "similar_contract": cached.similar,
+                "message": "Contrato salvo no banco e analisado com sucesso!"
+            })
 
-    if GROQ_ENABLED:
         try:
-            # Faz a extração usando a IA Groq
-            analysis_result = extract_contract_info_groq(extracted_text)
-        except Exception as e:
+            job = job_queue.submit(
+                current_user.id,
+                filename,
+                process_contract_upload,
+                filename,
+                upload,
+                f".{extension}",
+                current_user.id,
+                current_user.username
+            )
+        except QueueFullError:
             raise HTTPException(
-                status_code=500,
-                detail=f"Erro ao processar o contrato com a IA: {str(e)}"
+                status_code=503,
+                detail="Muitos contratos em processamento. Tente novamente em instantes.",
+                headers={"Retry-After": "30"}
             )
-    else:
+    except BaseException:
+        # O job não foi criado: o arquivo temporário não será mais usado
+        upload.cleanup()
+        raise
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "filename": filename,
+        "status_url": f"/contracts/jobs/{job.id}",
+        "message": "Contrato recebido! A análise está em andamento."
+    }
+
+
+@router.post("/contracts/upload/batch")
+async def upload_contracts_batch(
+    files: Annotated[list[UploadFile], File(..., description="Arquivos .pdf/.docx ou arquivos .zip com contratos")],
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Faz upload de vários contratos de uma vez (arquivos soltos e/ou ZIPs).
+
+    Os nomes duplicados são verificados em uma única consulta, os arquivos são
+    analisados em paralelo e o resultado de cada um é enviado em NDJSON
+    (uma linha JSON por arquivo) assim que termina.
+    """
+    try:
+        with STAGE_SECONDS.time(stage="spool"):
+            items = await spool_batch(files)
+    except JobError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    await db.run_sync(mark_duplicates, items)
+
+    async def ndjson_lines():
+        async for line in process_contract_batch(items, current_user.id):
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(cleanup_batch, items)  # Garante a remoção dos temporários mesmo se o cliente desconectar
+    )
+
+
+@router.get("/contracts/jobs/{job_id}")
+def get_upload_job(
+    job_id: str,
+    current_user: CurrentUser = Depends(get_current_user)  # Protegido com JWT
+):
+    """
+    Consulta o status de um job de upload e, quando concluído, o resultado da análise.
+    """
+    job = job_queue.get(job_id)
+
+    if not job or job.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job '{job_id}' não encontrado."
+        )
+
+    return job.to_dict()
+
+
+@router.post("/contracts/{contract_id}/reanalyze", status_code=202)
+async def reanalyze_contract_route(
+    contract_id: int,
+    force: bool = Query(False, description="Ignora o cache e chama a IA novamente"),
+    current_user: CurrentUser = Depends(get_current_user),  # Protegido com JWT
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Agenda uma nova análise do contrato usando o texto extraído no upload,
+    sem reenviar nem reprocessar o arquivo. O resultado é consultado em /contracts/jobs/{job_id}.
+    """
+    contract = await db.get(Contract, contract_id)
+    if not contract:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Contrato com ID '{contract_id}' não encontrado."
+        )
+
+    has_document = await db.scalar(select(ContractDocument.contract_id).where(ContractDocument.contract_id == contract_id))
+    if not has_document:
+        raise HTTPException(
+            status_code=409,
+            detail="O texto deste contrato não foi armazenado (enviado antes desta funcionalidade). Envie o arquivo novamente."
+        )
+
+    try:
+        job = job_queue.submit(current_user.id, contract.filename, reanalyze_contract, contract_id, force)
+    except QueueFullError:
         raise HTTPException(
             status_code=503,
-            detail="Serviço de IA (Groq) não está habilitado. Configure a chave API para usar esta funcionalidade."
+            detail="Muitos contratos em processamento. Tente novamente em instantes.",
+            headers={"Retry-After": "30"}
+        )
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "filename": contract.filename,
+        "status_url": f"/contracts/jobs/{job.id}",
+        "message": "Reanálise do contrato agendada."
+    }
+
+
+@router.get("/contracts/{contract_id}/similar")
+async def get_similar_contracts(
+    contract_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    min_similarity: float = Query(NEAR_DUPLICATE_MIN_SIMILARITY, ge=0, le=1, description="Semelhança mínima, de 0 a 1"),
+    current_user: CurrentUser = Depends(get_current_user),  # Protegido com JWT
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Lista os contratos com texto semelhante ao do contrato informado (cópias
+    renomeadas, versões editadas), do mais semelhante para o menos.
+    """
+    contract = await db.get(Contract, contract_id)
+
+    if not contract:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Contrato com ID '{contract_id}' não encontrado."
+        )
+
+    fingerprint = await db.get(ContractFingerprint, contract_id)
+    if fingerprint is None:
+        raise HTTPException(
+            status_code=409,
+            detail="O texto deste contrato não foi armazenado (enviado antes desta funcionalidade). Envie o arquivo novamente."
         )
 
-    # Salvar contrato no banco
-    db_contract = Contract(
-        filename=filename,
-        uploaded_by=current_user.id,  # agora usa o id real do usuário logado
-        nomes_partes="; ".join(analysis_result["nomes_partes"]),
-        valores_monetarios="; ".join(analysis_result["valores_monetarios"]),
-        obrigacoes_principais="\n".join(analysis_result["obrigacoes_principais"]),
-        dados_adicionais=analysis_result["dados_adicionais"],
-        clausulas_rescisao="; ".join(analysis_result["clausulas_rescisao"])
+    similar = await db.run_sync(
+        find_similar_contracts, unpack_signature(fingerprint.signature), limit, min_similarity, contract_id
+    )
+    return {"id": contract_id, "similar_contracts": similar}
+
+
+@router.post("/contracts/events/token")
+async def contract_events_token(current_user: CurrentUser = Depends(get_current_user)):
+    """
+    Gera um token de curta duração, válido apenas para abrir o fluxo de
+    eventos (GET /contracts/events?token=...). O EventSource do navegador
+    não envia cabeçalhos, e o token de login na URL ficaria nos logs de acesso.
+    """
+    return {"token": create_events_token(current_user.id), "expires_in": CONTRACT_EVENTS_TOKEN_SECONDS}
+
+
+@router.get("/contracts/events")
+async def contract_events_stream(
+    last_event_id: str | None = Header(None, description="ID do último evento recebido (enviado pelo EventSource ao reconectar)"),
+    last_event_id_param: str | None = Query(None, alias="last_event_id", description="Igual ao cabeçalho Last-Event-ID, para uma nova conexão do cliente"),
+    current_user: CurrentUser = Depends(get_events_user)  # Token de login no header ou token do fluxo em ?token=
+):
+    """
+    Fluxo de eventos dos contratos (Server-Sent Events): contract_created,
+    contract_updated, contract_analyzed (com os campos do contrato) e
+    contract_deleted (só o ID).
+
+    Ao reconectar com Last-Event-ID (cabeçalho ou parâmetro last_event_id), o
+    cliente recebe os eventos perdidos; se não for possível, recebe "resync"
+    e deve recarregar a lista. Sem eventos perdidos, recebe "ready" com o ID atual.
+    """
+    return StreamingResponse(
+        contract_events.stream(last_event_id or last_event_id_param),
+        media_type="text/event-stream",
+        # Sem cache e sem buffer em proxies (ex.: nginx), para os eventos chegarem na hora
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
-    db.add(db_contract)
-    db.commit()
-    db.refresh(db_contract)
+
+@router.get("/contracts/search")
+async def search_contracts_route(
+    q: str = Query(..., min_length=1, description='Termos da busca; use "aspas" para frases e * para prefixo'),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: CurrentUser = Depends(get_current_user),  # Protegido com JWT
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Busca textual nas análises e no texto dos contratos, ordenada por relevância.
+
+    Retorna trechos com os termos encontrados destacados com <mark>.
+    """
+    if not search_enabled(db.get_bind()):
+        raise HTTPException(status_code=501, detail="A busca textual está disponível apenas com SQLite (FTS5).")
+
+    results, total = await db.run_sync(search_contracts, q, limit, offset)
 
     return {
-        "id": db_contract.id,
-        "filename": filename,
-        "uploaded_by": current_user.username,
-        "analysis": analysis_result,
-        "message": "Contrato salvo no banco e analisado com sucesso!"
+        "results": results,
+        "total": total,
+        "next_offset": offset + limit if offset + limit < total else None
+    }
+
+
+@router.get("/contracts/filter")
+async def filter_contracts(
+    valor_min: Decimal | None = Query(None, ge=0, description="Valor mínimo em reais (ex.: 1000.50)"),
+    valor_max: Decimal | None = Query(None, ge=0, description="Valor máximo em reais"),
+    parte: str | None = Query(None, min_length=1, description="Início do nome de uma das partes (sem diferenciar acentos/maiúsculas)"),
+    limit: int = Query(CONTRACTS_PAGE_SIZE, ge=1, le=CONTRACTS_MAX_PAGE_SIZE),
+    cursor: int | None = Query(None, description="Valor de `next_cursor` da página anterior"),
+    current_user: CurrentUser = Depends(get_current_user),  # Protegido com JWT
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Lista contratos com algum valor monetário na faixa informada e/ou com uma
+    parte cujo nome começa com o texto informado. Os filtros usam as tabelas
+    indexadas de partes e valores, direto no banco.
+    """
+    query = select(Contract.id, Contract.filename, Contract.nomes_partes, Contract.valores_monetarios)
+
+    if valor_min is not None or valor_max is not None:
+        amount_filters = []
+        if valor_min is not None:
+            amount_filters.append(ContractAmount.cents >= int(valor_min * 100))
+        if valor_max is not None:
+            amount_filters.append(ContractAmount.cents <= int(valor_max * 100))
+        query = query.where(Contract.amounts.any(and_(*amount_filters)))
+
+    if parte:
+        # Busca por prefixo como faixa (>= prefixo e < prefixo + maior caractere) para usar o índice
+        prefix = normalize_party_name(parte)
+        query = query.where(Contract.parties.any(and_(
+            ContractParty.name_normalized >= prefix,
+            ContractParty.name_normalized < prefix + "\uffff"
+        )))
+
+    if cursor is not None:
+        query = query.where(Contract.id > cursor)
+
+    result = await db.execute(query.order_by(Contract.id).limit(limit + 1))
+    contract_list = [row._asdict() for row in result]
+    has_more = len(contract_list) > limit
+    contract_list = contract_list[:limit]
+
+    return {
+        "contracts": contract_list,
+        "total": len(contract_list),
+        "next_cursor": contract_list[-1]["id"] if has_more else None
     }
 
 
 @router.get("/contracts/by-name/{contract_name}")
-def get_contract_by_name(
+async def get_contract_by_name(
     contract_name: str,
-    current_user: dict = Depends(get_current_user),  # Protege com JWT
-    db: Session = Depends(get_db)
+    if_none_match: str | None = Header(None, description="ETag da leitura anterior; responde 304 se o contrato não mudou"),
+    current_user: CurrentUser = Depends(get_current_user),  # Protege com JWT
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Busca um contrato pelo nome do arquivo e retorna suas informações.
     """
-    contract = db.query(Contract).filter(Contract.filename == contract_name).first()
+    if if_none_match:
+        current = (await db.execute(
+            select(Contract.id, Contract.version).where(Contract.filename == contract_name)
+        )).first()
+        if current is not None and _etag_matches(if_none_match, current.id, current.version):
+            return Response(status_code=304, headers=_version_headers(current.id, current.version))
+
+    contract = await db.scalar(select(Contract).where(Contract.filename == contract_name))
 
     if not contract:
         raise HTTPException(
@@ -115,28 +435,28 @@ def get_contract_by_name(
             detail=f"Contrato com nome '{contract_name}' não encontrado."
         )
 
-    return {
-        "id": contract.id,
-        "filename": contract.filename,
-        "uploaded_by": contract.uploaded_by,
-        "nomes_partes": contract.nomes_partes,
-        "valores_monetarios": contract.valores_monetarios,
-        "obrigacoes_principais": contract.obrigacoes_principais,
-        "dados_adicionais": contract.dados_adicionais,
-        "clausulas_rescisao": contract.clausulas_rescisao
-    }
+    return _contract_response(contract)
 
 
 @router.get("/contracts/{contract_id}")
-def get_contract_by_id(
+async def get_contract_by_id(
     contract_id: int,
-    current_user: dict = Depends(get_current_user),  # Protegido com JWT
-    db: Session = Depends(get_db)
+    if_none_match: str | None = Header(None, description="ETag da leitura anterior; responde 304 se o contrato não mudou"),
+    current_user: CurrentUser = Depends(get_current_user),  # Protegido com JWT
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Busca um contrato pelo ID e retorna suas informações.
+
+    A resposta tem o ETag da versão do contrato; com If-None-Match, se ela não
+    mudou, responde 304 consultando só a versão.
     """
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    if if_none_match:
+        version = await db.scalar(select(Contract.version).where(Contract.id == contract_id))
+        if version is not None and _etag_matches(if_none_match, contract_id, version):
+            return Response(status_code=304, headers=_version_headers(contract_id, version))
+
+    contract = await db.get(Contract, contract_id)
 
     if not contract:
         raise HTTPException(
@@ -144,99 +464,179 @@ def get_contract_by_id(
             detail=f"Contrato com ID '{contract_id}' não encontrado."
         )
 
-    return {
-        "id": contract.id,
-        "filename": contract.filename,
-        "uploaded_by": contract.uploaded_by,
-        "nomes_partes": contract.nomes_partes,
-        "valores_monetarios": contract.valores_monetarios,
-        "obrigacoes_principais": contract.obrigacoes_principais,
-        "dados_adicionais": contract.dados_adicionais,
-        "clausulas_rescisao": contract.clausulas_rescisao
-    }
+    return _contract_response(contract)
+
+
+def _parse_fields(fields: str | None) -> list[str]:
+    """
+    Converte o parâmetro `fields` (ex.: "filename,nomes_partes") na lista de
+    colunas a consultar. O "id" é sempre incluído, pois é o cursor da paginação.
+    """
+    if not fields:
+        return CONTRACT_FIELDS
+
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    invalid = [field for field in selected if field not in CONTRACT_FIELDS]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos inválidos: {', '.join(invalid)}. Campos disponíveis: {', '.join(CONTRACT_FIELDS)}."
+        )
+
+    return ["id"] + [field for field in CONTRACT_FIELDS if field in selected and field != "id"]
+
+
+async def _query_page(db: AsyncSession, columns: list[str], cursor: int | None, limit: int) -> list[dict]:
+    # Paginação por cursor (keyset): usa o índice da chave primária em vez de OFFSET
+    query = select(*[getattr(Contract, column) for column in columns])
+    if cursor is not None:
+        query = query.where(Contract.id > cursor)
+    result = await db.execute(query.order_by(Contract.id).limit(limit))
+    return [row._asdict() for row in result]
+
+
+async def _stream_contracts(columns: list[str], cursor: int | None):
+    """
+    Gera os contratos em NDJSON lendo o banco em lotes, com memória constante.
+    """
+    async with AsyncSessionLocal() as db:
+        while True:
+            page = await _query_page(db, columns, cursor, CONTRACTS_STREAM_BATCH_SIZE)
+            if not page:
+                break
+            yield "".join(json.dumps(contract, ensure_ascii=False) + "\n" for contract in page)
+            cursor = page[-1]["id"]
 
 
 @router.get("/contracts")
-def list_all_contracts(
-    current_user: dict = Depends(get_current_user),  # Protegido com JWT
-    db: Session = Depends(get_db)
+async def list_all_contracts(
+    limit: int = Query(CONTRACTS_PAGE_SIZE, ge=1, le=CONTRACTS_MAX_PAGE_SIZE, description="Contratos por página"),
+    cursor: int | None = Query(None, description="Valor de `next_cursor` da página anterior"),
+    fields: str | None = Query(None, description="Campos retornados, separados por vírgula (padrão: todos)"),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$", description="json (paginado) ou ndjson (todos os contratos em streaming)"),
+    current_user: CurrentUser = Depends(get_current_user),  # Protegido com JWT
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Lista todos os contratos salvos no banco de dados.
+    Lista os contratos salvos no banco de dados, paginados por cursor.
+
+    Use `fields` para trazer apenas as colunas necessárias e `format=ndjson`
+    para receber todos os contratos (a partir do cursor) em streaming.
     """
-    contracts = db.query(Contract).all()
+    columns = _parse_fields(fields)
 
-    if not contracts:
-        raise HTTPException(status_code=404, detail="Nenhum contrato encontrado.")
+    if response_format == "ndjson":
+        return StreamingResponse(_stream_contracts(columns, cursor), media_type="application/x-ndjson")
 
-    # Monta a lista com os contratos
-    contract_list = [
-        {
-            "id": c.id,
-            "filename": c.filename,
-            "uploaded_by": c.uploaded_by,
-            "nomes_partes": c.nomes_partes,
-            "valores_monetarios": c.valores_monetarios,
-            "obrigacoes_principais": c.obrigacoes_principais,
-            "dados_adicionais": c.dados_adicionais,
-            "clausulas_rescisao": c.clausulas_rescisao
-        }
-        for c in contracts
-    ]
+    # Busca um registro a mais para saber se existe próxima página
+    contract_list = await _query_page(db, columns, cursor, limit + 1)
+    has_more = len(contract_list) > limit
+    contract_list = contract_list[:limit]
 
-    return {"contracts": contract_list, "total": len(contract_list)}
+    if not contract_list and cursor is None:
+        raise HTTPException(status_code=404, detail="Nenhum contrato encontrado.")
+
+    return {
+        "contracts": contract_list,
+        "total": len(contract_list),
+        "next_cursor": contract_list[-1]["id"] if has_more else None
+    }
 
 
 @router.put("/contracts/{contract_id}")
-def update_contract(
+async def update_contract(
     contract_id: int,
     contract_data: ContractUpdate,
-    current_user: dict = Depends(get_current_user),  # Protegido com JWT
-    db: Session = Depends(get_db)
+    if_match: str | None = Header(None, description="ETag lido no GET; se o contrato mudou desde então, responde 412"),
+    current_user: CurrentUser = Depends(get_current_user),  # Protegido com JWT
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Atualiza os dados de um contrato pelo ID.
+    Atualiza os campos enviados de um contrato com um único UPDATE ... RETURNING
+    (sem ler o contrato antes).
+
+    Com If-Match, só grava se o contrato ainda estiver na versão informada;
+    caso contrário responde 412 com o ETag atual. Sem nenhum campo no corpo,
+    nada é gravado: retorna o contrato atual, com a mesma versão.
     """
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    update_data = contract_data.model_dump(exclude_unset=True)
 
-    if not contract:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Contrato com ID '{contract_id}' não encontrado."
-        )
+    conditions = [Contract.id == contract_id]
+    if if_match is not None:
+        versions = _etag_versions(if_match, contract_id)
+        if versions is not None:
+            conditions.append(Contract.version.in_(versions))
 
-    # Atualiza somente os campos enviados no JSON
-    update_data = contract_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(contract, field, value)
+    returned = [
+        Contract.id, Contract.filename, Contract.nomes_partes, Contract.valores_monetarios,
+        Contract.obrigacoes_principais, Contract.dados_adicionais, Contract.clausulas_rescisao, Contract.version
+    ]
+    if not update_data:
+        # Nada a alterar: não muda a versão (o ETag dos clientes continua válido) nem publica evento
+        updated = (await db.execute(select(*returned).where(*conditions))).first()
+    else:
+        # Mesma regra de next_row_version, calculada no banco
+        now = next_row_version()
+        try:
+            updated = (await db.execute(
+                update(Contract)
+                .where(*conditions)
+                .values(**update_data, version=case((Contract.version >= now, Contract.version + 1), else_=now))
+                .returning(*returned)
+                .execution_options(synchronize_session=False)
+            )).first()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail=f"Já existe um contrato com o nome de arquivo '{update_data.get('filename')}'. Por favor, escolha outro nome."
+            )
 
-    db.commit()
-    db.refresh(contract) # O refresh apenas recarrega o objeto do banco após o commit.
+    if updated is None:
+        # Nada foi atualizado: o contrato não existe ou mudou de versão
+        version = await db.scalar(select(Contract.version).where(Contract.id == contract_id))
+        if version is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Contrato com ID '{contract_id}' não encontrado."
+            )
+        raise HTTPException(
+            status_code=412,
+            detail="O contrato foi alterado desde a última leitura. Carregue-o novamente antes de salvar.",
+            headers={"ETag": contract_etag(contract_id, version)}
+        )
 
-    return {
-        "message": f"Contrato com ID '{contract_id}' atualizado com sucesso!",
-        "updated_contract": {
-            "id": contract.id,
-            "filename": contract.filename,
-            "nomes_partes": contract.nomes_partes,
-            "valores_monetarios": contract.valores_monetarios,
-            "obrigacoes_principais": contract.obrigacoes_principais,
-            "dados_adicionais": contract.dados_adicionais,
-            "clausulas_rescisao": contract.clausulas_rescisao,
-        }
-    }
+    if update_data:
+        # Partes/valores normalizados e índice de busca: só os campos alterados
+        await db.run_sync(replace_contract_entities, contract_id, update_data)
+        await db.run_sync(update_indexed_fields, contract_id, update_data)
+        await db.commit()
+        contract_events.publish("contract_updated", contract_event_data(updated))
+        message = f"Contrato com ID '{contract_id}' atualizado com sucesso!"
+    else:
+        message = f"Nenhum campo enviado; o contrato com ID '{contract_id}' não foi alterado."
+
+    updated_contract = updated._asdict()
+    version = updated_contract.pop("version")
+    return JSONResponse(
+        content={
+            "message": message,
+            "updated_contract": updated_contract
+        },
+        headers={"ETag": contract_etag(contract_id, version)}
+    )
 
 
 @router.delete("/contracts/{contract_id}")
-def delete_contract(
+async def delete_contract(
     contract_id: int,
-    current_user: dict = Depends(get_current_user),  # Protegido com JWT
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),  # Protegido com JWT
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Deleta um contrato pelo nome do arquivo.
     """
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    contract = await db.get(Contract, contract_id)
 
     if not contract:
         raise HTTPException(
@@ -244,8 +644,10 @@ def delete_contract(
             detail=f"Contrato com ID '{contract_id}' não encontrado."
         )
 
-    db.delete(contract)
-    db.commit()
+    await db.run_sync(remove_contract, contract_id)
+    await db.delete(contract)
+    await db.commit()
+    contract_events.publish("contract_deleted", {"id": contract_id})
 
     return {
         "message": f"Contrato com ID '{contract_id}' excluído com sucesso!"
@@ -256,7 +658,7 @@ def delete_contract(
 # Rota de teste protegida com JWT (DEBUG)
 # -----------------------------------------------------
 # @router.get("/contracts/protected")
-# def protected_route(current_user: dict = Depends(get_current_user)):
+# def protected_route(current_user: CurrentUser = Depends(get_current_user)):
 #     """
 #     Rota protegida para testar autenticação JWT (uso interno).
 #     """
@@ -0,0 +1,22 @@
+import secrets
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from app.core.config import METRICS_TOKEN
+from app.core.metrics import render_metrics
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics(authorization: str | None = Header(default=None)):
+    """
+    Métricas da aplicação no formato de texto do Prometheus: latência por rota
+    e por etapa do processamento, chamadas e tokens da IA, fila de jobs e caches.
+
+    Se METRICS_TOKEN estiver definido, exige o cabeçalho `Authorization: Bearer <token>`.
+    """
+    if METRICS_TOKEN and not secrets.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de métricas inválido.")
+
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
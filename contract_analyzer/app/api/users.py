@@ -1,37 +1,25 @@
 from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from app.database import SessionLocal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
 from app.models.user import User
 from app.schemas.users import UserRegister, UserResponse
+from app.core.passwords import PasswordHasherBusyError, password_busy_error, hash_password
 
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
 
 
 @router.post("/users/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_data: UserRegister,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Registra um novo usuário no banco de dados.
     """
     # Verifica se o e-mail já está cadastrado
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -39,15 +27,18 @@ async def register_user(
         )
 
     # Verifica se o username já está cadastrado
-    existing_username = db.query(User).filter(User.username == user_data.username).first()
+    existing_username = await db.scalar(select(User).where(User.username == user_data.username))
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Já existe um usuário com este username."
         )
 
-    # Gera hash da senha
-    hashed_password = get_password_hash(user_data.password)
+    # Gera hash da senha (no pool dedicado ao bcrypt, sem bloquear o event loop)
+    try:
+        hashed_password = await hash_password(user_data.password)
+    except PasswordHasherBusyError:
+        raise password_busy_error()
 
     # Cria o objeto User
     new_user = User(
@@ -59,7 +50,6 @@ async def register_user(
 
     # Adiciona e salva no banco
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
 
     return new_user
@@ -0,0 +1,52 @@
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+
+# Folga para os cabeçalhos e delimitadores do multipart além do próprio arquivo
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def _too_large_detail(max_bytes: int) -> str:
+    size = f"{max_bytes // (1024 * 1024)} MB" if max_bytes >= 1024 * 1024 else f"{max_bytes // 1024} KB"
+    return f"A requisição excede o tamanho máximo de {size}."
+
+
+class RequestBodyLimitMiddleware:
+    """
+    Middleware ASGI que limita o tamanho do corpo das rotas de upload antes
+    que o Starlette o leia (o multipart é lido inteiro, para a memória e
+    arquivos temporários, antes de a rota executar).
+
+    Recusa com 413 pelo Content-Length, sem ler o corpo; sem ele (envio em
+    partes), interrompe a leitura assim que o limite é ultrapassado.
+    """
+
+    def __init__(self, app, limits: dict[str, int]):
+        self.app = app
+        self.limits = limits  # Caminho da rota -> bytes permitidos no corpo
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            response = JSONResponse(status_code=413, content={"detail": _too_large_detail(max_bytes)})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # O FastAPI repassa HTTPException lançada durante a leitura do formulário
+                    raise HTTPException(status_code=413, detail=_too_large_detail(max_bytes))
+            return message
+
+        await self.app(scope, limited_receive, send)
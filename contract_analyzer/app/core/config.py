@@ -12,6 +12,20 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 600))
 
 # Banco de dados
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./db.sqlite3")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))  # Conexões mantidas abertas no pool
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))  # Conexões extras permitidas em picos
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # Segundos aguardando uma conexão livre
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Segundos até uma conexão ser reaberta (-1 desativa)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # Testa a conexão antes de usá-la
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))  # Espera por um lock antes de "database is locked"
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # NORMAL é seguro com WAL e bem mais rápido que FULL
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 65536))  # Cache de páginas por conexão
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))  # Bytes do arquivo lidos via mmap (0 desativa)
+
+# Listagem de contratos
+CONTRACTS_PAGE_SIZE = int(os.getenv("CONTRACTS_PAGE_SIZE", 50))  # Contratos por página quando `limit` não é informado
+CONTRACTS_MAX_PAGE_SIZE = int(os.getenv("CONTRACTS_MAX_PAGE_SIZE", 500))
+CONTRACTS_STREAM_BATCH_SIZE = int(os.getenv("CONTRACTS_STREAM_BATCH_SIZE", 500))  # Linhas lidas por consulta no modo NDJSON
 
 # CORS configs
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
@@ -19,7 +33,76 @@ ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 
 # Configs do Groq
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_API_BASE = "https://api.groq.com/openai/v1"
+GROQ_API_BASE = os.getenv("GROQ_API_BASE", "https://api.groq.com/openai/v1")  # Pode apontar para um servidor compatível local
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama3-70b-8192")
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", 4))  # Chamadas simultâneas à API do Groq
+GROQ_TIMEOUT_SECONDS = float(os.getenv("GROQ_TIMEOUT_SECONDS", 60))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", 4))  # Novas tentativas após 429, 5xx ou falha de conexão
+GROQ_BACKOFF_BASE_SECONDS = float(os.getenv("GROQ_BACKOFF_BASE_SECONDS", 1))
+GROQ_BACKOFF_MAX_SECONDS = float(os.getenv("GROQ_BACKOFF_MAX_SECONDS", 30))
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", 30))  # Cota de requisições da conta (0 = sem limite)
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TOKENS_PER_MINUTE", 0))  # Cota de tokens da conta (0 = sem limite)
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", 20))  # Conexões HTTP keep-alive reaproveitadas
+CHUNK_MAX_CHARS = int(os.getenv("CHUNK_MAX_CHARS", 12000))  # Tamanho máximo de cada trecho enviado à IA
+GROQ_JSON_MODE = os.getenv("GROQ_JSON_MODE", "true").lower() == "true"  # Pede resposta em JSON (response_format json_object)
+ANALYSIS_REASK_ATTEMPTS = int(os.getenv("ANALYSIS_REASK_ATTEMPTS", 1))  # Novos pedidos só com os campos que faltaram na resposta
+TEXT_PREPROCESSING = os.getenv("TEXT_PREPROCESSING", "true").lower() == "true"  # Limpa o texto (cabeçalhos, rodapés, assinaturas, espaços) antes de enviá-lo à IA
+ANALYSIS_TOKEN_BUDGET = int(os.getenv("ANALYSIS_TOKEN_BUDGET", 0))  # Tokens (estimados) do contrato enviados à IA; seções pouco relevantes são cortadas primeiro (0 = sem limite)
+BOILERPLATE_MIN_REPEATS = int(os.getenv("BOILERPLATE_MIN_REPEATS", 3))  # Linhas curtas repetidas este número de vezes são tratadas como cabeçalho/rodapé
+ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "llm")  # llm (só IA), rules (só regras locais, offline) ou hybrid (regras + IA para o que faltar)
+
+# Fila de processamento de uploads
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", 4))  # Quantidade de contratos processados em paralelo
+UPLOAD_QUEUE_MAX_SIZE = int(os.getenv("UPLOAD_QUEUE_MAX_SIZE", 100))  # Jobs aguardando antes de recusar novos uploads
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", 3600))  # Tempo que o status de um job finalizado fica disponível
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", 5000))  # Arquivos por upload em lote (contando os de dentro de ZIPs)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 4))  # Arquivos de um lote processados ao mesmo tempo
+BATCH_COMMIT_SIZE = int(os.getenv("BATCH_COMMIT_SIZE", 100))  # Contratos gravados por commit no upload em lote
+
+# Eventos de contratos em tempo real (GET /contracts/events, Server-Sent Events)
+CONTRACT_EVENTS_BUFFER_SIZE = int(os.getenv("CONTRACT_EVENTS_BUFFER_SIZE", 1000))  # Últimos eventos guardados para quem reconecta com Last-Event-ID
+CONTRACT_EVENTS_QUEUE_SIZE = int(os.getenv("CONTRACT_EVENTS_QUEUE_SIZE", 100))  # Eventos pendentes por cliente antes de encerrar a conexão (ele reconecta e retoma)
+CONTRACT_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("CONTRACT_EVENTS_HEARTBEAT_SECONDS", 15))  # Intervalo dos comentários que mantêm a conexão aberta
+CONTRACT_EVENTS_MAX_STREAM_SECONDS = float(os.getenv("CONTRACT_EVENTS_MAX_STREAM_SECONDS", 120))  # Duração máxima de cada conexão; o cliente reconecta com um novo token e retoma
+CONTRACT_EVENTS_TOKEN_SECONDS = int(os.getenv("CONTRACT_EVENTS_TOKEN_SECONDS", 60))  # Validade do token da URL do fluxo de eventos (só é conferido ao conectar)
+
+# Recebimento dos arquivos
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 100 * 1024 * 1024))  # Tamanho máximo de cada contrato enviado
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", 2 * 1024 * 1024 * 1024))  # Tamanho máximo da requisição do upload em lote (todos os arquivos)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))  # Bytes lidos por vez ao gravar o upload em disco
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None  # Diretório temporário dos uploads (padrão do sistema)
+
+# Cache de análises (por hash do documento + modelo + versão do prompt)
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", 10000))  # 0 desativa o cache
+
+# Contratos semelhantes (assinaturas MinHash do texto extraído, buscadas por LSH)
+NEAR_DUPLICATE_DETECTION = os.getenv("NEAR_DUPLICATE_DETECTION", "true").lower() == "true"  # Procura contratos semelhantes a cada upload
+NEAR_DUPLICATE_MIN_SIMILARITY = float(os.getenv("NEAR_DUPLICATE_MIN_SIMILARITY", 0.8))  # Semelhança mínima (0 a 1) para informar o contrato semelhante
+NEAR_DUPLICATE_REUSE_SIMILARITY = float(os.getenv("NEAR_DUPLICATE_REUSE_SIMILARITY", 0.97))  # A partir desta semelhança (e com os mesmos valores, CNPJ/CPF e datas) a análise é reaproveitada (acima de 1 desativa)
+
+# Extração de texto de PDFs
+PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", os.cpu_count() or 1))  # Processos usados para PDFs grandes (1 desativa)
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 20))  # A partir de quantas páginas o PDF é dividido entre os processos
+
+# Cache dos usuários autenticados (evita consultar o banco a cada requisição)
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", 300))  # Tempo máximo que um usuário fica em cache (0 desativa)
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))  # Usuários mantidos em memória
+
+# Hash de senhas (bcrypt)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))  # Custo do bcrypt; senhas com outro custo são refeitas no próximo login
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))  # Threads dedicadas ao bcrypt
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))  # Hashes em andamento/na fila antes de responder 503
+
+# Armazenamento do texto extraído dos contratos (para reanálise sem reenviar o arquivo)
+DOCUMENT_COMPRESSION = os.getenv("DOCUMENT_COMPRESSION", "zstd")  # zstd (se o pacote zstandard estiver instalado) ou gzip
+DOCUMENT_COMPRESSION_LEVEL = int(os.getenv("DOCUMENT_COMPRESSION_LEVEL", 6))
 
+# Métricas (GET /metrics, formato Prometheus)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None  # Se definido, o /metrics exige "Authorization: Bearer <token>"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()  # Nível mínimo dos logs em JSON (DEBUG, INFO, WARNING, ERROR)
 
+# Reanálise em lote (python -m app.services.bulk_reanalysis)
+REANALYSIS_BATCH_SIZE = int(os.getenv("REANALYSIS_BATCH_SIZE", 50))  # Contratos lidos do banco e salvos no checkpoint por vez
+REANALYSIS_CONCURRENCY = int(os.getenv("REANALYSIS_CONCURRENCY", 2))  # Contratos reanalisados ao mesmo tempo
+REANALYSIS_REQUESTS_PER_MINUTE = int(os.getenv("REANALYSIS_REQUESTS_PER_MINUTE", 10))  # Parte da cota do Groq usada pela reanálise (0 = sem limite)
+REANALYSIS_CHECKPOINT_FILE = os.getenv("REANALYSIS_CHECKPOINT_FILE", "reanalysis_checkpoint.json")
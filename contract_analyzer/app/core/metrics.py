@@ -0,0 +1,249 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Limites (em segundos) dos histogramas de latência: de 5 ms a 2 minutos
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """
+    Métrica com rótulos, exposta em GET /metrics no formato de texto do Prometheus.
+
+    Os valores ficam em memória no processo da API e são atualizados tanto no
+    event loop quanto em threads, por isso o acesso é protegido por um lock.
+    """
+    type_name = ""
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"A métrica {self.name} usa os rótulos {self.labels}, recebeu {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in values.items()]
+
+
+class Gauge(_Metric):
+    """
+    Valor que sobe e desce. Com `function`, o valor é calculado na hora da
+    leitura (ex.: tamanho de uma fila mantida por outro módulo).
+    """
+    type_name = "gauge"
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = (), function=None):
+        super().__init__(name, description, labels)
+        self.function = function
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self) -> list[str]:
+        if self.function is not None:
+            return [f"{self.name} {_format_value(self.function())}"]
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in values.items()]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for index, limit in enumerate(self.buckets):
+                if value <= limit:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def snapshot(self, **labels) -> tuple[int, float]:
+        """
+        Quantidade de observações e soma, para calcular médias entre dois momentos.
+        """
+        with self._lock:
+            counts, total = self._values.get(self._key(labels), ((), 0.0))
+            return sum(counts), total
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Mede a duração do bloco `with` (inclusive se ele terminar com erro).
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+
+        lines = []
+        for key, (counts, total) in values.items():
+            cumulative = 0
+            for limit, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(limit)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+def render_metrics() -> str:
+    """
+    Todas as métricas registradas, no formato de texto do Prometheus (versão 0.0.4).
+    """
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+def hit_ratio(counter: Counter) -> float:
+    hits = counter.get(result="hit")
+    total = hits + counter.get(result="miss")
+    return hits / total if total else 0.0
+
+
+# Requisições HTTP (a rota é o modelo do caminho, ex.: /contracts/{contract_id})
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Requisições HTTP atendidas.", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Duração das requisições HTTP, até o fim do corpo da resposta.", ("method", "route")
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requisições HTTP em andamento."
+)
+
+# Etapas do processamento de um contrato: spool (gravação do upload em disco),
+# cache, parse (extração do texto), similarity (busca de contratos semelhantes),
+# rules, preprocess, llm e db (gravação no banco)
+STAGE_SECONDS = Histogram(
+    "pipeline_stage_duration_seconds", "Duração de cada etapa do processamento dos contratos.", ("stage",)
+)
+
+# Fila de jobs
+JOBS_IN_FLIGHT = Gauge(
+    "jobs_in_flight", "Jobs da fila aguardando ou em processamento.", ("status",)
+)
+JOBS_FINISHED = Counter(
+    "jobs_finished_total", "Jobs finalizados, por status HTTP equivalente.", ("status_code",)
+)
+
+# Eventos de contratos (GET /contracts/events)
+CONTRACT_EVENTS_PUBLISHED = Counter(
+    "contract_events_published_total", "Eventos de contratos publicados, por tipo.", ("type",)
+)
+CONTRACT_EVENT_SUBSCRIBERS = Gauge(
+    "contract_event_subscribers", "Clientes conectados ao fluxo de eventos de contratos."
+)
+
+# Tokens (estimados) do texto dos contratos antes e depois do pré-processamento
+PREPROCESS_TOKENS = Counter(
+    "text_preprocess_tokens_total", "Tokens estimados do texto enviado à IA, antes e depois do pré-processamento.", ("stage",)
+)
+
+# Chamadas ao Groq
+LLM_REQUESTS = Counter(
+    "llm_requests_total", "Chamadas HTTP à API da IA, incluindo as novas tentativas.", ("outcome",)
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds", "Duração de cada chamada HTTP à API da IA.", ("outcome",)
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "Tokens consumidos na API da IA, conforme response.usage.", ("model", "type")
+)
+
+# Hash de senhas (bcrypt), incluindo a espera pelo pool de threads
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds", "Duração de cada hash ou verificação de senha, por operação.", ("operation",)
+)
+PASSWORD_OPERATIONS = Counter(
+    "password_operations_total", "Hashes e verificações de senha, por resultado (recusadas com 503 por sobrecarga: rejected).",
+    ("operation", "result")
+)
+
+# Caches
+ANALYSIS_CACHE_LOOKUPS = Counter(
+    "analysis_cache_lookups_total", "Consultas ao cache de análises.", ("result",)
+)
+USER_CACHE_LOOKUPS = Counter(
+    "user_cache_lookups_total", "Consultas ao cache de usuários autenticados.", ("result",)
+)
+Gauge(
+    "analysis_cache_hit_ratio", "Fração das consultas ao cache de análises atendidas pelo cache.",
+    function=lambda: hit_ratio(ANALYSIS_CACHE_LOOKUPS)
+)
+Gauge(
+    "user_cache_hit_ratio", "Fração das requisições autenticadas atendidas pelo cache de usuários.",
+    function=lambda: hit_ratio(USER_CACHE_LOOKUPS)
+)
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from app.core.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+from app.core.metrics import Gauge, PASSWORD_HASH_SECONDS, PASSWORD_OPERATIONS
+
+
+# min_rounds = max_rounds = custo configurado: hashes com outro custo são
+# considerados desatualizados e refeitos no login (verify_and_update)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+
+class PasswordHasherBusyError(Exception):
+    """
+    Há operações de hash demais aguardando; a requisição deve ser recusada.
+    """
+
+
+def password_busy_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Servidor ocupado processando outros logins. Tente novamente em instantes.",
+        headers={"Retry-After": "1"},
+    )
+
+
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+_pending = 0
+
+Gauge("password_hash_pending", "Hashes de senha em andamento ou na fila.", function=lambda: _pending)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Pool de threads exclusivo para o bcrypt (a biblioteca libera o GIL durante o cálculo),
+    para que logins simultâneos não ocupem o event loop nem o pool padrão do FastAPI.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _executor
+
+
+def shutdown_password_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run(operation: str, func, *args):
+    global _pending
+    with _lock:
+        if _pending >= PASSWORD_HASH_MAX_PENDING:
+            PASSWORD_OPERATIONS.inc(operation=operation, result="rejected")
+            raise PasswordHasherBusyError()
+        _pending += 1
+
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), func, *args)
+    finally:
+        elapsed = time.perf_counter() - start
+        PASSWORD_HASH_SECONDS.observe(elapsed, operation=operation)
+        with _lock:
+            _pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    hashed = await _run("hash", pwd_context.hash, password)
+    PASSWORD_OPERATIONS.inc(operation="hash", result="ok")
+    return hashed
+
+
+async def verify_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verifica a senha e, se o hash usa um custo diferente do configurado,
+    retorna também o novo hash a ser gravado (senão, None).
+    """
+    valid, new_hash = await _run("verify", pwd_context.verify_and_update, password, hashed_password)
+    result = "failed" if not valid else "rehashed" if new_hash else "ok"
+    PASSWORD_OPERATIONS.inc(operation="verify", result=result)
+    return valid, new_hash
@@ -0,0 +1,148 @@
+import json
+import logging
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from app.core.config import LOG_LEVEL
+from app.core.metrics import HTTP_REQUESTS, HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_PROGRESS
+
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# ID da requisição em andamento; os jobs da fila herdam o ID da requisição que os criou
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# IDs recebidos do cliente (ex.: de um proxy) só são aceitos neste formato
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+# Rotas que não geram log por requisição (o Prometheus consulta /metrics a cada poucos segundos)
+QUIET_ROUTES = {"/metrics"}
+
+# Parâmetro da URL com credencial (token do GET /contracts/events), ocultado no log de acesso
+TOKEN_QUERY_PARAM = re.compile(r"([?&]token=)[^&\s]*")
+
+
+# Logger dos eventos em JSON (log_event); o handler e o nível podem ser trocados pela configuração de logging da aplicação
+logger = logging.getLogger(__name__)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formata cada registro como uma linha JSON com o horário, o nível, o evento,
+    o ID da requisição e os campos enviados a log_event.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "event": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def configure_event_log(level: str | int = LOG_LEVEL):
+    """
+    Envia os eventos para a saída padrão em JSON, a menos que a aplicação já
+    tenha configurado um handler para este logger.
+    """
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JsonFormatter())
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+
+def log_event(event: str, level: int = logging.INFO, **fields):
+    """
+    Registra um evento (uma linha JSON) com o ID da requisição atual.
+    """
+    logger.log(level, event, extra={"request_id": request_id_var.get(), "fields": fields})
+
+
+configure_event_log()
+
+
+class RedactTokenFilter(logging.Filter):
+    """
+    Oculta o valor do parâmetro `token` nas URLs do log de acesso do uvicorn.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple):
+            record.args = tuple(
+                TOKEN_QUERY_PARAM.sub(r"\1***", arg) if isinstance(arg, str) else arg
+                for arg in record.args
+            )
+        return True
+
+
+def redact_access_log():
+    logging.getLogger("uvicorn.access").addFilter(RedactTokenFilter())
+
+
+class RequestContextMiddleware:
+    """
+    Middleware ASGI que identifica cada requisição HTTP e registra sua duração.
+
+    Usa o X-Request-ID recebido (ou gera um novo), devolve o ID no cabeçalho
+    da resposta, alimenta as métricas HTTP e escreve uma linha de log ao
+    final. A duração inclui o corpo inteiro, inclusive de respostas NDJSON.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        request_id = headers.get(REQUEST_ID_HEADER.lower().encode(), b"").decode("latin-1")
+        if not VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (REQUEST_ID_HEADER.lower().encode(), request_id.encode())
+                ]
+            await send(message)
+
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration = time.perf_counter() - start
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+
+            # O roteador do FastAPI registra no scope a rota encontrada
+            route = getattr(scope.get("route"), "path", "desconhecida")
+            HTTP_REQUESTS.inc(method=scope["method"], route=route, status=status_code)
+            HTTP_REQUEST_SECONDS.observe(duration, method=scope["method"], route=route)
+            if route not in QUIET_ROUTES:
+                log_event(
+                    "http_request",
+                    method=scope["method"],
+                    path=scope["path"],
+                    route=route,
+                    status=status_code,
+                    duration_ms=round(duration * 1000, 1),
+                )
+            request_id_var.reset(token)
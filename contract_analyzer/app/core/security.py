@@ -1,21 +1,22 @@
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
-from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
-from fastapi import Depends, HTTPException, status
+from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, CONTRACT_EVENTS_TOKEN_SECONDS
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal
 from app.models.user import User
+from app.core.user_cache import CurrentUser, user_cache
+from app.core.metrics import USER_CACHE_LOOKUPS
 
 
 bearer_scheme = HTTPBearer()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Para rotas que também aceitam o token na URL (o EventSource do navegador não envia cabeçalhos)
+optional_bearer_scheme = HTTPBearer(auto_error=False)
+
+# Escopo dos tokens curtos da URL do GET /contracts/events: só valem para essa rota,
+# e o token de login (sem escopo) não é aceito na URL, onde ficaria nos logs de acesso
+EVENTS_TOKEN_SCOPE = "contract_events"
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
@@ -27,14 +28,23 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: Session = Depends(get_db)
-):
+def create_events_token(user_id: int) -> str:
     """
-    Valida o JWT e retorna o usuário atual do banco de dados
+    Gera o token de curta duração para abrir o fluxo de eventos (GET /contracts/events?token=).
     """
-    token = credentials.credentials  # Extrai o token do header
+    return create_access_token(
+        {"sub": str(user_id), "scope": EVENTS_TOKEN_SCOPE},
+        timedelta(seconds=CONTRACT_EVENTS_TOKEN_SECONDS)
+    )
+
+
+async def _load_user(user_id: int) -> CurrentUser | None:
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
+        return CurrentUser.from_model(user) if user else None
+
+
+async def _authenticate(token: str, scope: str | None = None) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Token inválido ou não autenticado",
@@ -44,27 +54,50 @@ def get_current_user(
     try:
         # Decodifica o token
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")  # usamos o user.id no sub
-        if user_id is None:
-            raise credentials_exception
+        user_id = int(payload.get("sub"))  # usamos o user.id no sub
+    except (JWTError, TypeError, ValueError):
+        raise credentials_exception
 
+    # Tokens de login não têm escopo; os de escopo específico só valem onde ele é exigido
+    if payload.get("scope") != scope:
+        raise credentials_exception
+
+    user = user_cache.get(user_id)
+    USER_CACHE_LOOKUPS.inc(result="miss" if user is None else "hit")
+    if user is None:
         # Busca o usuário no banco
-        user = db.query(User).filter(User.id == int(user_id)).first()
+        user = await _load_user(user_id)
         if user is None:
             raise credentials_exception
+        user_cache.set(user)
 
-        return user  # Retorna o objeto User
-
-    except JWTError:
-        raise credentials_exception
-
-
-
-
-
-
-
+    return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+) -> CurrentUser:
+    """
+    Valida o JWT e retorna o usuário atual.
+    O usuário vem do cache em memória; o banco só é consultado quando ele não está lá.
+    """
+    return await _authenticate(credentials.credentials)  # Token extraído do header
 
 
+async def get_events_user(
+    token: str | None = Query(None, description="Token de POST /contracts/events/token, para o EventSource (que não envia cabeçalhos)"),
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_bearer_scheme)
+) -> CurrentUser:
+    """
+    Usuário do fluxo de eventos: token de login no cabeçalho Authorization ou
+    token de curta duração do fluxo de eventos no parâmetro `token` da URL.
+    """
+    if credentials is not None:
+        return await _authenticate(credentials.credentials)
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido ou não autenticado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await _authenticate(token, scope=EVENTS_TOKEN_SCOPE)
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from sqlalchemy import event
+from app.core.config import USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    Dados do usuário autenticado usados pelas rotas (sem a senha e sem vínculo com sessão do banco).
+    """
+    id: int
+    username: str
+    full_name: str
+    email: str
+
+    @classmethod
+    def from_model(cls, user: User) -> "CurrentUser":
+        return cls(id=user.id, username=user.username, full_name=user.full_name, email=user.email)
+
+
+class UserCache:
+    """
+    Cache LRU com expiração dos usuários autenticados, por ID.
+
+    As rotas rodam tanto no event loop quanto em threads, por isso o acesso é
+    protegido por um lock. Alterações e exclusões de usuários feitas pelo ORM
+    removem a entrada na hora; o TTL limita o tempo de qualquer outra mudança.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[float, CurrentUser]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> CurrentUser | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user: CurrentUser):
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(ttl_seconds=USER_CACHE_TTL_SECONDS, max_entries=USER_CACHE_MAX_ENTRIES)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User):
+    user_cache.invalidate(target.id)
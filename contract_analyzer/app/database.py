@@ -1,17 +1,141 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.core.config import DATABASE_URL
+from app.core.config import (
+    DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    SQLITE_BUSY_TIMEOUT_MS, SQLITE_SYNCHRONOUS, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE
+)
 
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
+def _is_sqlite_memory(url) -> bool:
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def _check_url(url):
+    # Um SQLite em memória é um banco diferente em cada conexão (e em cada engine): as
+    # rotas (engine assíncrono) e os jobs (engine síncrono, em threads) não veriam os mesmos dados
+    if url.get_backend_name() == "sqlite" and _is_sqlite_memory(url):
+        raise ValueError("SQLite em memória não é suportado no DATABASE_URL; use um arquivo (ex.: sqlite:///./db.sqlite3).")
+
+
+def _create(create, url, **options):
+    try:
+        return create(url, **options)
+    except ImportError as e:
+        raise RuntimeError(
+            f"Driver do banco de dados não instalado ({e.name}). "
+            "Para PostgreSQL, execute pip install -r requirements-postgres.txt."
+        ) from e
+
+
+def _configure_sqlite(engine: Engine):
+    """
+    Aplica os PRAGMAs em cada nova conexão. Com WAL, leituras não bloqueiam a
+    escrita e o busy_timeout faz escritas concorrentes aguardarem o lock em vez
+    de falharem com "database is locked".
+    """
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+# Drivers assíncronos usados pelas rotas da API para cada banco
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def _engine_options(url) -> dict:
+    """
+    Opções de create_engine para o banco da URL, com o pool configurado em app/core/config.py.
+    """
+    if url.get_backend_name() == "sqlite":
+        return {
+            "connect_args": {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        }
+
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def create_db_engine(database_url: str = DATABASE_URL) -> Engine:
+    """
+    Cria o engine conforme o banco da URL: arquivo SQLite ou servidores como
+    PostgreSQL (com os drivers de requirements-postgres.txt).
+    """
+    url = make_url(database_url)
+    _check_url(url)
+    engine = _create(create_engine, url, **_engine_options(url))
+    if url.get_backend_name() == "sqlite":
+        _configure_sqlite(engine)
+    return engine
+
+
+def create_async_db_engine(database_url: str = DATABASE_URL) -> AsyncEngine:
+    """
+    Engine assíncrono para o mesmo banco (aiosqlite ou asyncpg), com as mesmas
+    configurações de pool e PRAGMAs do engine síncrono.
+    """
+    url = make_url(database_url)
+    _check_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Banco de dados sem driver assíncrono configurado: {backend}")
+
+    async_engine = _create(create_async_engine, url.set(drivername=ASYNC_DRIVERS[backend]), **_engine_options(url))
+    if backend == "sqlite":
+        _configure_sqlite(async_engine.sync_engine)
+    return async_engine
+
+
+# Engine síncrono: migrações e etapas que já rodam em threads (processamento dos uploads)
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrono: rotas da API
+async_engine = create_async_db_engine()
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
+
+async def get_db():
+    """
+    Dependência das rotas: abre uma sessão assíncrona por requisição.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def close_db():
+    await async_engine.dispose()
+
+
 def init_db():
-    from app.models import user, contract  # Importa modelos para criar tabelas
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    """
+    Cria ou atualiza o esquema do banco aplicando as migrações pendentes.
+    """
+    from app.models import user, contract, contract_document, contract_fingerprint, analysis_cache  # Registra os modelos no ORM
+    from app.migrations import run_migrations
+    run_migrations(engine)
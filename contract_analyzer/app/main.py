@@ -1,12 +1,46 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import auth, contracts, users
-from app.database import init_db
+from app.api import auth, contracts, metrics, users
+from app.core.body_limit import RequestBodyLimitMiddleware, MULTIPART_OVERHEAD_BYTES
+from app.core.config import MAX_UPLOAD_BYTES, MAX_BATCH_UPLOAD_BYTES
+from app.core.request_log import RequestContextMiddleware, REQUEST_ID_HEADER, redact_access_log
+from app.database import init_db, close_db
+from app.services.job_queue import job_queue
+from app.services.contract_pipeline import save_cache_hits
+from app.services.contract_events import contract_events
+from app.services.llm_client import close_groq_client
+from app.services.file_parser import shutdown_pdf_executor
+from app.core.passwords import shutdown_password_executor
 #from app.core.config import ALLOWED_ORIGINS
 
 
-init_db()
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Cria/atualiza o esquema do banco antes de aceitar requisições
+    init_db()
+    # Inicia os workers da fila de uploads junto com a aplicação
+    await job_queue.start()
+    yield
+    contract_events.close()
+    await job_queue.stop()
+    save_cache_hits()
+    await close_groq_client()
+    shutdown_pdf_executor()
+    shutdown_password_executor()
+    await close_db()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# O token do fluxo de eventos vai na URL; o log de acesso do uvicorn registra a URL inteira
+redact_access_log()
+
+# Limita o corpo dos uploads antes da leitura do multipart (respostas 413 ainda passam pelo CORS)
+app.add_middleware(RequestBodyLimitMiddleware, limits={
+    "/contracts/upload": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    "/contracts/upload/batch": MAX_BATCH_UPLOAD_BYTES,
+})
 
 # Adiciona CORS
 app.add_middleware(
@@ -16,12 +50,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[REQUEST_ID_HEADER, "ETag"],
 )
 
+# Identifica cada requisição (X-Request-ID), mede a duração e escreve o log;
+# adicionado por último para envolver também o CORS
+app.add_middleware(RequestContextMiddleware)
+
 # Inclui as rotas
 app.include_router(auth.router)
 app.include_router(contracts.router)
 app.include_router(users.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
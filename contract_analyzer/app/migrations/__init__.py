@@ -0,0 +1,50 @@
+import importlib
+import pkgutil
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.engine import Engine
+
+
+# Cada módulo vNNN_descricao.py deste pacote é uma migração com a função upgrade(conn).
+# As migrações são aplicadas em ordem, uma vez cada, e registradas em schema_version.
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def load_migrations() -> list[tuple[int, str, object]]:
+    migrations = []
+    for module_info in pkgutil.iter_modules(__path__):
+        name = module_info.name
+        if not (name.startswith("v") and name[1:4].isdigit()):
+            continue
+        module = importlib.import_module(f"{__name__}.{name}")
+        migrations.append((int(name[1:4]), name, module))
+    return sorted(migrations, key=lambda migration: migration[0])
+
+
+def run_migrations(engine: Engine) -> list[str]:
+    """
+    Aplica as migrações ainda não registradas no banco, cada uma em sua própria
+    transação, e retorna os nomes das aplicadas.
+    """
+    schema_version.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        applied = set(conn.scalars(select(schema_version.c.version)))
+
+    executed = []
+    for version, name, module in load_migrations():
+        if version in applied:
+            continue
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(insert(schema_version).values(
+                version=version, name=name, applied_at=datetime.now(timezone.utc)
+            ))
+        print(f"Migração aplicada: {name}")
+        executed.append(name)
+    return executed
@@ -0,0 +1,9 @@
+from app.database import engine
+from app.migrations import run_migrations
+
+
+# Uso: python -m app.migrations (a API também aplica as migrações ao iniciar)
+if __name__ == "__main__":
+    executed = run_migrations(engine)
+    if not executed:
+        print("Banco de dados já está atualizado.")
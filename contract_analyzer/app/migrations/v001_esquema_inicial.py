@@ -0,0 +1,41 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text
+
+
+# Definição congelada das tabelas nesta versão (não usar os modelos, que continuam evoluindo).
+# checkfirst permite adotar bancos criados antes das migrações sem recriar nada.
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String, unique=True, index=True, nullable=False),
+    Column("hashed_password", String, nullable=False),
+    Column("full_name", String, nullable=False),
+    Column("email", String, nullable=False),
+)
+
+Table(
+    "contracts", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("filename", String(255), unique=True, nullable=False),
+    Column("uploaded_by", Integer, ForeignKey("users.id"), nullable=False),
+    Column("nomes_partes", Text, nullable=True),
+    Column("valores_monetarios", Text, nullable=True),
+    Column("obrigacoes_principais", Text, nullable=True),
+    Column("dados_adicionais", Text, nullable=True),
+    Column("clausulas_rescisao", Text, nullable=True),
+)
+
+Table(
+    "analysis_cache", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("cache_key", String(64), unique=True, index=True, nullable=False),
+    Column("analysis", Text, nullable=False),
+    Column("hits", Integer, nullable=False, default=0),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("last_used_at", DateTime(timezone=True), nullable=False, index=True),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,36 @@
+from sqlalchemy import text
+
+
+# Definições congeladas na data desta migração (ver app/services/search_index.py para o uso atual)
+CREATE_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5(
+    filename, nomes_partes, valores_monetarios, obrigacoes_principais,
+    dados_adicionais, clausulas_rescisao, texto,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+INDEX_EXISTING_CONTRACTS = """
+INSERT INTO contracts_fts (
+    rowid, filename, nomes_partes, valores_monetarios, obrigacoes_principais,
+    dados_adicionais, clausulas_rescisao, texto
+)
+SELECT id, filename, nomes_partes, valores_monetarios, obrigacoes_principais,
+       dados_adicionais, clausulas_rescisao, ''
+FROM contracts
+"""
+
+
+def upgrade(conn):
+    # Tabela FTS5 da busca textual (apenas SQLite), já indexando os contratos existentes
+    if conn.dialect.name != "sqlite":
+        return
+
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contracts_fts'")
+    ).first()
+    if exists:
+        return
+
+    conn.execute(text(CREATE_FTS_TABLE))
+    conn.execute(text(INDEX_EXISTING_CONTRACTS))
@@ -0,0 +1,92 @@
+import re
+import unicodedata
+from sqlalchemy import (
+    BigInteger, Column, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+    column, exists, insert, or_, select, table
+)
+
+
+metadata = MetaData()
+
+# Referência para a chave estrangeira (a tabela já existe desde a v001)
+Table("contracts", metadata, Column("id", Integer, primary_key=True))
+
+Table(
+    "contract_parties", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("contract_id", Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("name", Text, nullable=False),
+    Column("name_normalized", String(500), nullable=False),
+    Index("ix_contract_parties_name_normalized", "name_normalized", "contract_id"),
+)
+
+Table(
+    "contract_amounts", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("contract_id", Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("raw", Text, nullable=False),
+    Column("cents", BigInteger, nullable=False),
+    Index("ix_contract_amounts_cents", "cents", "contract_id"),
+)
+
+
+# Cópia congelada da normalização de app/services/contract_entities.py na data desta
+# migração (a conversão dos valores foi corrigida depois pela v008)
+BRL_AMOUNT = re.compile(r"(?:R\$\s*)?(\d{1,3}(?:\.\d{3})+|\d+)(?:,(\d{1,2}))?(?!\d)")
+
+
+def _parse_brl_cents(value: str) -> int | None:
+    match = BRL_AMOUNT.search(value)
+    if not match:
+        return None
+    integer_part, decimal_part = match.groups()
+    cents = int(integer_part.replace(".", "")) * 100
+    if decimal_part:
+        cents += int(decimal_part.ljust(2, "0"))
+    return cents
+
+
+def _normalize_party_name(name: str) -> str:
+    without_accents = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return " ".join(without_accents.casefold().split())
+
+
+def _split(value: str | None) -> list[str]:
+    return [item.strip() for item in (value or "").split(";") if item.strip()]
+
+
+def _backfill(conn):
+    # Partes e valores dos contratos salvos antes da existência dessas tabelas
+    contracts = table("contracts", column("id"), column("nomes_partes"), column("valores_monetarios"))
+    parties = table("contract_parties", column("contract_id"), column("name"), column("name_normalized"))
+    amounts = table("contract_amounts", column("contract_id"), column("raw"), column("cents"))
+
+    pending = conn.execute(
+        select(contracts.c.id, contracts.c.nomes_partes, contracts.c.valores_monetarios).where(
+            or_(contracts.c.nomes_partes != "", contracts.c.valores_monetarios != ""),
+            ~exists().where(parties.c.contract_id == contracts.c.id),
+            ~exists().where(amounts.c.contract_id == contracts.c.id),
+        )
+    ).all()
+
+    party_rows, amount_rows = [], []
+    for contract_id, nomes_partes, valores_monetarios in pending:
+        party_rows += [
+            {"contract_id": contract_id, "name": name, "name_normalized": _normalize_party_name(name)[:500]}
+            for name in _split(nomes_partes)
+        ]
+        amount_rows += [
+            {"contract_id": contract_id, "raw": raw, "cents": cents}
+            for raw in _split(valores_monetarios)
+            if (cents := _parse_brl_cents(raw)) is not None
+        ]
+
+    if party_rows:
+        conn.execute(insert(parties), party_rows)
+    if amount_rows:
+        conn.execute(insert(amounts), amount_rows)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, tables=[metadata.tables["contract_parties"], metadata.tables["contract_amounts"]], checkfirst=True)
+    _backfill(conn)
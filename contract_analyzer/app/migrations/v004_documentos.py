@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, MetaData, String, Table
+
+
+metadata = MetaData()
+
+Table("contracts", metadata, Column("id", Integer, primary_key=True))
+
+Table(
+    "contract_documents", metadata,
+    Column("contract_id", Integer, ForeignKey("contracts.id", ondelete="CASCADE"), primary_key=True),
+    Column("extension", String(10), nullable=False),
+    Column("file_sha256", String(64), nullable=False, index=True),
+    Column("file_size", Integer, nullable=False),
+    Column("page_count", Integer, nullable=True),
+    Column("text_sha256", String(64), nullable=False),
+    Column("text_size", Integer, nullable=False),
+    Column("compression", String(10), nullable=False),
+    Column("content", LargeBinary, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def upgrade(conn):
+    # Texto extraído dos contratos enviados a partir desta versão (os anteriores não têm o texto guardado)
+    metadata.create_all(conn, tables=[metadata.tables["contract_documents"]], checkfirst=True)
@@ -0,0 +1,10 @@
+from sqlalchemy import text
+
+
+def upgrade(conn):
+    # Modelo e versão do prompt de cada análise, para identificar as que precisam ser refeitas.
+    # Contratos anteriores ficam com NULL e são tratados como desatualizados.
+    conn.execute(text("ALTER TABLE contracts ADD COLUMN analysis_model VARCHAR(100)"))
+    conn.execute(text("ALTER TABLE contracts ADD COLUMN prompt_version VARCHAR(20)"))
+    conn.execute(text("ALTER TABLE contracts ADD COLUMN analyzed_at TIMESTAMP WITH TIME ZONE"))
+    conn.execute(text("CREATE INDEX ix_contracts_analysis_version ON contracts (analysis_model, prompt_version)"))
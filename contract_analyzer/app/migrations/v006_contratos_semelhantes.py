@@ -0,0 +1,126 @@
+import gzip
+import hashlib
+import re
+import struct
+import unicodedata
+from sqlalchemy import (
+    BigInteger, Column, ForeignKey, Index, Integer, LargeBinary, MetaData, Table,
+    column, insert, select, table
+)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+metadata = MetaData()
+
+# Referência para a chave estrangeira (a tabela já existe desde a v001)
+Table("contracts", metadata, Column("id", Integer, primary_key=True))
+
+Table(
+    "contract_fingerprints", metadata,
+    Column("contract_id", Integer, ForeignKey("contracts.id", ondelete="CASCADE"), primary_key=True),
+    Column("signature", LargeBinary, nullable=False),
+)
+
+Table(
+    "contract_similarity_buckets", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("contract_id", Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("bucket", BigInteger, nullable=False),
+    Index("ix_contract_similarity_buckets_bucket", "bucket", "contract_id"),
+)
+
+
+# Cópia congelada da assinatura MinHash e das faixas LSH de app/services/near_duplicates.py
+# na data desta migração (as assinaturas gravadas aqui precisam ser as mesmas dos novos uploads)
+SHINGLE_WORDS = 5
+SIGNATURE_SIZE = 128
+LSH_BANDS = 16
+LSH_ROWS = SIGNATURE_SIZE // LSH_BANDS
+SIGNATURE_FORMAT = f">{SIGNATURE_SIZE}Q"
+WORD = re.compile(r"\w+")
+BACKFILL_BATCH_SIZE = 200
+
+
+def _decompress_text(method: str, content: bytes) -> str:
+    if method == "zstd":
+        if zstandard is None:
+            raise RuntimeError("O texto foi salvo com zstd, mas o pacote zstandard não está instalado.")
+        return zstandard.ZstdDecompressor().decompress(content).decode("utf-8")
+    return gzip.decompress(content).decode("utf-8")
+
+
+def _shingles(text: str) -> set[str]:
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").casefold()
+    words = WORD.findall(folded)
+    size = min(SHINGLE_WORDS, len(words))
+    return {" ".join(words[index:index + size]) for index in range(len(words) - size + 1)} if size else set()
+
+
+def _minhash_signature(text: str) -> list[int] | None:
+    minimums: list[int | None] = [None] * SIGNATURE_SIZE
+    for shingle in _shingles(text):
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        index, value = value % SIGNATURE_SIZE, value // SIGNATURE_SIZE
+        if minimums[index] is None or value < minimums[index]:
+            minimums[index] = value
+
+    filled = [index for index, value in enumerate(minimums) if value is not None]
+    if not filled:
+        return None
+    for index in range(SIGNATURE_SIZE):
+        if minimums[index] is None:
+            source = next((position for position in filled if position > index), filled[0])
+            minimums[index] = minimums[source]
+    return minimums
+
+
+def _lsh_buckets(signature: list[int]) -> list[int]:
+    buckets = []
+    for band in range(LSH_BANDS):
+        values = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f">B{LSH_ROWS}Q", band, *values), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+
+def _backfill(conn):
+    # Assinaturas dos contratos salvos com o texto extraído antes da existência dessas tabelas
+    documents = table("contract_documents", column("contract_id"), column("compression"), column("content"))
+    fingerprints = table("contract_fingerprints", column("contract_id"), column("signature"))
+    buckets = table("contract_similarity_buckets", column("contract_id"), column("bucket"))
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(documents.c.contract_id, documents.c.compression, documents.c.content)
+            .where(documents.c.contract_id > last_id)
+            .order_by(documents.c.contract_id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+
+        fingerprint_rows, bucket_rows = [], []
+        for contract_id, compression, content in rows:
+            signature = _minhash_signature(_decompress_text(compression, content))
+            if signature is None:
+                continue
+            fingerprint_rows.append({"contract_id": contract_id, "signature": struct.pack(SIGNATURE_FORMAT, *signature)})
+            bucket_rows += [{"contract_id": contract_id, "bucket": bucket} for bucket in _lsh_buckets(signature)]
+
+        if fingerprint_rows:
+            conn.execute(insert(fingerprints), fingerprint_rows)
+            conn.execute(insert(buckets), bucket_rows)
+        last_id = rows[-1][0]
+
+
+def upgrade(conn):
+    # Assinaturas MinHash e faixas LSH para encontrar contratos semelhantes
+    # (preenchidas para os contratos já salvos com o texto extraído)
+    tables = [metadata.tables["contract_fingerprints"], metadata.tables["contract_similarity_buckets"]]
+    metadata.create_all(conn, tables=tables, checkfirst=True)
+    _backfill(conn)
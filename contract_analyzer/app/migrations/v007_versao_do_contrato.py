@@ -0,0 +1,7 @@
+from sqlalchemy import text
+
+
+def upgrade(conn):
+    # Versão de cada contrato, alterada a cada atualização (ETag nas leituras e If-Match no PUT).
+    # Os contratos existentes começam na versão 1.
+    conn.execute(text("ALTER TABLE contracts ADD COLUMN version BIGINT NOT NULL DEFAULT 1"))
@@ -0,0 +1,48 @@
+import re
+from sqlalchemy import bindparam, column, delete, select, table, update
+
+
+# Cópia congelada de parse_brl_cents (app/services/contract_entities.py) na data
+# desta migração: valores com "R$" têm prioridade e percentuais e datas são ignorados
+AMOUNT_NUMBER = r"(?<![\d.,/])(\d{1,3}(?:\.\d{3})+|\d+)(?:[,.](\d{1,2}))?(?![\d.,/]?\d|\s*%)"
+BRL_AMOUNT = re.compile(r"R\$\s*" + AMOUNT_NUMBER)
+BARE_AMOUNT = re.compile(AMOUNT_NUMBER)
+
+
+def _parse_brl_cents(value: str) -> int | None:
+    match = BRL_AMOUNT.search(value)
+    if match is None:
+        numbers = list(BARE_AMOUNT.finditer(value))
+        match = next(
+            (number for number in numbers if number.group(2) or "." in number.group(1)),
+            numbers[0] if numbers else None
+        )
+    if match is None:
+        return None
+    integer_part, decimal_part = match.groups()
+    cents = int(integer_part.replace(".", "")) * 100
+    if decimal_part:
+        cents += int(decimal_part.ljust(2, "0"))
+    return cents
+
+
+def upgrade(conn):
+    # Recalcula os centavos dos valores já salvos: a conversão anterior usava o primeiro
+    # número do item ("12 parcelas de R$ 1.000,00" -> 12,00) e aceitava percentuais
+    amounts = table("contract_amounts", column("id"), column("raw"), column("cents"))
+
+    changed, removed = [], []
+    for amount_id, raw, cents in conn.execute(select(amounts.c.id, amounts.c.raw, amounts.c.cents)):
+        new_cents = _parse_brl_cents(raw)
+        if new_cents is None:
+            removed.append(amount_id)
+        elif new_cents != cents:
+            changed.append({"amount_id": amount_id, "new_cents": new_cents})
+
+    if changed:
+        conn.execute(
+            update(amounts).where(amounts.c.id == bindparam("amount_id")).values(cents=bindparam("new_cents")),
+            changed
+        )
+    if removed:
+        conn.execute(delete(amounts).where(amounts.c.id.in_(removed)))
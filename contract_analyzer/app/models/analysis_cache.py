@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.database import Base
+
+
+def utcnow():
+    return datetime.now(timezone.utc)
+
+
+class AnalysisCache(Base):
+    __tablename__ = "analysis_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, index=True, nullable=False)  # SHA-256 do documento/texto + modelo + versão do prompt
+    analysis = Column(Text, nullable=False)  # Resultado da IA serializado em JSON
+    hits = Column(Integer, nullable=False, default=0)  # Quantas vezes a análise foi reaproveitada
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+    last_used_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, index=True)  # Usado na remoção das entradas mais antigas
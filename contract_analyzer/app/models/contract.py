@@ -1,14 +1,68 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+import time
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
 from app.database import Base
 
+
+def next_row_version(current: int | None = None) -> int:
+    """
+    Nova versão de um contrato: o instante atual em microssegundos, sempre maior
+    que a versão anterior. Ao contrário de um contador, não se repete quando o
+    SQLite reaproveita o ID de um contrato excluído (o ETag antigo não vale para o novo).
+    """
+    return max(time.time_ns() // 1000, (current or 0) + 1)
+
+
 class Contract(Base):
     __tablename__ = "contracts"
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), unique=True, nullable=False)
     uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False)
-    nomes_partes = Column(String(1000), nullable=True)  # Nomes das partes envolvidas separadas por ;
-    valores_monetarios = Column(String(500), nullable=True)  # Lista de valores monetários
+    nomes_partes = Column(Text, nullable=True)  # Nomes das partes envolvidas separadas por ;
+    valores_monetarios = Column(Text, nullable=True)  # Lista de valores monetários separados por ;
     obrigacoes_principais = Column(Text, nullable=True)  # Principais obrigações do contrato
     dados_adicionais = Column(Text, nullable=True)  # Dados adicionais importantes como objeto do contrato e vigência
     clausulas_rescisao = Column(Text, nullable=True)  # Texto com cláusulas
+    analysis_model = Column(String(100), nullable=True)  # Modelo da IA que gerou a análise
+    prompt_version = Column(String(20), nullable=True)  # Versão do prompt usada na análise
+    analyzed_at = Column(DateTime(timezone=True), nullable=True)  # Data da última análise
+    version = Column(BigInteger, nullable=False, server_default="1")  # Muda a cada alteração; usada no ETag e no If-Match
+
+    __table_args__ = (Index("ix_contracts_analysis_version", "analysis_model", "prompt_version"),)
+
+    # O ORM incrementa a versão em cada UPDATE e recusa gravar (StaleDataError) se ela mudou desde a leitura
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": next_row_version}
+
+    # Versões normalizadas de nomes_partes e valores_monetarios, para consultas indexadas
+    parties = relationship("ContractParty", cascade="all, delete-orphan")
+    amounts = relationship("ContractAmount", cascade="all, delete-orphan")
+
+    # Texto extraído do arquivo, guardado comprimido para reanálise
+    document = relationship("ContractDocument", uselist=False, cascade="all, delete-orphan")
+
+    # Assinatura MinHash do texto e faixas LSH, para encontrar contratos semelhantes
+    fingerprint = relationship("ContractFingerprint", uselist=False, cascade="all, delete-orphan")
+    similarity_buckets = relationship("ContractSimilarityBucket", cascade="all, delete-orphan")
+
+
+class ContractParty(Base):
+    __tablename__ = "contract_parties"
+
+    id = Column(Integer, primary_key=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(Text, nullable=False)  # Nome como aparece no contrato
+    name_normalized = Column(String(500), nullable=False)  # Minúsculo e sem acentos, usado na busca por prefixo
+
+    __table_args__ = (Index("ix_contract_parties_name_normalized", "name_normalized", "contract_id"),)
+
+
+class ContractAmount(Base):
+    __tablename__ = "contract_amounts"
+
+    id = Column(Integer, primary_key=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False, index=True)
+    raw = Column(Text, nullable=False)  # Valor como aparece no contrato (ex.: "R$ 1.000,00")
+    cents = Column(BigInteger, nullable=False)  # Valor em centavos
+
+    __table_args__ = (Index("ix_contract_amounts_cents", "cents", "contract_id"),)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime, ForeignKey
+from app.database import Base
+from app.models.analysis_cache import utcnow
+
+
+class ContractDocument(Base):
+    __tablename__ = "contract_documents"
+
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), primary_key=True)
+    extension = Column(String(10), nullable=False)  # .pdf ou .docx
+    file_sha256 = Column(String(64), nullable=False, index=True)  # Hash do arquivo enviado
+    file_size = Column(Integer, nullable=False)  # Tamanho do arquivo enviado, em bytes
+    page_count = Column(Integer, nullable=True)  # Páginas do PDF (None para DOCX)
+    text_sha256 = Column(String(64), nullable=False)  # Hash do texto extraído (mesma chave do cache de análises)
+    text_size = Column(Integer, nullable=False)  # Tamanho do texto extraído, em bytes (UTF-8)
+    compression = Column(String(10), nullable=False)  # zstd ou gzip
+    content = Column(LargeBinary, nullable=False)  # Texto extraído comprimido
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
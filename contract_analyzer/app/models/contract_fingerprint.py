@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, BigInteger, LargeBinary, ForeignKey, Index
+from app.database import Base
+
+
+class ContractFingerprint(Base):
+    __tablename__ = "contract_fingerprints"
+
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)  # Assinatura MinHash do texto extraído (inteiros de 64 bits)
+
+
+class ContractSimilarityBucket(Base):
+    __tablename__ = "contract_similarity_buckets"
+
+    id = Column(Integer, primary_key=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False, index=True)
+    bucket = Column(BigInteger, nullable=False)  # Hash de uma faixa da assinatura (LSH); contratos semelhantes compartilham faixas
+
+    __table_args__ = (Index("ix_contract_similarity_buckets_bucket", "bucket", "contract_id"),)
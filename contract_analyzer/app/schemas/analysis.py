@@ -0,0 +1,37 @@
+from pydantic import BaseModel, field_validator
+
+
+class ContractAnalysis(BaseModel):
+    """
+    Formato da análise retornada pela IA. Aceita pequenas variações comuns nas
+    respostas (texto no lugar de lista, lista no lugar de texto, null).
+    """
+    nomes_partes: list[str] = []
+    valores_monetarios: list[str] = []
+    obrigacoes_principais: list[str] = []
+    dados_adicionais: str = ""
+    clausulas_rescisao: str = ""
+
+    @field_validator("nomes_partes", "valores_monetarios", "obrigacoes_principais", mode="before")
+    @classmethod
+    def as_list(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, (list, tuple)):
+            return [str(item).strip() for item in value if item is not None and str(item).strip()]
+        value = str(value).strip()
+        return [value] if value else []
+
+    @field_validator("dados_adicionais", "clausulas_rescisao", mode="before")
+    @classmethod
+    def as_text(cls, value):
+        if value is None:
+            return ""
+        if isinstance(value, (list, tuple)):
+            return "; ".join(str(item).strip() for item in value if item is not None and str(item).strip())
+        if isinstance(value, dict):
+            return "; ".join(f"{key}: {item}" for key, item in value.items())
+        return str(value).strip()
+
+
+ANALYSIS_FIELDS = list(ContractAnalysis.model_fields)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional
 
 
@@ -8,4 +8,12 @@ class ContractUpdate(BaseModel):
     valores_monetarios: Optional[str] = None
     obrigacoes_principais: Optional[str] = None
     dados_adicionais: Optional[str] = None
-    clausulas_rescisao: Optional[str] = None
\ No newline at end of file
+    clausulas_rescisao: Optional[str] = None
+
+    @field_validator("filename")
+    @classmethod
+    def filename_required(cls, value):
+        # Só roda quando o campo é enviado: o nome pode ser omitido, mas não apagado (coluna obrigatória)
+        if value is None or not value.strip():
+            raise ValueError("O nome do arquivo não pode ser vazio.")
+        return value
\ No newline at end of file
@@ -1,74 +1,259 @@
+import asyncio
+import json
+import logging
+import re
+from app.core.metrics import STAGE_SECONDS, PREPROCESS_TOKENS
+from app.core.request_log import log_event
+from app.core.config import (
+    GROQ_API_KEY, GROQ_MODEL, CHUNK_MAX_CHARS, GROQ_JSON_MODE, ANALYSIS_REASK_ATTEMPTS, ANALYSIS_MODE,
+    TEXT_PREPROCESSING, ANALYSIS_TOKEN_BUDGET, BOILERPLATE_MIN_REPEATS
+)
+from app.schemas.analysis import ANALYSIS_FIELDS, ContractAnalysis
+from app.services.chunking import split_into_chunks
+from app.services.llm_output import repair_json
+from app.services.text_preprocessor import preprocess_contract_text
+from app.services.rule_extractor import RULES_VERSION, extract_contract_info_rules
+from app.services.llm_client import get_groq_client, LLMRateLimitError
 
-from openai import OpenAI
-from app.core.config import GROQ_API_KEY, GROQ_API_BASE, GROQ_MODEL
 
+# Versão do prompt de extração. Altere sempre que o prompt mudar, para que
+# análises em cache geradas com o prompt antigo não sejam reaproveitadas.
+PROMPT_VERSION = "3"
 
-# Configura o cliente OpenAI apontando para o Groq
+# Campos da análise retornados como lista e como texto (ver app/schemas/analysis.py)
+LIST_FIELDS = ["nomes_partes", "valores_monetarios", "obrigacoes_principais"]
+TEXT_FIELDS = ["dados_adicionais", "clausulas_rescisao"]
+
+# O cliente assíncrono (app/services/llm_client.py) é criado sob demanda
 if GROQ_API_KEY:
-    groq_client = OpenAI(
-        api_key=GROQ_API_KEY,
-        base_url=GROQ_API_BASE
-    )
     GROQ_ENABLED = True
     print("Groq API configurado com sucesso!")
 else:
-    groq_client = None
     GROQ_ENABLED = False
     print("Groq API não configurado. Configure a chave no .env.")
 
+if ANALYSIS_MODE not in ("llm", "rules", "hybrid"):
+    raise ValueError(f"ANALYSIS_MODE inválido: {ANALYSIS_MODE}. Use llm, rules ou hybrid.")
+
+# Sem a chave do Groq, a análise funciona offline apenas com as regras locais
+ACTIVE_ANALYSIS_MODE = ANALYSIS_MODE if GROQ_ENABLED else "rules"
+if ACTIVE_ANALYSIS_MODE != ANALYSIS_MODE:
+    print("Usando a extração por regras locais (modo offline).")
+
+# Identificação do analisador (registrada em cada contrato e usada na chave do cache)
+ANALYZER_NAME, ANALYZER_VERSION = {
+    "llm": (GROQ_MODEL, PROMPT_VERSION),
+    "rules": ("regras", RULES_VERSION),
+    "hybrid": (f"{GROQ_MODEL}+regras", f"{PROMPT_VERSION}+{RULES_VERSION}"),
+}[ACTIVE_ANALYSIS_MODE]
+
+
+# Exemplo de cada campo no modelo de resposta enviado à IA
+FIELD_EXAMPLES = {
+    "nomes_partes": ["parte1", "parte2"],
+    "valores_monetarios": ["R$ 1.000,00", "R$ 50.000,00"],
+    "obrigacoes_principais": ["obrigação 1", "obrigação 2"],
+    "dados_adicionais": "texto com objeto e vigência do contrato",
+    "clausulas_rescisao": "texto com as cláusulas de rescisão"
+}
+
 
-def extract_contract_info_groq(contract_text: str) -> dict:
+def _build_prompt(contract_text: str, part: int = 1, total_parts: int = 1, fields: list[str] | None = None) -> str:
     """
-    Extrai informações do contrato usando a API do Groq (LLaMA 3).
+    Monta o prompt de extração. Com `fields`, pede apenas esses campos
+    (usado para completar uma resposta que veio sem algum deles).
     """
-    if not GROQ_ENABLED:
-        raise RuntimeError("Groq API não está habilitado. Configure a chave no .env.")
+    fields = fields or ANALYSIS_FIELDS
+    if total_parts > 1:
+        header = (
+            f"O texto abaixo é o trecho {part} de {total_parts} de um contrato. "
+            "Extraia apenas as informações presentes neste trecho e deixe vazios os campos que não aparecerem. "
+            "Retorne exatamente no formato JSON abaixo:"
+        )
+    else:
+        header = "Extraia as seguintes informações do contrato abaixo e retorne exatamente no formato JSON abaixo:"
 
-    prompt = f"""
-    Extraia as seguintes informações do contrato abaixo e retorne exatamente no formato JSON abaixo:
-    {{
-        "nomes_partes": ["parte1", "parte2"],
-        "valores_monetarios": ["R$ 1.000,00", "R$ 50.000,00"],
-        "obrigacoes_principais": ["obrigação 1", "obrigação 2"],
-        "dados_adicionais": "texto com objeto e vigência do contrato",
-        "clausulas_rescisao": "texto com as cláusulas de rescisão"
-    }}
+    template = json.dumps({field: FIELD_EXAMPLES[field] for field in fields}, ensure_ascii=False, indent=4)
+
+    return f"""
+    {header}
+    {template}
 
     Contrato:
     {contract_text}
     """
 
+
+async def _complete_json(prompt: str) -> dict | None:
+    """
+    Faz uma chamada ao Groq e retorna o objeto JSON da resposta (com reparos
+    locais, se necessário), ou None se não for possível obtê-lo.
+    """
+    options = {"response_format": {"type": "json_object"}} if GROQ_JSON_MODE else {}
+    response = await get_groq_client().chat(
+        model=GROQ_MODEL,
+        messages=[
+            {"role": "system", "content": "Você é um assistente útil. Responda somente com um objeto JSON."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.2,
+        **options
+    )
+    return repair_json(response.choices[0].message.content)
+
+
+async def _request_analysis(
+    contract_text: str,
+    part: int = 1,
+    total_parts: int = 1,
+    fields: list[str] | None = None
+) -> dict:
+    """
+    Analisa um texto (ou trecho) e retorna a análise validada.
+
+    Se a resposta vier sem algum campo (ou sem JSON válido), pede de novo
+    apenas os campos que faltaram; os que continuarem faltando ficam vazios.
+    Com `fields`, pede à IA somente esses campos.
+    """
+    fields = fields or ANALYSIS_FIELDS
     try:
-        response = groq_client.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[
-                {"role": "system", "content": "Você é um assistente útil."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2
-        )
+        data = await _complete_json(_build_prompt(contract_text, part, total_parts, fields)) or {}
+        missing = [field for field in fields if field not in data]
 
-        # Extrai o conteúdo
-        result_text = response.choices[0].message.content
+        for _ in range(ANALYSIS_REASK_ATTEMPTS):
+            if not missing:
+                break
+            # Resposta sem alguns campos: pede apenas esses
+            log_event("llm_reask", part=part, total_parts=total_parts, missing_fields=missing)
+            retry = await _complete_json(_build_prompt(contract_text, part, total_parts, fields=missing)) or {}
+            data.update({field: retry[field] for field in missing if field in retry})
+            missing = [field for field in missing if field not in data]
 
-        # Força o parsing JSON
-        import json
-        json_start = result_text.find("{")
-        json_end = result_text.rfind("}") + 1
-        clean_json = result_text[json_start:json_end]
+        if missing:
+            # Os campos que continuaram faltando ficam vazios
+            log_event("llm_fields_missing", logging.WARNING, part=part, total_parts=total_parts, missing_fields=missing)
 
-        return json.loads(clean_json)
+        return ContractAnalysis.model_validate(data).model_dump()
 
+    except LLMRateLimitError:
+        raise
     except Exception as e:
-        print(f"Erro ao chamar a API do Groq: {e}")
+        log_event("llm_error", logging.ERROR, part=part, total_parts=total_parts, error=repr(e))
         raise RuntimeError("Erro ao processar o contrato com a IA (Groq).")
 
 
+def _dedupe_key(value: str) -> str:
+    # Ignora caixa, espaços e pontuação ao comparar ("R$ 1.000,00" == "R$1.000,00")
+    return re.sub(r"[\W_]+", "", value.casefold())
+
+
+def _as_list(value) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    value = str(value).strip()
+    return [value] if value else []
+
+
+def _unique(values: list[str]) -> list[str]:
+    seen = set()
+    unique_values = []
+    for value in values:
+        key = _dedupe_key(value)
+        if key and key not in seen:
+            seen.add(key)
+            unique_values.append(value)
+    return unique_values
+
+
+def merge_analyses(partials: list[dict]) -> dict:
+    """
+    Junta as análises parciais de cada trecho em uma única análise, sem repetições.
+    """
+    merged = {}
+    for field in LIST_FIELDS:
+        merged[field] = _unique([item for partial in partials for item in _as_list(partial.get(field))])
+    for field in TEXT_FIELDS:
+        merged[field] = "\n".join(_unique([item for partial in partials for item in _as_list(partial.get(field))]))
+    return merged
+
+
+def prepare_prompt_text(contract_text: str) -> str:
+    """
+    Limpa o texto e aplica o orçamento de tokens antes de enviá-lo à IA
+    (ver app/services/text_preprocessor.py), registrando a economia de tokens.
+    """
+    if not TEXT_PREPROCESSING:
+        return contract_text
+
+    with STAGE_SECONDS.time(stage="preprocess"):
+        prepared = preprocess_contract_text(contract_text, ANALYSIS_TOKEN_BUDGET, BOILERPLATE_MIN_REPEATS)
+    PREPROCESS_TOKENS.inc(prepared.tokens_before, stage="before")
+    PREPROCESS_TOKENS.inc(prepared.tokens_after, stage="after")
+    log_event(
+        "text_preprocessed",
+        tokens_before=prepared.tokens_before,
+        tokens_after=prepared.tokens_after,
+        removed_lines=prepared.removed_lines,
+        dropped_sections=len(prepared.dropped_sections),
+        dropped_titles=prepared.dropped_sections[:10],
+    )
+    return prepared.text
+
+
+async def extract_contract_info_groq(contract_text: str, fields: list[str] | None = None) -> dict:
+    """
+    Extrai informações do contrato usando a API do Groq (LLaMA 3).
+
+    Contratos longos são divididos em trechos nas fronteiras das cláusulas;
+    os trechos são analisados em paralelo e os resultados combinados.
+    Com `fields`, extrai somente esses campos (os demais ficam vazios).
+    """
+    if not GROQ_ENABLED:
+        raise RuntimeError("Groq API não está habilitado. Configure a chave no .env.")
+
+    chunks = split_into_chunks(prepare_prompt_text(contract_text), CHUNK_MAX_CHARS)
+    if len(chunks) == 1:
+        return await _request_analysis(chunks[0], fields=fields)
+
+    total_parts = len(chunks)
+    partials = await asyncio.gather(*[
+        _request_analysis(chunk, part, total_parts, fields)
+        for part, chunk in enumerate(chunks, start=1)
+    ])
+    return merge_analyses(partials)
+
+
+async def analyze_contract(contract_text: str) -> dict:
+    """
+    Analisa o contrato conforme ANALYSIS_MODE:
+    - llm: apenas a IA;
+    - rules: apenas as regras locais (também usado quando o Groq não está configurado);
+    - hybrid: primeiro as regras e, só para os campos que ficaram vazios, a IA.
+    """
+    if ACTIVE_ANALYSIS_MODE == "llm":
+        with STAGE_SECONDS.time(stage="llm"):
+            return await extract_contract_info_groq(contract_text)
+
+    with STAGE_SECONDS.time(stage="rules"):
+        analysis = extract_contract_info_rules(contract_text)
+    if ACTIVE_ANALYSIS_MODE == "rules":
+        return analysis
+
+    missing = [field for field in ANALYSIS_FIELDS if not analysis[field]]
+    if missing:
+        with STAGE_SECONDS.time(stage="llm"):
+            completed = await extract_contract_info_groq(contract_text, fields=missing)
+        analysis.update({field: completed[field] for field in missing})
+    return analysis
+
+
 def extract_contract_info_mock(contract_text: str) -> dict:
     """
     Simula a extração de informações de um contrato sem usar IA.
     """
-    print("Usando MOCK para extrair informações do contrato.")
+    log_event("analysis_mock", logging.WARNING)
     return {
         "nomes_partes": ["Empresa X", "Cliente Y"],
         "valores_monetarios": ["R$ 100.000,00", "R$ 50.000,00"],
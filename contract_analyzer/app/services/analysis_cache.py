@@ -0,0 +1,124 @@
+import hashlib
+import json
+import threading
+from datetime import datetime
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.core.config import ANALYSIS_CACHE_MAX_ENTRIES
+from app.core.metrics import ANALYSIS_CACHE_LOOKUPS
+from app.models.analysis_cache import AnalysisCache, utcnow
+from app.services.ai_service import ANALYZER_NAME, ANALYZER_VERSION
+
+
+# Acertos das leituras (quantidade e último uso por chave), gravados em lote junto
+# com a próxima gravação do cache: assim a leitura não escreve no banco
+_pending_hits: dict[str, tuple[int, datetime]] = {}
+_pending_hits_lock = threading.Lock()
+
+
+def text_hash(text: str) -> str:
+    """
+    SHA-256 do texto extraído com espaços normalizados, para reconhecer o
+    mesmo contrato salvo em outro formato (PDF x DOCX) ou reexportado.
+    """
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(digest: str) -> str:
+    """
+    Combina o hash do documento com o analisador atual (modelo e versão do prompt e/ou das regras).
+    """
+    return hashlib.sha256(f"{digest}:{ANALYZER_NAME}:{ANALYZER_VERSION}".encode("utf-8")).hexdigest()
+
+
+def text_cache_key(text: str) -> str | None:
+    """
+    Chave do cache para o texto extraído, ou None se ele estiver vazio (ex.: PDF
+    digitalizado): documentos sem texto não compartilham a mesma análise.
+    """
+    if not text.strip():
+        return None
+    return make_cache_key(text_hash(text))
+
+
+def get_cached_analysis(db: Session, cache_key: str) -> dict | None:
+    """
+    Retorna a análise em cache para a chave, ou None se não existir.
+
+    Apenas lê o banco; o acerto é registrado em memória e gravado por
+    `flush_cache_hits`.
+    """
+    if ANALYSIS_CACHE_MAX_ENTRIES <= 0:
+        return None
+
+    analysis = db.scalar(select(AnalysisCache.analysis).where(AnalysisCache.cache_key == cache_key))
+    ANALYSIS_CACHE_LOOKUPS.inc(result="hit" if analysis is not None else "miss")
+    if analysis is None:
+        return None
+
+    with _pending_hits_lock:
+        hits, _ = _pending_hits.get(cache_key, (0, None))
+        _pending_hits[cache_key] = (hits + 1, utcnow())
+
+    return json.loads(analysis)
+
+
+def flush_cache_hits(db: Session):
+    """
+    Grava na sessão (sem commit) os acertos acumulados desde a última gravação.
+    """
+    with _pending_hits_lock:
+        pending = dict(_pending_hits)
+        _pending_hits.clear()
+
+    for cache_key, (hits, last_used_at) in pending.items():
+        db.execute(
+            update(AnalysisCache)
+            .where(AnalysisCache.cache_key == cache_key)
+            .values(hits=AnalysisCache.hits + hits, last_used_at=last_used_at)
+        )
+
+
+def _insert(db: Session):
+    # INSERT com ON CONFLICT do banco em uso
+    return postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+
+
+def store_analysis(db: Session, cache_keys: list[str], analysis_result: dict):
+    """
+    Salva a análise sob cada uma das chaves e remove as entradas menos usadas
+    recentemente quando o limite de tamanho do cache é ultrapassado.
+
+    Usa INSERT ... ON CONFLICT: dois jobs que analisaram o mesmo conteúdo ao
+    mesmo tempo gravam a mesma chave sem erro de unicidade.
+    """
+    if ANALYSIS_CACHE_MAX_ENTRIES <= 0:
+        return
+
+    serialized = json.dumps(analysis_result, ensure_ascii=False)
+    now = utcnow()
+    rows = [
+        {"cache_key": cache_key, "analysis": serialized, "hits": 0, "created_at": now, "last_used_at": now}
+        for cache_key in dict.fromkeys(cache_keys)
+    ]
+    statement = _insert(db)(AnalysisCache).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[AnalysisCache.cache_key],
+        set_={"analysis": statement.excluded.analysis, "last_used_at": statement.excluded.last_used_at}
+    ))
+    flush_cache_hits(db)
+
+    total = db.scalar(select(func.count(AnalysisCache.id)))
+    excess = total - ANALYSIS_CACHE_MAX_ENTRIES
+    if excess > 0:
+        oldest_ids = (
+            select(AnalysisCache.id)
+            .order_by(AnalysisCache.last_used_at.asc())
+            .limit(excess)
+        )
+        db.query(AnalysisCache).filter(AnalysisCache.id.in_(oldest_ids)).delete(synchronize_session=False)
+
+    db.commit()
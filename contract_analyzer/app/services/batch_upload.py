@@ -0,0 +1,132 @@
+import asyncio
+import os
+import zipfile
+from dataclasses import dataclass
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+from app.core.config import BATCH_MAX_FILES, MAX_UPLOAD_BYTES
+from app.models.contract import Contract
+from app.services.file_parser import ALLOWED_EXTENSIONS
+from app.services.job_queue import JobError, job_queue
+from app.services.upload_spool import SpooledUpload, UploadTooLargeError, spool_upload, spool_fileobj
+
+
+@dataclass
+class BatchItem:
+    filename: str
+    extension: str
+    upload: SpooledUpload | None = None
+    error: JobError | None = None
+
+
+def cleanup_batch(items: list[BatchItem]):
+    """
+    Remove os arquivos temporários ainda existentes do lote.
+    """
+    for item in items:
+        if item.upload is not None:
+            item.upload.cleanup()
+
+
+def _extension(filename: str) -> str:
+    return os.path.splitext(filename)[1].lower()
+
+
+def _unsupported(filename: str, extension: str) -> BatchItem:
+    return BatchItem(
+        filename=filename,
+        extension=extension,
+        error=JobError(400, f"Tipo de arquivo não suportado: {extension or '(sem extensão)'}. Apenas PDF e DOCX são permitidos.")
+    )
+
+
+def _spool_zip(zip_file, max_files: int) -> list[BatchItem]:
+    """
+    Grava em disco cada contrato (.pdf/.docx) de um ZIP, respeitando o tamanho
+    máximo por arquivo mesmo que o cabeçalho do ZIP informe outro tamanho.
+    """
+    items = []
+    try:
+        with zipfile.ZipFile(zip_file) as archive:
+            for member in archive.infolist():
+                filename = os.path.basename(member.filename)
+                if member.is_dir() or not filename or member.filename.startswith("__MACOSX/"):
+                    continue
+                if len(items) >= max_files:
+                    raise JobError(413, f"O lote excede o limite de {max_files} arquivos.")
+
+                extension = _extension(filename)
+                if extension not in ALLOWED_EXTENSIONS:
+                    items.append(_unsupported(filename, extension))
+                    continue
+
+                item = BatchItem(filename=filename, extension=extension)
+                try:
+                    if member.file_size > MAX_UPLOAD_BYTES:
+                        raise UploadTooLargeError(MAX_UPLOAD_BYTES)
+                    with archive.open(member) as source:
+                        item.upload = spool_fileobj(source, extension)
+                except UploadTooLargeError as e:
+                    item.error = JobError(413, str(e))
+                items.append(item)
+    except zipfile.BadZipFile as e:
+        cleanup_batch(items)
+        raise JobError(422, f"Erro ao processar ZIP: {e}")
+    return items
+
+
+async def spool_batch(files: list[UploadFile]) -> list[BatchItem]:
+    """
+    Grava em disco todos os arquivos do lote (inclusive os de dentro de ZIPs)
+    antes do processamento, para que a resposta em streaming não dependa
+    dos arquivos da requisição.
+    """
+    items = []
+    try:
+        for file in files:
+            filename = file.filename or ""
+            extension = _extension(filename)
+
+            if extension == ".zip":
+                items.extend(await asyncio.to_thread(_spool_zip, file.file, BATCH_MAX_FILES - len(items)))
+            elif extension not in ALLOWED_EXTENSIONS:
+                items.append(_unsupported(filename, extension))
+            else:
+                item = BatchItem(filename=filename, extension=extension)
+                try:
+                    item.upload = await spool_upload(file)
+                except UploadTooLargeError as e:
+                    item.error = JobError(413, str(e))
+                items.append(item)
+
+            if len(items) > BATCH_MAX_FILES:
+                raise JobError(413, f"O lote excede o limite de {BATCH_MAX_FILES} arquivos.")
+    except BaseException:
+        cleanup_batch(items)
+        raise
+    return items
+
+
+def mark_duplicates(db: Session, items: list[BatchItem]):
+    """
+    Marca como erro 409 os arquivos cujo nome já existe no banco, está em
+    processamento na fila ou se repete dentro do próprio lote (uma única consulta).
+    """
+    names = {item.filename for item in items if item.error is None}
+    existing = {
+        filename for (filename,) in
+        db.query(Contract.filename).filter(Contract.filename.in_(names)).all()
+    } if names else set()
+
+    seen = set()
+    for item in items:
+        if item.error is not None:
+            continue
+        if item.filename in existing or item.filename in seen or job_queue.has_pending_filename(item.filename):
+            item.error = JobError(
+                409,
+                f"Já existe um contrato com o nome de arquivo '{item.filename}'. Por favor, escolha outro nome."
+            )
+            item.upload.cleanup()
+            item.upload = None
+        seen.add(item.filename)
@@ -0,0 +1,226 @@
+"""
+Reanálise em lote dos contratos salvos, para quando o modelo (GROQ_MODEL), o
+prompt (PROMPT_VERSION), as regras locais ou o ANALYSIS_MODE mudam.
+
+Uso (na pasta contract_analyzer):
+    python -m app.services.bulk_reanalysis                 # contratos com análise desatualizada
+    python -m app.services.bulk_reanalysis --all --force   # todos, sem usar o cache
+    python -m app.services.bulk_reanalysis --resume        # tenta de novo os que falharam e continua de onde parou
+
+Cada contrato é salvo em uma transação curta, então a API continua usando o
+banco normalmente durante a execução.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from sqlalchemy import func, or_, select
+from app.core.config import (
+    REANALYSIS_BATCH_SIZE, REANALYSIS_CONCURRENCY,
+    REANALYSIS_REQUESTS_PER_MINUTE, REANALYSIS_CHECKPOINT_FILE
+)
+from app.database import SessionLocal, init_db
+from app.models.contract import Contract
+from app.models.contract_document import ContractDocument
+from app.services.ai_service import ANALYZER_NAME, ANALYZER_VERSION
+from app.services.contract_pipeline import reanalyze_contract, save_cache_hits
+from app.services.job_queue import JobError
+from app.services.llm_client import configure_groq_client, close_groq_client
+
+
+@dataclass
+class Checkpoint:
+    """
+    Progresso salvo em disco: todos os contratos com ID até `last_id` já foram
+    tratados; os que falharam (ex.: limite da IA, timeout) ficam em `failed_ids`
+    e são tentados de novo primeiro ao retomar.
+    """
+    last_id: int = 0
+    done: int = 0
+    cached: int = 0
+    failed_ids: list[int] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        with open(path, encoding="utf-8") as checkpoint_file:
+            return cls(**json.load(checkpoint_file))
+
+    def save(self, path: str):
+        # Grava em arquivo temporário e renomeia, para não corromper o checkpoint se o processo cair
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(asdict(self), checkpoint_file)
+        os.replace(temp_path, path)
+
+
+def build_query(include_all: bool, ids: list[int] | None, uploaded_by: int | None):
+    """
+    Seleciona os contratos com texto armazenado que devem ser reanalisados.
+    """
+    query = select(Contract.id).join(ContractDocument, ContractDocument.contract_id == Contract.id)
+    if not include_all:
+        query = query.where(or_(
+            Contract.analysis_model.is_(None),
+            Contract.prompt_version.is_(None),
+            Contract.analysis_model != ANALYZER_NAME,
+            Contract.prompt_version != ANALYZER_VERSION
+        ))
+    if ids:
+        query = query.where(Contract.id.in_(ids))
+    if uploaded_by is not None:
+        query = query.where(Contract.uploaded_by == uploaded_by)
+    return query
+
+
+def _fetch_batch(query, after_id: int, size: int) -> list[int]:
+    db = SessionLocal()
+    try:
+        return list(db.scalars(query.where(Contract.id > after_id).order_by(Contract.id).limit(size)))
+    finally:
+        db.close()
+
+
+def _fetch_ids(query, ids: list[int]) -> list[int]:
+    db = SessionLocal()
+    try:
+        return list(db.scalars(query.where(Contract.id.in_(ids)).order_by(Contract.id)))
+    finally:
+        db.close()
+
+
+def _count(query, after_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.scalar(select(func.count()).select_from(query.where(Contract.id > after_id).subquery()))
+    finally:
+        db.close()
+
+
+async def run_bulk_reanalysis(
+    query,
+    checkpoint: Checkpoint,
+    checkpoint_path: str,
+    batch_size: int,
+    concurrency: int,
+    force: bool,
+    limit: int | None = None
+) -> Checkpoint:
+    # Falhas da execução anterior que ainda precisam de reanálise (os contratos excluídos ou já atualizados saem da lista)
+    retry_ids = _fetch_ids(query, checkpoint.failed_ids) if checkpoint.failed_ids else []
+    checkpoint.failed_ids = retry_ids
+
+    total = len(retry_ids) + _count(query, checkpoint.last_id)
+    if limit is not None:
+        total = min(total, limit)
+    print(f"Contratos a reanalisar: {total} (analisador {ANALYZER_NAME}, versão {ANALYZER_VERSION})")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    started_at = time.monotonic()
+    processed = 0
+
+    async def reanalyze(contract_id: int):
+        async with semaphore:
+            try:
+                result = await reanalyze_contract(contract_id, force)
+                return contract_id, result, None
+            except JobError as e:
+                return contract_id, None, e.detail
+            except Exception as e:
+                return contract_id, None, str(e)
+
+    while processed < total:
+        retrying = processed < len(retry_ids)
+        size = min(batch_size, total - processed)
+        if retrying:
+            batch = retry_ids[processed:processed + min(size, len(retry_ids) - processed)]
+        else:
+            batch = _fetch_batch(query, checkpoint.last_id, size)
+        if not batch:
+            break
+
+        results = await asyncio.gather(*(reanalyze(contract_id) for contract_id in batch))
+        failed = []
+        for contract_id, result, error in results:
+            if error is not None:
+                print(f"  Contrato {contract_id}: erro - {error}")
+                failed.append(contract_id)
+            else:
+                checkpoint.done += 1
+                checkpoint.cached += int(result["cached"])
+
+        if retrying:
+            # Tira o lote da lista de falhas; os que falharam de novo voltam para o fim
+            finished = set(batch)
+            checkpoint.failed_ids = [contract_id for contract_id in checkpoint.failed_ids if contract_id not in finished] + failed
+        else:
+            # O lote inteiro terminou: avança o checkpoint até o último ID
+            checkpoint.failed_ids += failed
+            checkpoint.last_id = batch[-1]
+        checkpoint.save(checkpoint_path)
+
+        processed += len(batch)
+        elapsed = time.monotonic() - started_at
+        rate = processed / elapsed if elapsed else 0
+        remaining = (total - processed) / rate if rate else 0
+        print(
+            f"Progresso: {processed}/{total} ({processed * 100 // total}%) | "
+            f"{checkpoint.done} reanalisados, {len(checkpoint.failed_ids)} erros | "
+            f"{rate:.2f} contratos/s | restante ~{remaining:.0f}s"
+        )
+
+    return checkpoint
+
+
+def _parse_ids(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Reanalisa em lote os contratos salvos usando o texto armazenado.")
+    parser.add_argument("--all", action="store_true", help="Inclui contratos já analisados com o analisador atual")
+    parser.add_argument("--ids", type=_parse_ids, help="Apenas estes IDs (ex.: 1,2,3)")
+    parser.add_argument("--uploaded-by", type=int, help="Apenas contratos enviados por este usuário (ID)")
+    parser.add_argument("--limit", type=int, help="Número máximo de contratos nesta execução")
+    parser.add_argument("--force", action="store_true", help="Ignora o cache de análises e chama a IA para todos")
+    parser.add_argument("--batch-size", type=int, default=REANALYSIS_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=REANALYSIS_CONCURRENCY)
+    parser.add_argument("--requests-per-minute", type=int, default=REANALYSIS_REQUESTS_PER_MINUTE, help="Limite de chamadas ao Groq (0 = sem limite)")
+    parser.add_argument("--checkpoint", default=REANALYSIS_CHECKPOINT_FILE, help="Arquivo de progresso")
+    parser.add_argument("--resume", action="store_true", help="Tenta de novo os contratos com erro e continua a partir do checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas conta os contratos que seriam reanalisados")
+    args = parser.parse_args()
+
+    init_db()
+    query = build_query(args.all, args.ids, args.uploaded_by)
+
+    checkpoint = Checkpoint()
+    if args.resume and os.path.exists(args.checkpoint):
+        checkpoint = Checkpoint.load(args.checkpoint)
+        print(
+            f"Retomando após o contrato {checkpoint.last_id} ({checkpoint.done} já reanalisados, "
+            f"{len(checkpoint.failed_ids)} com erro a tentar de novo)."
+        )
+
+    if args.dry_run:
+        retry_count = len(_fetch_ids(query, checkpoint.failed_ids)) if checkpoint.failed_ids else 0
+        print(f"Contratos que seriam reanalisados: {retry_count + _count(query, checkpoint.last_id)}")
+        return
+
+    configure_groq_client(max_concurrency=args.concurrency, requests_per_minute=args.requests_per_minute)
+    try:
+        checkpoint = await run_bulk_reanalysis(
+            query, checkpoint, args.checkpoint, args.batch_size, args.concurrency, args.force, args.limit
+        )
+    finally:
+        await close_groq_client()
+        save_cache_hits()
+
+    print(f"Concluído: {checkpoint.done} reanalisados ({checkpoint.cached} do cache), {len(checkpoint.failed_ids)} erros.")
+    if checkpoint.failed_ids:
+        print(f"IDs com erro: {', '.join(map(str, checkpoint.failed_ids))}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+import re
+
+
+# Início de cláusulas/seções: "CLÁUSULA PRIMEIRA", "Cláusula 2ª", "CAPÍTULO I", "3. DO PAGAMENTO", "4.1 O CONTRATANTE"
+SECTION_HEADING = re.compile(
+    r"^[ \t]*(?:(?i:cl[áa]usula|cap[íi]tulo|se[çc][ãa]o|par[áa]grafo)\b|\d+(?:\.\d+)*[.)]?[ \t]+[A-ZÁÉÍÓÚÂÊÔÃÕÇ])",
+    re.MULTILINE,
+)
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n|\n")
+
+
+def split_sections(text: str) -> list[str]:
+    """
+    Divide o texto do contrato nas fronteiras de cláusulas/seções.
+    O preâmbulo (antes da primeira cláusula) vira a primeira seção.
+    """
+    starts = [match.start() for match in SECTION_HEADING.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(text))
+
+    sections = [text[begin:end].strip() for begin, end in zip(starts, starts[1:])]
+    return [section for section in sections if section]
+
+
+def _split_long_section(section: str, max_chars: int) -> list[str]:
+    """
+    Quebra uma seção maior que o limite por parágrafos e, em último caso,
+    no último espaço antes do limite.
+    """
+    pieces = []
+    for paragraph in PARAGRAPH_BREAK.split(section):
+        paragraph = paragraph.strip()
+        while len(paragraph) > max_chars:
+            cut = paragraph.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        if paragraph:
+            pieces.append(paragraph)
+    return pieces
+
+
+def split_into_chunks(text: str, max_chars: int) -> list[str]:
+    """
+    Agrupa as seções do contrato em trechos de até `max_chars` caracteres,
+    sem cortar cláusulas no meio sempre que possível.
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks = []
+    current = []
+    current_size = 0
+
+    for section in split_sections(text):
+        parts = [section] if len(section) <= max_chars else _split_long_section(section, max_chars)
+        for part in parts:
+            # +2 pela quebra de linha dupla usada para juntar as partes
+            if current and current_size + len(part) + 2 > max_chars:
+                chunks.append("\n\n".join(current))
+                current = []
+                current_size = 0
+            current.append(part)
+            current_size += len(part) + 2
+
+    if current:
+        chunks.append("\n\n".join(current))
+
+    return chunks
@@ -0,0 +1,93 @@
+import re
+import unicodedata
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+from app.models.contract import Contract, ContractParty, ContractAmount
+
+
+# Número no formato brasileiro ("1.000,00", "1000", "1000.50") -> parte inteira e
+# centavos. Não pode fazer parte de outro número, de uma data ou de um percentual.
+AMOUNT_NUMBER = r"(?<![\d.,/])(\d{1,3}(?:\.\d{3})+|\d+)(?:[,.](\d{1,2}))?(?![\d.,/]?\d|\s*%)"
+
+# Valor precedido de "R$" ("12 parcelas de R$ 1.000,00" -> 1.000,00)
+BRL_AMOUNT = re.compile(r"R\$\s*" + AMOUNT_NUMBER)
+
+# Número sem "R$", usado só quando o item não tem nenhum valor com "R$"
+BARE_AMOUNT = re.compile(AMOUNT_NUMBER)
+
+
+def parse_brl_cents(value: str) -> int | None:
+    """
+    Converte um valor em reais no formato brasileiro para centavos.
+
+    Usa o primeiro valor precedido de "R$"; sem "R$", o primeiro número com
+    centavos ou separador de milhar ou, na falta dele, o primeiro número.
+    Percentuais e datas são ignorados. Retorna None se o texto não contiver um valor.
+    """
+    match = BRL_AMOUNT.search(value)
+    if match is None:
+        numbers = list(BARE_AMOUNT.finditer(value))
+        match = next(
+            (number for number in numbers if number.group(2) or "." in number.group(1)),
+            numbers[0] if numbers else None
+        )
+    if match is None:
+        return None
+    integer_part, decimal_part = match.groups()
+    cents = int(integer_part.replace(".", "")) * 100
+    if decimal_part:
+        cents += int(decimal_part.ljust(2, "0"))
+    return cents
+
+
+def normalize_party_name(name: str) -> str:
+    """
+    Minúsculas, sem acentos e com espaços simples ("Comércio  LTDA" -> "comercio ltda").
+    """
+    without_accents = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return " ".join(without_accents.casefold().split())
+
+
+def _split(value: str | None) -> list[str]:
+    return [item.strip() for item in (value or "").split(";") if item.strip()]
+
+
+def _party_values(nomes_partes: str | None) -> list[dict]:
+    return [
+        {"name": name, "name_normalized": normalize_party_name(name)[:500]}
+        for name in _split(nomes_partes)
+    ]
+
+
+def _amount_values(valores_monetarios: str | None) -> list[dict]:
+    return [
+        {"raw": raw, "cents": cents}
+        for raw in _split(valores_monetarios)
+        if (cents := parse_brl_cents(raw)) is not None
+    ]
+
+
+def sync_contract_entities(contract: Contract):
+    """
+    Recria as partes e os valores normalizados a partir das colunas de texto do contrato.
+    """
+    contract.parties = [ContractParty(**values) for values in _party_values(contract.nomes_partes)]
+    contract.amounts = [ContractAmount(**values) for values in _amount_values(contract.valores_monetarios)]
+
+
+def replace_contract_entities(db: Session, contract_id: int, values: dict):
+    """
+    Recria as partes e/ou os valores normalizados de um contrato a partir dos
+    campos de texto presentes em `values`, sem carregar o contrato.
+    """
+    entities = [
+        ("nomes_partes", ContractParty, _party_values),
+        ("valores_monetarios", ContractAmount, _amount_values),
+    ]
+    for field, model, parse in entities:
+        if field not in values:
+            continue
+        db.execute(delete(model).where(model.contract_id == contract_id))
+        rows = [{"contract_id": contract_id, **item} for item in parse(values[field])]
+        if rows:
+            db.execute(insert(model), rows)
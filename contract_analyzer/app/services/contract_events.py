@@ -0,0 +1,190 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from app.core.config import (
+    CONTRACT_EVENTS_BUFFER_SIZE, CONTRACT_EVENTS_QUEUE_SIZE,
+    CONTRACT_EVENTS_HEARTBEAT_SECONDS, CONTRACT_EVENTS_MAX_STREAM_SECONDS
+)
+from app.core.metrics import CONTRACT_EVENTS_PUBLISHED, CONTRACT_EVENT_SUBSCRIBERS
+
+
+# Campos do contrato enviados nos eventos (os mesmos exibidos na tabela do frontend)
+EVENT_FIELDS = [
+    "id", "filename", "nomes_partes", "valores_monetarios", "obrigacoes_principais",
+    "dados_adicionais", "clausulas_rescisao", "version"
+]
+
+# Tempo que o navegador espera antes de reconectar (campo "retry" do SSE)
+RECONNECT_MILLISECONDS = 3000
+
+
+def contract_event_data(contract) -> dict:
+    """
+    Dados de um contrato (modelo ou linha de um RETURNING) para os eventos.
+    """
+    return {field: getattr(contract, field) for field in EVENT_FIELDS}
+
+
+@dataclass
+class ContractEvent:
+    id: str  # "<instância>-<sequência>", enviado de volta pelo cliente em Last-Event-ID
+    sequence: int
+    type: str  # contract_created, contract_updated, contract_analyzed, contract_deleted, ready ou resync
+    data: dict
+
+    def encode(self) -> str:
+        data = json.dumps(self.data, ensure_ascii=False, default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {data}\n\n"
+
+
+class _Subscriber:
+    """
+    Cliente conectado: recebe os eventos em uma fila do event loop da conexão.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(max_pending)
+        self.closed = False
+
+    def deliver(self, event: ContractEvent | None):
+        # Executado no event loop do cliente. Se ele não consome os eventos (fila cheia),
+        # a conexão é encerrada; o navegador reconecta e retoma pelo Last-Event-ID.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.closed = True
+
+
+class ContractEventBroker:
+    """
+    Distribui os eventos de contratos (criação, edição, análise e exclusão) aos
+    clientes conectados em GET /contracts/events.
+
+    Os últimos eventos ficam em um buffer circular: um cliente que reconecta
+    com Last-Event-ID recebe os que perdeu. Se eles já saíram do buffer (ou o
+    ID é de outra execução da API), o cliente recebe "resync" e deve recarregar
+    a lista. Os eventos ficam na memória do processo, como a fila de jobs.
+
+    `publish` pode ser chamado de qualquer thread (os contratos são gravados em
+    threads pelo pipeline de upload).
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int):
+        # Identifica esta execução: IDs de eventos de uma execução anterior não são retomados
+        self.instance = format(time.time_ns() // 1000, "x")
+        self.queue_size = queue_size
+        self._sequence = 0
+        self._buffer: deque[ContractEvent] = deque(maxlen=buffer_size)
+        self._subscribers: set[_Subscriber] = set()
+        self._lock = threading.Lock()
+
+    def _event_id(self, sequence: int) -> str:
+        return f"{self.instance}-{sequence}"
+
+    def publish(self, event_type: str, data: dict) -> ContractEvent:
+        with self._lock:
+            self._sequence += 1
+            event = ContractEvent(self._event_id(self._sequence), self._sequence, event_type, data)
+            self._buffer.append(event)
+            subscribers = list(self._subscribers)
+
+        CONTRACT_EVENTS_PUBLISHED.inc(type=event_type)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, event)
+            except RuntimeError:
+                # Event loop já encerrado
+                pass
+        return event
+
+    def _backlog(self, last_event_id: str | None) -> list[ContractEvent] | None:
+        # Eventos posteriores a `last_event_id`, ou None se não for possível retomar
+        if not last_event_id:
+            return []
+        instance, _, sequence = last_event_id.strip().rpartition("-")
+        if instance != self.instance or not sequence.isdigit() or int(sequence) > self._sequence:
+            return None
+        sequence = int(sequence)
+        if self._buffer and self._buffer[0].sequence > sequence + 1:
+            return None
+        return [event for event in self._buffer if event.sequence > sequence]
+
+    def subscribe(self, last_event_id: str | None) -> tuple[_Subscriber, list[ContractEvent] | None, str]:
+        """
+        Registra um cliente e retorna também os eventos que ele perdeu (None se
+        precisar recarregar a lista) e o ID do último evento publicado.
+
+        Feito sob o mesmo lock do `publish`: cada evento vai para o histórico
+        retornado ou para a fila do cliente, nunca para os dois nem para nenhum.
+        """
+        subscriber = _Subscriber(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            backlog = self._backlog(last_event_id)
+            self._subscribers.add(subscriber)
+            current_id = self._event_id(self._sequence)
+        return subscriber, backlog, current_id
+
+    def unsubscribe(self, subscriber: _Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def close(self):
+        """
+        Encerra as conexões abertas (desligamento da API).
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.closed = True
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, None)
+            except RuntimeError:
+                pass
+
+    async def stream(self, last_event_id: str | None):
+        """
+        Gera o corpo text/event-stream de uma conexão: os eventos perdidos (ou
+        "resync", ou "ready" com o ID atual se não houver nenhum), depois os novos, com um comentário a cada
+        CONTRACT_EVENTS_HEARTBEAT_SECONDS para manter a conexão aberta em proxies.
+
+        A conexão é encerrada após CONTRACT_EVENTS_MAX_STREAM_SECONDS; o
+        cliente reconecta com um novo token e retoma do último evento.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + CONTRACT_EVENTS_MAX_STREAM_SECONDS
+        subscriber, backlog, current_id = self.subscribe(last_event_id)
+        CONTRACT_EVENT_SUBSCRIBERS.inc()
+        try:
+            yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+            if backlog is None:
+                yield ContractEvent(current_id, self._sequence, "resync", {}).encode()
+            elif not backlog:
+                # Informa o ID atual: se a conexão cair antes do próximo evento, o cliente retoma daqui
+                yield ContractEvent(current_id, self._sequence, "ready", {}).encode()
+            for event in backlog or []:
+                yield event.encode()
+
+            while not subscriber.closed:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=min(CONTRACT_EVENTS_HEARTBEAT_SECONDS, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if event is None:
+                    break
+                yield event.encode()
+        finally:
+            CONTRACT_EVENT_SUBSCRIBERS.dec()
+            self.unsubscribe(subscriber)
+
+
+contract_events = ContractEventBroker(CONTRACT_EVENTS_BUFFER_SIZE, CONTRACT_EVENTS_QUEUE_SIZE)
@@ -0,0 +1,496 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.config import BATCH_CONCURRENCY, BATCH_COMMIT_SIZE, NEAR_DUPLICATE_DETECTION
+from app.core.metrics import STAGE_SECONDS
+from app.core.request_log import log_event
+from app.database import SessionLocal
+from app.models.contract import Contract
+from app.schemas.analysis import ContractAnalysis
+from app.services.file_parser import extract_document
+from app.services.ai_service import ANALYZER_NAME, ANALYZER_VERSION, analyze_contract
+from app.services.batch_upload import BatchItem, cleanup_batch
+from app.services.analysis_cache import get_cached_analysis, store_analysis, flush_cache_hits, make_cache_key, text_cache_key
+from app.models.analysis_cache import utcnow
+from app.services.job_queue import JobError
+from app.services.llm_client import LLMRateLimitError
+from app.services.contract_entities import sync_contract_entities
+from app.services.document_store import ExtractedDocument, build_document_record, find_document_by_file, load_document
+from app.services.search_index import index_contract
+from app.services.near_duplicates import attach_fingerprint, match_near_duplicate, minhash_signature
+from app.services.contract_events import contract_events, contract_event_data
+from app.services.upload_spool import SpooledUpload
+
+
+# Análises da IA em andamento por chave do texto: envios simultâneos do mesmo
+# conteúdo (ex.: cópias no mesmo lote) aguardam a mesma chamada
+_pending_analyses: dict[str, asyncio.Task] = {}
+
+
+@dataclass
+class AnalyzedUpload:
+    analysis: dict
+    cached: bool
+    document: ExtractedDocument  # Texto extraído agora ou guardado de um envio anterior do mesmo arquivo
+    similar: dict | None = None  # Contrato já salvo mais semelhante (ver match_near_duplicate)
+
+
+def _join(value, separator: str) -> str:
+    """
+    Junta listas com o separador; textos são mantidos como vieram da IA.
+    """
+    if isinstance(value, list):
+        return separator.join(str(item) for item in value)
+    return value or ""
+
+
+def _duplicate_filename_error(filename: str) -> JobError:
+    return JobError(
+        409,
+        f"Já existe um contrato com o nome de arquivo '{filename}'. Por favor, escolha outro nome."
+    )
+
+
+def apply_analysis(contract: Contract, analysis_result: dict):
+    """
+    Preenche os campos do contrato (e as partes/valores normalizados) com o resultado da análise.
+    """
+    # Valida também análises antigas do cache, salvas antes da validação da resposta da IA
+    analysis_result = ContractAnalysis.model_validate(analysis_result).model_dump()
+    contract.nomes_partes = _join(analysis_result["nomes_partes"], "; ")
+    contract.valores_monetarios = _join(analysis_result["valores_monetarios"], "; ")
+    contract.obrigacoes_principais = _join(analysis_result["obrigacoes_principais"], "\n")
+    contract.dados_adicionais = analysis_result["dados_adicionais"]
+    contract.clausulas_rescisao = _join(analysis_result["clausulas_rescisao"], "; ")
+    # O cache é separado por analisador, então a análise corresponde ao atual
+    contract.analysis_model = ANALYZER_NAME
+    contract.prompt_version = ANALYZER_VERSION
+    contract.analyzed_at = utcnow()
+    sync_contract_entities(contract)
+
+
+def build_contract(filename: str, user_id: int, analysis_result: dict) -> Contract:
+    """
+    Monta o registro do contrato a partir do resultado da análise.
+    """
+    contract = Contract(filename=filename, uploaded_by=user_id)
+    apply_analysis(contract, analysis_result)
+    return contract
+
+
+def document_signature(document: ExtractedDocument) -> list[int] | None:
+    """
+    Assinatura MinHash do texto, calculada uma vez por documento.
+    """
+    if document.signature is None:
+        document.signature = minhash_signature(document.text)
+    return document.signature
+
+
+def _add_contract(db, filename: str, user_id: int, analysis_result: dict, document: ExtractedDocument | None) -> Contract:
+    contract = build_contract(filename, user_id, analysis_result)
+    if document is not None:
+        contract.document = build_document_record(document)
+        attach_fingerprint(contract, document_signature(document))
+    db.add(contract)
+    return contract
+
+
+def save_contract(filename: str, user_id: int, analysis_result: dict, document: ExtractedDocument | None = None) -> int:
+    """
+    Salva o contrato analisado no banco (com o texto extraído, se houver, e no
+    índice de busca), publica o evento contract_created e retorna o ID gerado.
+    """
+    db = SessionLocal()
+    try:
+        db_contract = _add_contract(db, filename, user_id, analysis_result, document)
+        db.flush()
+        index_contract(db, db_contract, document.text if document else None)
+        event_data = contract_event_data(db_contract)
+        db.commit()
+        contract_events.publish("contract_created", event_data)
+        return db_contract.id
+    except IntegrityError:
+        db.rollback()
+        raise _duplicate_filename_error(filename)
+    finally:
+        db.close()
+
+
+def save_contracts_bulk(entries: list[tuple[str, dict, ExtractedDocument | None]], user_id: int) -> list[int | JobError]:
+    """
+    Salva vários contratos em um único commit. Se algum nome de arquivo
+    violar a unicidade, salva um a um para identificar qual falhou.
+    Retorna, na mesma ordem, o ID gerado ou o erro de cada contrato.
+    """
+    db = SessionLocal()
+    try:
+        contracts = [_add_contract(db, filename, user_id, analysis, document) for filename, analysis, document in entries]
+        db.flush()
+        for contract, (_, _, document) in zip(contracts, entries):
+            index_contract(db, contract, document.text if document else None)
+        events_data = [contract_event_data(contract) for contract in contracts]
+        db.commit()
+        for event_data in events_data:
+            contract_events.publish("contract_created", event_data)
+        return [event_data["id"] for event_data in events_data]
+    except IntegrityError:
+        db.rollback()
+    finally:
+        db.close()
+
+    results = []
+    for filename, analysis, document in entries:
+        try:
+            results.append(save_contract(filename, user_id, analysis, document))
+        except JobError as e:
+            results.append(e)
+    return results
+
+
+def load_cached_analysis(cache_key: str) -> dict | None:
+    db = SessionLocal()
+    try:
+        with STAGE_SECONDS.time(stage="cache"):
+            return get_cached_analysis(db, cache_key)
+    finally:
+        db.close()
+
+
+def load_contract_document(contract_id: int) -> ExtractedDocument | None:
+    db = SessionLocal()
+    try:
+        return load_document(db, contract_id)
+    finally:
+        db.close()
+
+
+def update_contract_analysis(contract_id: int, analysis_result: dict, extracted_text: str):
+    """
+    Substitui a análise de um contrato existente, atualiza o índice de busca e
+    publica o evento contract_analyzed.
+    """
+    db = SessionLocal()
+    try:
+        contract = db.get(Contract, contract_id)
+        if contract is None:
+            raise JobError(404, f"Contrato com ID '{contract_id}' não encontrado.")
+        apply_analysis(contract, analysis_result)
+        index_contract(db, contract, extracted_text)
+        db.flush()
+        event_data = contract_event_data(contract)
+        db.commit()
+    except StaleDataError:
+        # O contrato foi editado ou excluído enquanto a análise era feita
+        db.rollback()
+        raise JobError(409, f"O contrato com ID '{contract_id}' foi alterado durante a reanálise. Tente novamente.")
+    finally:
+        db.close()
+    contract_events.publish("contract_analyzed", event_data)
+
+
+def load_document_by_file(file_sha256: str) -> ExtractedDocument | None:
+    db = SessionLocal()
+    try:
+        return find_document_by_file(db, file_sha256)
+    finally:
+        db.close()
+
+
+def find_near_duplicate(document: ExtractedDocument | None, reuse: bool) -> tuple[dict | None, dict | None]:
+    """
+    Contrato já salvo mais semelhante ao documento e, com `reuse`, a análise
+    dele quando pode ser reaproveitada (ver match_near_duplicate).
+    """
+    if document is None or not NEAR_DUPLICATE_DETECTION:
+        return None, None
+
+    db = SessionLocal()
+    try:
+        with STAGE_SECONDS.time(stage="similarity"):
+            signature = document_signature(document)
+            if signature is None:
+                return None, None
+            similar, analysis_result = match_near_duplicate(db, document.text, signature, reuse)
+    finally:
+        db.close()
+
+    if similar is not None:
+        log_event("near_duplicate_found", similar_to=similar["id"], similarity=similar["similarity"], analysis_reused=similar["analysis_reused"])
+    return similar, analysis_result
+
+
+def save_cached_analysis(cache_keys: list[str], analysis_result: dict):
+    db = SessionLocal()
+    try:
+        store_analysis(db, cache_keys, analysis_result)
+    finally:
+        db.close()
+
+
+def save_cache_hits():
+    """
+    Grava os acertos do cache ainda pendentes (desligamento da API).
+    """
+    db = SessionLocal()
+    try:
+        flush_cache_hits(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def analyze_text(extracted_text: str) -> dict:
+    """
+    Analisa o texto (IA e/ou regras locais, conforme ANALYSIS_MODE),
+    convertendo as falhas no erro HTTP equivalente.
+    """
+    try:
+        return await analyze_contract(extracted_text)
+    except LLMRateLimitError:
+        raise JobError(503, "Limite de requisições da IA atingido. Tente novamente em instantes.")
+    except Exception as e:
+        raise JobError(500, f"Erro ao processar o contrato com a IA: {str(e)}")
+
+
+async def analyze_text_once(text_key: str | None, extracted_text: str) -> dict:
+    """
+    Como `analyze_text`, mas chamadas simultâneas para o mesmo texto
+    compartilham uma única análise em andamento.
+    """
+    if text_key is None:
+        return await analyze_text(extracted_text)
+
+    task = _pending_analyses.get(text_key)
+    if task is None:
+        task = asyncio.create_task(analyze_text(extracted_text))
+        _pending_analyses[text_key] = task
+
+        def forget(finished: asyncio.Task):
+            if _pending_analyses.get(text_key) is finished:
+                del _pending_analyses[text_key]
+            if not finished.cancelled():
+                finished.exception()  # Marca o erro como tratado mesmo se todos os interessados desistiram
+
+        task.add_done_callback(forget)
+
+    # shield: o cancelamento de um dos interessados (ex.: cliente do lote desconectou) não cancela a análise dos outros
+    return await asyncio.shield(task)
+
+
+async def _reuse_stored_document(upload: SpooledUpload, analysis_result: dict) -> AnalyzedUpload | None:
+    """
+    Resultado de um arquivo idêntico já analisado, com o texto guardado dele.
+    Sem o texto guardado (ex.: o contrato foi excluído), retorna None e mantém o
+    arquivo temporário, para que o texto seja extraído e salvo com o contrato.
+    """
+    document = await asyncio.to_thread(load_document_by_file, upload.sha256)
+    if document is None:
+        return None
+    upload.cleanup()
+    similar, _ = await asyncio.to_thread(find_near_duplicate, document, False)
+    return AnalyzedUpload(analysis=analysis_result, cached=True, document=document, similar=similar)
+
+
+async def analyze_cached_upload(upload: SpooledUpload) -> AnalyzedUpload | None:
+    """
+    Atalho para o upload de um arquivo idêntico já analisado: retorna a análise
+    em cache e o texto guardado, sem ler o arquivo. Retorna None (mantendo o
+    arquivo temporário) quando é preciso passar por `analyze_upload`.
+    """
+    analysis_result = await asyncio.to_thread(load_cached_analysis, make_cache_key(upload.sha256))
+    if analysis_result is None:
+        return None
+    return await _reuse_stored_document(upload, analysis_result)
+
+
+async def analyze_upload(upload: SpooledUpload, extension: str) -> AnalyzedUpload:
+    """
+    Extrai o texto do arquivo e obtém a análise, do cache ou da IA, e o
+    contrato já salvo mais semelhante.
+
+    A análise em cache é reaproveitada quando os mesmos bytes ou o mesmo
+    texto (contrato salvo em outro arquivo) já foram analisados, ou quando
+    um contrato quase idêntico (cópia com pequenas edições) já foi analisado.
+    As etapas bloqueantes rodam em threads para não travar o event loop.
+    """
+    file_key = make_cache_key(upload.sha256)
+    file_analysis = await asyncio.to_thread(load_cached_analysis, file_key)
+    if file_analysis is not None:
+        analyzed = await _reuse_stored_document(upload, file_analysis)
+        if analyzed is not None:
+            return analyzed
+
+    try:
+        with STAGE_SECONDS.time(stage="parse"):
+            extracted_text, page_count = await asyncio.to_thread(extract_document, upload.path, extension)
+    except ValueError as e:
+        raise JobError(422, str(e))
+    finally:
+        # O arquivo temporário só é necessário para a extração do texto
+        upload.cleanup()
+
+    document = ExtractedDocument(
+        text=extracted_text,
+        extension=extension,
+        file_sha256=upload.sha256,
+        file_size=upload.size,
+        page_count=page_count
+    )
+
+    # Sem texto (ex.: PDF digitalizado), a análise fica apenas sob a chave do arquivo
+    text_key = text_cache_key(extracted_text)
+    cache_keys = [file_key] if text_key is None else [file_key, text_key]
+    if file_analysis is not None:
+        # Arquivo já analisado cujo texto não estava guardado: só faltava extraí-lo
+        analysis_result = file_analysis
+    else:
+        analysis_result = None if text_key is None else await asyncio.to_thread(load_cached_analysis, text_key)
+    cached = analysis_result is not None
+
+    # Sem o texto no cache, tenta reaproveitar a análise de um contrato quase idêntico
+    similar, similar_analysis = await asyncio.to_thread(find_near_duplicate, document, not cached)
+    if similar_analysis is not None:
+        analysis_result, cached = similar_analysis, True
+
+    if not cached:
+        analysis_result = await analyze_text_once(text_key, extracted_text)
+
+    # Registra também a chave do arquivo, para que um novo envio dos mesmos bytes nem precise ser lido
+    await asyncio.to_thread(save_cached_analysis, cache_keys, analysis_result)
+
+    return AnalyzedUpload(analysis=analysis_result, cached=cached, document=document, similar=similar)
+
+
+async def process_contract_upload(
+    filename: str,
+    upload: SpooledUpload,
+    extension: str,
+    user_id: int,
+    username: str
+) -> dict:
+    """
+    Extrai o texto, analisa com a IA e salva o contrato (executado pela fila de jobs).
+    """
+    analyzed = await analyze_upload(upload, extension)
+    with STAGE_SECONDS.time(stage="db"):
+        contract_id = await asyncio.to_thread(save_contract, filename, user_id, analyzed.analysis, analyzed.document)
+    log_event("contract_saved", contract_id=contract_id, filename=filename, cached=analyzed.cached)
+
+    return {
+        "id": contract_id,
+        "filename": filename,
+        "uploaded_by": username,
+        "analysis": analyzed.analysis,
+        "cached": analyzed.cached,
+        "similar_contract": analyzed.similar,
+        "message": "Contrato salvo no banco e analisado com sucesso!"
+    }
+
+
+async def reanalyze_contract(contract_id: int, force: bool) -> dict:
+    """
+    Refaz a análise de um contrato a partir do texto guardado, sem o arquivo
+    original (executado pela fila de jobs). Com `force`, ignora o cache e
+    chama a IA mesmo que o texto já tenha sido analisado pelo modelo atual.
+    """
+    document = await asyncio.to_thread(load_contract_document, contract_id)
+    if document is None:
+        raise JobError(
+            409,
+            "O texto deste contrato não foi armazenado (enviado antes desta funcionalidade). Envie o arquivo novamente."
+        )
+
+    text_key = text_cache_key(document.text)
+    cache_keys = [make_cache_key(document.file_sha256)] + ([] if text_key is None else [text_key])
+    analysis_result = None if force or text_key is None else await asyncio.to_thread(load_cached_analysis, text_key)
+    cached = analysis_result is not None
+
+    if not cached:
+        analysis_result = await analyze_text_once(text_key, document.text)
+        await asyncio.to_thread(save_cached_analysis, cache_keys, analysis_result)
+
+    with STAGE_SECONDS.time(stage="db"):
+        await asyncio.to_thread(update_contract_analysis, contract_id, analysis_result, document.text)
+    log_event("contract_reanalyzed", contract_id=contract_id, cached=cached)
+
+    return {
+        "id": contract_id,
+        "analysis": analysis_result,
+        "cached": cached,
+        "message": "Contrato reanalisado com sucesso!"
+    }
+
+
+def _error_line(filename: str, error: JobError) -> dict:
+    return {"filename": filename, "status": "erro", "status_code": error.status_code, "error": error.detail}
+
+
+async def process_contract_batch(items: list[BatchItem], user_id: int):
+    """
+    Analisa os arquivos de um upload em lote com concorrência limitada e gera
+    o resultado de cada arquivo à medida que termina (para resposta NDJSON).
+
+    Os contratos analisados na mesma rodada são salvos juntos, em commits de
+    até BATCH_COMMIT_SIZE registros.
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def analyze(item):
+        async with semaphore:
+            return await analyze_upload(item.upload, item.extension)
+
+    tasks = {}
+    try:
+        for item in items:
+            if item.error is not None:
+                yield _error_line(item.filename, item.error)
+            else:
+                tasks[asyncio.create_task(analyze(item))] = item
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            to_save = []
+            for task in done:
+                item = tasks[task]
+                try:
+                    analyzed = task.result()
+                except JobError as e:
+                    yield _error_line(item.filename, e)
+                    continue
+                except Exception as e:
+                    log_event("batch_item_error", logging.ERROR, filename=item.filename, error=repr(e))
+                    yield _error_line(item.filename, JobError(500, "Erro inesperado ao processar o contrato."))
+                    continue
+                to_save.append((item.filename, analyzed))
+
+            for start in range(0, len(to_save), BATCH_COMMIT_SIZE):
+                group = to_save[start:start + BATCH_COMMIT_SIZE]
+                with STAGE_SECONDS.time(stage="db"):
+                    results = await asyncio.to_thread(
+                        save_contracts_bulk,
+                        [(filename, analyzed.analysis, analyzed.document) for filename, analyzed in group],
+                        user_id
+                    )
+                for (filename, analyzed), result in zip(group, results):
+                    if isinstance(result, JobError):
+                        yield _error_line(filename, result)
+                    else:
+                        yield {
+                            "filename": filename,
+                            "status": "concluido",
+                            "status_code": 201,
+                            "id": result,
+                            "cached": analyzed.cached,
+                            "similar_contract": analyzed.similar,
+                            "analysis": analyzed.analysis
+                        }
+    finally:
+        # Cliente desconectou ou o lote terminou: cancela o que restou e remove os temporários
+        for task in tasks:
+            task.cancel()
+        cleanup_batch(items)
@@ -0,0 +1,89 @@
+import gzip
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from app.core.config import DOCUMENT_COMPRESSION, DOCUMENT_COMPRESSION_LEVEL
+from app.models.contract_document import ContractDocument
+from app.services.analysis_cache import text_hash
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+@dataclass
+class ExtractedDocument:
+    """
+    Texto extraído de um arquivo enviado e os dados do arquivo original.
+    """
+    text: str
+    extension: str
+    file_sha256: str
+    file_size: int
+    page_count: int | None = None
+    signature: list[int] | None = None  # Assinatura MinHash do texto, calculada na busca por contratos semelhantes
+
+
+def _compression_method() -> str:
+    if DOCUMENT_COMPRESSION == "zstd" and zstandard is not None:
+        return "zstd"
+    return "gzip"
+
+
+def compress_text(text: str) -> tuple[str, bytes]:
+    """
+    Comprime o texto com zstd (se disponível) ou gzip e retorna o método usado.
+    """
+    data = text.encode("utf-8")
+    method = _compression_method()
+    if method == "zstd":
+        return method, zstandard.ZstdCompressor(level=DOCUMENT_COMPRESSION_LEVEL).compress(data)
+    return method, gzip.compress(data, compresslevel=min(DOCUMENT_COMPRESSION_LEVEL, 9))
+
+
+def decompress_text(method: str, content: bytes) -> str:
+    if method == "zstd":
+        if zstandard is None:
+            raise RuntimeError("O texto foi salvo com zstd, mas o pacote zstandard não está instalado.")
+        return zstandard.ZstdDecompressor().decompress(content).decode("utf-8")
+    return gzip.decompress(content).decode("utf-8")
+
+
+def build_document_record(document: ExtractedDocument) -> ContractDocument:
+    compression, content = compress_text(document.text)
+    return ContractDocument(
+        extension=document.extension,
+        file_sha256=document.file_sha256,
+        file_size=document.file_size,
+        page_count=document.page_count,
+        text_sha256=text_hash(document.text),
+        text_size=len(document.text.encode("utf-8")),
+        compression=compression,
+        content=content,
+    )
+
+
+def _to_extracted(record: ContractDocument) -> ExtractedDocument:
+    return ExtractedDocument(
+        text=decompress_text(record.compression, record.content),
+        extension=record.extension,
+        file_sha256=record.file_sha256,
+        file_size=record.file_size,
+        page_count=record.page_count,
+    )
+
+
+def load_document(db: Session, contract_id: int) -> ExtractedDocument | None:
+    """
+    Retorna o texto guardado de um contrato, ou None se ele foi salvo sem o texto.
+    """
+    record = db.get(ContractDocument, contract_id)
+    return _to_extracted(record) if record else None
+
+
+def find_document_by_file(db: Session, file_sha256: str) -> ExtractedDocument | None:
+    """
+    Procura o texto já extraído de um arquivo idêntico (mesmo hash) enviado antes.
+    """
+    record = db.query(ContractDocument).filter(ContractDocument.file_sha256 == file_sha256).first()
+    return _to_extracted(record) if record else None
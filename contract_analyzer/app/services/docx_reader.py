@@ -0,0 +1,139 @@
+import re
+import zipfile
+from typing import BinaryIO, Iterator
+from lxml import etree
+
+
+# Namespaces do WordprocessingML e do markup de compatibilidade (mc:AlternateContent)
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+DOCUMENT_PART = "word/document.xml"
+HEADER_PART = re.compile(r"^word/header(\d*)\.xml$")
+FOOTER_PART = re.compile(r"^word/footer(\d*)\.xml$")
+
+# Separador das células de uma linha de tabela no texto extraído
+CELL_SEPARATOR = " | "
+
+# Conteúdo de cada elemento de texto dentro de um parágrafo
+RUN_TEXT = {
+    f"{W}tab": "\t",
+    f"{W}br": "\n",
+    f"{W}cr": "\n",
+    f"{W}noBreakHyphen": "-",
+}
+
+TAGS = (
+    f"{W}p", f"{W}t", f"{W}tbl", f"{W}tr", f"{W}tc", f"{W}body", f"{W}hdr", f"{W}ftr",
+    MC_FALLBACK, *RUN_TEXT,
+)
+
+
+def iter_part_lines(stream: BinaryIO) -> Iterator[str]:
+    """
+    Lê uma parte XML do DOCX (documento, cabeçalho ou rodapé) de forma
+    incremental e gera o texto de cada parágrafo e de cada linha de tabela,
+    na ordem de leitura. As células de uma linha são unidas por " | ";
+    tabelas dentro de células entram no texto da célula.
+
+    Os elementos já lidos são descartados, então a memória não cresce com
+    o tamanho do documento.
+    """
+    paragraphs: list[list[str]] = []  # Parágrafos abertos (caixas de texto ficam dentro de outro parágrafo)
+    tables: list[dict] = []  # Tabelas abertas, da mais externa para a mais interna
+    fallback_depth = 0  # Dentro de mc:Fallback, que repete o conteúdo de mc:Choice
+
+    def emit(text: str):
+        # Texto completo (parágrafo ou linha de tabela): vai para a célula aberta
+        # mais interna (a linha de uma tabela aninhada vai para a célula externa) ou para a saída
+        for table in reversed(tables):
+            if table["cell"] is not None:
+                table["cell"].append(text)
+                return None
+        return text
+
+    for event, element in etree.iterparse(stream, events=("start", "end"), tag=TAGS, huge_tree=True):
+        tag = element.tag
+
+        if tag == MC_FALLBACK:
+            fallback_depth += 1 if event == "start" else -1
+            continue
+        if fallback_depth:
+            continue
+
+        if event == "start":
+            if tag == f"{W}p":
+                paragraphs.append([])
+            elif tag == f"{W}tbl":
+                tables.append({"row": None, "cell": None})
+            elif tag == f"{W}tr" and tables:
+                tables[-1]["row"] = []
+            elif tag == f"{W}tc" and tables:
+                tables[-1]["cell"] = []
+            continue
+
+        line = None
+        if tag == f"{W}t":
+            if paragraphs:
+                paragraphs[-1].append(element.text or "")
+        elif tag in RUN_TEXT:
+            if paragraphs:
+                paragraphs[-1].append(RUN_TEXT[tag])
+        elif tag == f"{W}p":
+            text = "".join(paragraphs.pop()) if paragraphs else ""
+            line = emit(text)
+        elif tag == f"{W}tc" and tables:
+            table = tables[-1]
+            cell = " ".join(text.strip() for text in table["cell"] if text.strip())
+            if table["row"] is not None:
+                table["row"].append(cell)
+            table["cell"] = None
+        elif tag == f"{W}tr" and tables:
+            row = tables[-1]["row"] or []
+            tables[-1]["row"] = None
+            if any(row):
+                line = emit(CELL_SEPARATOR.join(row))
+        elif tag == f"{W}tbl" and tables:
+            tables.pop()
+
+        if line is not None:
+            yield line
+
+        # Libera o que já foi lido; os filhos diretos do corpo também são removidos da árvore
+        if tag in (f"{W}p", f"{W}tbl"):
+            element.clear()
+            parent = element.getparent()
+            if parent is not None and parent.tag in (f"{W}body", f"{W}hdr", f"{W}ftr"):
+                while element.getprevious() is not None:
+                    del parent[0]
+
+
+def _numbered_parts(names: list[str], pattern: re.Pattern) -> list[str]:
+    matches = [(int(match.group(1) or 0), name) for name in names if (match := pattern.match(name))]
+    return [name for _, name in sorted(matches)]
+
+
+def _part_text(archive: zipfile.ZipFile, name: str) -> str:
+    with archive.open(name) as part:
+        return "\n".join(iter_part_lines(part)).strip()
+
+
+def read_docx_text(stream: BinaryIO) -> str:
+    """
+    Extrai o texto de um DOCX sem montar o modelo completo do documento:
+    cabeçalhos, corpo (parágrafos e tabelas, na ordem) e rodapés.
+    Cabeçalhos e rodapés repetidos (ex.: primeira página e demais) aparecem uma vez.
+    """
+    with zipfile.ZipFile(stream) as archive:
+        names = archive.namelist()
+        if DOCUMENT_PART not in names:
+            raise ValueError("O arquivo não é um documento do Word (word/document.xml não encontrado).")
+
+        headers = [_part_text(archive, name) for name in _numbered_parts(names, HEADER_PART)]
+        with archive.open(DOCUMENT_PART) as part:
+            body = "\n".join(iter_part_lines(part)).strip()
+        footers = [_part_text(archive, name) for name in _numbered_parts(names, FOOTER_PART)]
+
+    # dict.fromkeys remove os repetidos mantendo a ordem
+    sections = [*dict.fromkeys(text for text in headers if text), body, *dict.fromkeys(text for text in footers if text)]
+    return "\n".join(text for text in sections if text)
@@ -1,40 +1,171 @@
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator
 from PyPDF2 import PdfReader
-from docx import Document
 from io import BytesIO
+from app.core.config import PDF_PARSE_WORKERS, PDF_PARALLEL_MIN_PAGES
+from app.services.docx_reader import read_docx_text
 
 
+# Tipos de arquivos permitidos
+ALLOWED_EXTENSIONS = [".pdf", ".docx"]
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+# Os parsers recebem o conteúdo em memória (bytes) ou o caminho de um
+# arquivo em disco (upload gravado em arquivo temporário), que é mapeado com mmap.
+Source = bytes | str
+
+# Separador das páginas no texto extraído de PDFs (em uma linha própria), usado
+# pelo pré-processamento para reconhecer cabeçalhos e rodapés repetidos
+PAGE_BREAK = "\f"
+
+_pdf_executor: ProcessPoolExecutor | None = None
+
+
+class MappedFile(mmap.mmap):
+    """
+    mmap somente leitura que também se apresenta como arquivo "seekable"
+    (exigido pelo zipfile ao abrir DOCX).
+    """
+
+    def seekable(self) -> bool:
+        return True
+
+
+@contextmanager
+def open_source(source: Source):
+    """
+    Abre o documento como arquivo binário: bytes viram BytesIO e caminhos
+    são mapeados em memória, sem carregar o arquivo inteiro na RAM.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        yield BytesIO(source)
+        return
+
+    with open(source, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise ValueError("Arquivo vazio.")
+        with MappedFile(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    global _pdf_executor
+    if _pdf_executor is None:
+        # "spawn" evita copiar por fork as threads e conexões abertas da API
+        _pdf_executor = ProcessPoolExecutor(
+            max_workers=PDF_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pdf_executor
+
+
+def shutdown_pdf_executor():
+    global _pdf_executor
+    if _pdf_executor is not None:
+        _pdf_executor.shutdown(cancel_futures=True)
+        _pdf_executor = None
+
+
+def _iter_pages(pdf: PdfReader, start: int, end: int) -> Iterator[str]:
+    for index in range(start, end):
+        yield pdf.pages[index].extract_text() or ""
+
+
+def _extract_pdf_page_range(source: Source, start: int, end: int) -> list[str]:
+    # Executado em outro processo: abre o PDF e extrai apenas as páginas [start, end)
+    with open_source(source) as stream:
+        return list(_iter_pages(PdfReader(stream), start, end))
+
+
+def iter_pdf_pages(source: Source) -> Iterator[str]:
+    """
+    Gera o texto de cada página do PDF, na ordem, à medida que é extraído,
+    para que as etapas seguintes comecem antes da leitura da última página.
+    O mesmo leitor conta as páginas e extrai as que ficam neste processo.
+
+    PDFs grandes são divididos em faixas de páginas: a primeira é extraída
+    aqui, página a página, e as demais em paralelo, em outros processos (cada
+    faixa é entregue assim que termina e as anteriores já foram entregues);
+    quando o PDF está em disco, cada processo recebe só o caminho do arquivo.
+    """
+    futures = []
+    try:
+        with open_source(source) as stream:
+            pdf = PdfReader(stream)
+            total_pages = len(pdf.pages)
+            if PDF_PARSE_WORKERS <= 1 or total_pages < PDF_PARALLEL_MIN_PAGES:
+                yield from _iter_pages(pdf, 0, total_pages)
+                return
+
+            pages_per_worker = -(-total_pages // PDF_PARSE_WORKERS)  # divisão arredondada para cima
+            executor = _get_pdf_executor()
+            futures = [
+                executor.submit(_extract_pdf_page_range, source, start, min(start + pages_per_worker, total_pages))
+                for start in range(pages_per_worker, total_pages, pages_per_worker)
+            ]
+            yield from _iter_pages(pdf, 0, pages_per_worker)
+
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Consumidor desistiu antes do fim (ou erro): não extrai as faixas que ainda estão na fila
+        for future in futures:
+            future.cancel()
+
+
+def extract_pdf_pages(source: Source) -> list[str]:
+    """
+    Extrai o texto de todas as páginas do PDF, na ordem (ver iter_pdf_pages).
+    """
+    return list(iter_pdf_pages(source))
+
+
+def extract_text_from_pdf(source: Source) -> str:
+    return extract_pdf_document(source)[0]
+
+
+def extract_pdf_document(source: Source) -> tuple[str, int]:
+    """
+    Retorna o texto do PDF e o número de páginas.
+    """
     try:
-        file_like = BytesIO(file_bytes)  # transforma bytes em arquivo PDF
-        pdf = PdfReader(file_like)
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        pages = extract_pdf_pages(source)
+        # Junta as páginas uma única vez, sem concatenar strings no loop
+        return f"\n{PAGE_BREAK}\n".join(pages).strip(), len(pages)
     except Exception as e:
         raise ValueError(f"Erro ao processar PDF: {e}")
 
 
-def extract_text_from_docx(file_bytes: bytes) -> str:
+def extract_text_from_docx(source: Source) -> str:
     """
-    Extrai o texto de um arquivo DOCX (bytes).
+    Extrai o texto de um arquivo DOCX (bytes ou caminho do arquivo), com
+    tabelas, cabeçalhos e rodapés (ver app/services/docx_reader.py).
     """
     try:
-        doc = Document(BytesIO(file_bytes))
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text.strip()
+        with open_source(source) as stream:
+            return read_docx_text(stream).strip()
     except Exception as e:
         raise ValueError(f"Erro ao processar DOCX: {e}")
 
 
-def extract_text(file_bytes: bytes, extension: str) -> str:
+def extract_document(source: Source, extension: str) -> tuple[str, int | None]:
     """
-    Detecta o tipo de arquivo e extrai o texto.
+    Detecta o tipo de arquivo e extrai o texto e o número de páginas
+    (None para DOCX, que não tem paginação fixa).
     """
     if extension == ".pdf":
-        return extract_text_from_pdf(file_bytes)
+        return extract_pdf_document(source)
     elif extension == ".docx":
-        return extract_text_from_docx(file_bytes)
+        return extract_text_from_docx(source), None
     else:
         raise ValueError(f"Extensão de arquivo não suportada: {extension}")
+
+
+def extract_text(source: Source, extension: str) -> str:
+    """
+    Detecta o tipo de arquivo e extrai o texto.
+    """
+    return extract_document(source, extension)[0]
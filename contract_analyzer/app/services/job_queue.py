@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from app.core.config import UPLOAD_WORKERS, UPLOAD_QUEUE_MAX_SIZE, JOB_RETENTION_SECONDS
+from app.core.metrics import JOBS_IN_FLIGHT, JOBS_FINISHED
+from app.core.request_log import log_event, request_id_var
+
+
+# Status possíveis de um job
+JOB_PENDING = "pendente"
+JOB_PROCESSING = "processando"
+JOB_DONE = "concluido"
+JOB_FAILED = "erro"
+
+
+class JobError(Exception):
+    """
+    Erro esperado durante o processamento de um job, com o status HTTP equivalente.
+    """
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class QueueFullError(Exception):
+    """
+    A fila atingiu o limite de jobs aguardando processamento.
+    """
+
+
+@dataclass
+class Job:
+    id: str
+    owner_id: int
+    filename: str
+    status: str = JOB_PENDING
+    result: dict | None = None
+    error: str | None = None
+    status_code: int | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    request_id: str | None = None  # Requisição que criou o job (para correlacionar os logs)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "status_code": self.status_code,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    Fila em memória com um número fixo de workers assíncronos.
+
+    Os jobs ficam no processo da API; o status de jobs finalizados é mantido
+    por `retention_seconds` para consulta (polling) e depois descartado.
+    """
+
+    def __init__(self, workers: int, max_size: int, retention_seconds: int):
+        self.workers = workers
+        self.max_size = max_size
+        self.retention_seconds = retention_seconds
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._jobs: dict[str, Job] = {}
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def submit(self, owner_id: int, filename: str, handler, *args) -> Job:
+        """
+        Enfileira `handler(*args)` e retorna o job criado sem aguardar o processamento.
+        """
+        if self._queue is None:
+            raise RuntimeError("A fila de jobs não foi iniciada.")
+
+        self._prune()
+        job = Job(id=uuid.uuid4().hex, owner_id=owner_id, filename=filename, request_id=request_id_var.get())
+        try:
+            self._queue.put_nowait((job, handler, args))
+        except asyncio.QueueFull:
+            raise QueueFullError()
+
+        self._jobs[job.id] = job
+        JOBS_IN_FLIGHT.inc(status=JOB_PENDING)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def has_pending_filename(self, filename: str) -> bool:
+        """
+        Indica se já existe um job em andamento para o mesmo nome de arquivo.
+        """
+        return any(
+            job.filename == filename and job.status in (JOB_PENDING, JOB_PROCESSING)
+            for job in self._jobs.values()
+        )
+
+    def _prune(self):
+        limit = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < limit
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _worker(self):
+        while True:
+            job, handler, args = await self._queue.get()
+            job.status = JOB_PROCESSING
+            JOBS_IN_FLIGHT.dec(status=JOB_PENDING)
+            JOBS_IN_FLIGHT.inc(status=JOB_PROCESSING)
+            # Os logs do processamento levam o ID da requisição que enviou o contrato
+            token = request_id_var.set(job.request_id)
+            try:
+                job.result = await handler(*args)
+                job.status = JOB_DONE
+                job.status_code = 201
+            except JobError as e:
+                job.status = JOB_FAILED
+                job.status_code = e.status_code
+                job.error = e.detail
+            except Exception as e:
+                log_event("job_error", logging.ERROR, job_id=job.id, error=repr(e))
+                job.status = JOB_FAILED
+                job.status_code = 500
+                job.error = "Erro inesperado ao processar o contrato."
+            finally:
+                job.finished_at = time.time()
+                JOBS_IN_FLIGHT.dec(status=JOB_PROCESSING)
+                if job.status_code is not None:  # None: worker cancelado no desligamento
+                    JOBS_FINISHED.inc(status_code=job.status_code)
+                log_event(
+                    "job_finished",
+                    job_id=job.id,
+                    filename=job.filename,
+                    status=job.status,
+                    status_code=job.status_code,
+                    duration_ms=round((job.finished_at - job.created_at) * 1000, 1),
+                )
+                request_id_var.reset(token)
+                self._queue.task_done()
+
+
+job_queue = JobQueue(
+    workers=UPLOAD_WORKERS,
+    max_size=UPLOAD_QUEUE_MAX_SIZE,
+    retention_seconds=JOB_RETENTION_SECONDS,
+)
@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import random
+import time
+import httpx
+from openai import AsyncOpenAI, APIStatusError, APIConnectionError, RateLimitError
+from app.core.config import (
+    GROQ_API_KEY, GROQ_API_BASE, GROQ_MAX_CONCURRENCY, GROQ_TIMEOUT_SECONDS, GROQ_MAX_RETRIES,
+    GROQ_BACKOFF_BASE_SECONDS, GROQ_BACKOFF_MAX_SECONDS, GROQ_REQUESTS_PER_MINUTE,
+    GROQ_TOKENS_PER_MINUTE, GROQ_MAX_CONNECTIONS
+)
+from app.core.metrics import LLM_REQUESTS, LLM_REQUEST_SECONDS, LLM_TOKENS
+from app.core.request_log import log_event
+
+
+class LLMRateLimitError(RuntimeError):
+    """
+    O Groq continuou respondendo 429 mesmo após todas as novas tentativas.
+    """
+    def __init__(self, retry_after: float | None = None):
+        super().__init__("Limite de requisições da IA (Groq) atingido.")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Balde de tokens: libera até `rate_per_minute` unidades por minuto, com
+    rajadas de no máximo `capacity`. Com taxa 0 o limite fica desativado.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1):
+        if self.rate <= 0:
+            return
+
+        # Um pedido maior que o balde inteiro esperaria para sempre
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+    def consume(self, amount: float):
+        """
+        Desconta um consumo já realizado (ex.: diferença entre tokens estimados e reais).
+        O saldo pode ficar negativo, atrasando as próximas requisições.
+        """
+        if self.rate <= 0:
+            return
+        self._refill()
+        self.tokens -= amount
+
+
+def estimate_tokens(text: str) -> int:
+    # Aproximação usada apenas para o limite de taxa (~4 caracteres por token)
+    return len(text) // 4 + 1
+
+
+def backoff_delay(attempt: int, base: float = GROQ_BACKOFF_BASE_SECONDS, cap: float = GROQ_BACKOFF_MAX_SECONDS) -> float:
+    """
+    Espera exponencial com jitter completo: aleatória entre 0 e base * 2^tentativa.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _record_call(model: str, outcome: str, start: float, attempt: int, usage=None):
+    """
+    Registra a duração da chamada, os tokens consumidos (response.usage) e uma linha de log.
+    """
+    elapsed = time.perf_counter() - start
+    LLM_REQUESTS.inc(outcome=outcome)
+    LLM_REQUEST_SECONDS.observe(elapsed, outcome=outcome)
+    fields = {}
+    if usage is not None:
+        LLM_TOKENS.inc(usage.prompt_tokens, model=model, type="prompt")
+        LLM_TOKENS.inc(usage.completion_tokens, model=model, type="completion")
+        fields = {"prompt_tokens": usage.prompt_tokens, "completion_tokens": usage.completion_tokens}
+    log_event("llm_call", model=model, outcome=outcome, attempt=attempt + 1, duration_ms=round(elapsed * 1000, 1), **fields)
+
+
+def _retry_after(error: APIStatusError) -> float | None:
+    value = error.response.headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class GroqClient:
+    """
+    Cliente assíncrono do Groq compartilhado pela aplicação.
+
+    Reaproveita um pool de conexões keep-alive, limita as chamadas simultâneas
+    com um semáforo, respeita as cotas por minuto com token buckets e repete
+    as chamadas que falham com 429/5xx/erros de conexão usando backoff exponencial.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        max_concurrency: int = GROQ_MAX_CONCURRENCY,
+        requests_per_minute: int = GROQ_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = GROQ_TOKENS_PER_MINUTE,
+        max_retries: int = GROQ_MAX_RETRIES,
+        timeout: float = GROQ_TIMEOUT_SECONDS,
+        max_connections: int = GROQ_MAX_CONNECTIONS,
+    ):
+        self.max_retries = max_retries
+        self._http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=10),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self._http_client,
+            max_retries=0,  # As novas tentativas são controladas aqui
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._request_bucket = TokenBucket(requests_per_minute)
+        self._token_bucket = TokenBucket(tokens_per_minute)
+
+    async def chat(self, messages: list[dict], **kwargs):
+        """
+        Chama chat.completions.create com limites de taxa e novas tentativas.
+        """
+        estimated = sum(estimate_tokens(message["content"]) for message in messages)
+        model = kwargs.get("model", "")
+
+        for attempt in range(self.max_retries + 1):
+            await self._request_bucket.acquire(1)
+            await self._token_bucket.acquire(estimated)
+
+            retry_after = None
+            async with self._semaphore:
+                # A duração medida não inclui a espera pelos limites de taxa nem pelo semáforo
+                start = time.perf_counter()
+                try:
+                    response = await self._client.chat.completions.create(messages=messages, **kwargs)
+                except RateLimitError as e:
+                    _record_call(model, "rate_limited", start, attempt)
+                    retry_after = _retry_after(e)
+                    if attempt == self.max_retries:
+                        raise LLMRateLimitError(retry_after)
+                except APIStatusError as e:
+                    _record_call(model, f"http_{e.status_code}", start, attempt)
+                    if e.status_code < 500 or attempt == self.max_retries:
+                        raise
+                except APIConnectionError:  # Inclui timeouts
+                    _record_call(model, "connection_error", start, attempt)
+                    if attempt == self.max_retries:
+                        raise
+                else:
+                    _record_call(model, "ok", start, attempt, response.usage)
+                    if response.usage is not None:
+                        self._token_bucket.consume(response.usage.total_tokens - estimated)
+                    return response
+
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            log_event("llm_retry", logging.WARNING, model=model, attempt=attempt + 1, delay_seconds=round(delay, 2))
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self._http_client.aclose()
+
+
+_groq_client: GroqClient | None = None
+
+
+_groq_client_options: dict = {}
+
+
+def configure_groq_client(**options):
+    """
+    Altera os limites do cliente compartilhado antes da primeira chamada
+    (ex.: a reanálise em lote usa uma fração da cota, deixando o restante para a API).
+    """
+    if _groq_client is not None:
+        raise RuntimeError("O cliente do Groq já foi criado.")
+    _groq_client_options.update(options)
+
+
+def get_groq_client() -> GroqClient:
+    """
+    Retorna o cliente compartilhado, criando-o na primeira chamada
+    (dentro do event loop que vai utilizá-lo).
+    """
+    global _groq_client
+    if _groq_client is None:
+        _groq_client = GroqClient(api_key=GROQ_API_KEY, base_url=GROQ_API_BASE, **_groq_client_options)
+    return _groq_client
+
+
+async def close_groq_client():
+    global _groq_client
+    if _groq_client is not None:
+        await _groq_client.aclose()
+        _groq_client = None
@@ -0,0 +1,81 @@
+import ast
+import json
+import re
+
+
+CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "„": '"'})
+
+
+def _json_object(text: str) -> dict | None:
+    try:
+        value = json.loads(text)
+    except (json.JSONDecodeError, ValueError):
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def repair_json(raw_text: str) -> dict | None:
+    """
+    Tenta obter o objeto JSON da resposta da IA com correções locais baratas,
+    antes de pedir de novo: texto ao redor, bloco ```json, vírgulas sobrando,
+    aspas tipográficas, aspas simples/None/True (sintaxe Python) e objeto
+    cortado no fim (fecha aspas, listas e chaves abertas).
+    """
+    if not raw_text:
+        return None
+
+    candidates = [raw_text.strip()]
+    fenced = CODE_FENCE.search(raw_text)
+    if fenced:
+        candidates.append(fenced.group(1).strip())
+
+    start = raw_text.find("{")
+    if start != -1:
+        end = raw_text.rfind("}")
+        if end > start:
+            candidates.append(raw_text[start:end + 1])
+        candidates.append(_close_truncated(raw_text[start:]))
+
+    for candidate in candidates:
+        for text in (candidate, TRAILING_COMMA.sub(r"\1", candidate.translate(SMART_QUOTES))):
+            value = _json_object(text)
+            if value is not None:
+                return value
+
+        try:
+            value = ast.literal_eval(candidate)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            continue
+        if isinstance(value, dict):
+            return value
+
+    return None
+
+
+def _close_truncated(text: str) -> str:
+    """
+    Fecha strings, listas e objetos que ficaram abertos (resposta cortada pelo limite de tokens).
+    """
+    stack = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+
+    closed = text + ('"' if in_string else "")
+    closed = TRAILING_COMMA.sub(r"\1", closed.rstrip().rstrip(",") + "".join(reversed(stack)))
+    return closed
@@ -0,0 +1,199 @@
+import hashlib
+import re
+import struct
+import unicodedata
+from sqlalchemy import desc, func, select
+from sqlalchemy.orm import Session
+from app.core.config import NEAR_DUPLICATE_MIN_SIMILARITY, NEAR_DUPLICATE_REUSE_SIMILARITY
+from app.models.contract import Contract
+from app.models.contract_fingerprint import ContractFingerprint, ContractSimilarityBucket
+from app.services.analysis_cache import get_cached_analysis, make_cache_key, text_hash
+from app.services.document_store import load_document
+from app.services.rule_extractor import AMOUNT, CNPJ, CPF, DATE
+
+
+# Assinatura MinHash com uma única função de hash (one permutation hashing): cada
+# trecho de SHINGLE_WORDS palavras cai em um dos SIGNATURE_SIZE compartimentos,
+# que guarda o menor hash recebido. Mudar estes valores exige recalcular as assinaturas.
+SHINGLE_WORDS = 5
+SIGNATURE_SIZE = 128
+
+# LSH: a assinatura é dividida em faixas; contratos com alguma faixa idêntica viram
+# candidatos. Com 16 faixas de 8 valores, um par com 80% de semelhança é encontrado
+# em ~95% das vezes e um par com 50%, em ~6%.
+LSH_BANDS = 16
+LSH_ROWS = SIGNATURE_SIZE // LSH_BANDS
+
+# Candidatos (os que mais compartilham faixas) comparados pela assinatura em cada busca
+MAX_CANDIDATES = 50
+
+WORD = re.compile(r"\w+")
+
+# Dados que, se mudarem, invalidam a análise de um contrato quase idêntico
+KEY_FACTS = re.compile(f"{AMOUNT.pattern}|{CNPJ}|{CPF}|{DATE}", re.IGNORECASE)
+
+SIGNATURE_FORMAT = f">{SIGNATURE_SIZE}Q"
+
+
+def _words(text: str) -> list[str]:
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").casefold()
+    return WORD.findall(folded)
+
+
+def shingles(text: str) -> set[str]:
+    """
+    Sequências de SHINGLE_WORDS palavras (minúsculas e sem acentos) do texto.
+    """
+    words = _words(text)
+    size = min(SHINGLE_WORDS, len(words))
+    return {" ".join(words[index:index + size]) for index in range(len(words) - size + 1)} if size else set()
+
+
+def _hash64(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "big")
+
+
+def minhash_signature(text: str) -> list[int] | None:
+    """
+    Assinatura MinHash do texto, ou None se ele não tiver palavras.
+
+    Compartimentos vazios (textos curtos) recebem o valor do próximo
+    compartimento preenchido, para que todos sejam comparáveis.
+    """
+    minimums: list[int | None] = [None] * SIGNATURE_SIZE
+    for shingle in shingles(text):
+        value = _hash64(shingle.encode("utf-8"))
+        index, value = value % SIGNATURE_SIZE, value // SIGNATURE_SIZE
+        if minimums[index] is None or value < minimums[index]:
+            minimums[index] = value
+
+    filled = [index for index, value in enumerate(minimums) if value is not None]
+    if not filled:
+        return None
+    for index in range(SIGNATURE_SIZE):
+        if minimums[index] is None:
+            source = next((position for position in filled if position > index), filled[0])
+            minimums[index] = minimums[source]
+    return minimums
+
+
+def pack_signature(signature: list[int]) -> bytes:
+    return struct.pack(SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(data: bytes) -> list[int]:
+    return list(struct.unpack(SIGNATURE_FORMAT, data))
+
+
+def lsh_buckets(signature: list[int]) -> list[int]:
+    """
+    Um hash (inteiro de 64 bits com sinal, como no BIGINT do banco) por faixa da assinatura.
+    """
+    buckets = []
+    for band in range(LSH_BANDS):
+        values = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f">B{LSH_ROWS}Q", band, *values), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+
+def estimate_similarity(first: list[int], second: list[int]) -> float:
+    """
+    Semelhança de Jaccard estimada pelas assinaturas: fração dos compartimentos iguais.
+    """
+    return sum(a == b for a, b in zip(first, second)) / SIGNATURE_SIZE
+
+
+def text_similarity(first: str, second: str) -> float:
+    """
+    Semelhança de Jaccard exata entre os trechos dos dois textos.
+    """
+    first_shingles, second_shingles = shingles(first), shingles(second)
+    union = len(first_shingles | second_shingles)
+    return len(first_shingles & second_shingles) / union if union else 1.0
+
+
+def key_facts(text: str) -> set[str]:
+    """
+    Valores, CNPJ/CPF e datas do texto, com espaços e pontuação normalizados.
+    """
+    return {re.sub(r"[\s.\-/]", "", match.group(0)).casefold() for match in KEY_FACTS.finditer(text)}
+
+
+def attach_fingerprint(contract: Contract, signature: list[int] | None):
+    """
+    Associa ao contrato a assinatura do texto e as faixas LSH usadas na busca.
+    """
+    if signature is None:
+        return
+    contract.fingerprint = ContractFingerprint(signature=pack_signature(signature))
+    contract.similarity_buckets = [ContractSimilarityBucket(bucket=bucket) for bucket in lsh_buckets(signature)]
+
+
+def find_similar_contracts(
+    db: Session,
+    signature: list[int],
+    limit: int = 5,
+    min_similarity: float = NEAR_DUPLICATE_MIN_SIMILARITY,
+    exclude_id: int | None = None
+) -> list[dict]:
+    """
+    Contratos com semelhança estimada de pelo menos `min_similarity`, do mais
+    semelhante para o menos. Só os que compartilham alguma faixa LSH são
+    comparados, então a busca não percorre todos os contratos.
+    """
+    shared_bands = func.count(ContractSimilarityBucket.id).label("shared_bands")
+    query = (
+        select(ContractSimilarityBucket.contract_id)
+        .where(ContractSimilarityBucket.bucket.in_(lsh_buckets(signature)))
+        .group_by(ContractSimilarityBucket.contract_id)
+        .order_by(desc(shared_bands))
+        .limit(MAX_CANDIDATES)
+    )
+    if exclude_id is not None:
+        query = query.where(ContractSimilarityBucket.contract_id != exclude_id)
+    candidate_ids = db.scalars(query).all()
+    if not candidate_ids:
+        return []
+
+    rows = db.execute(
+        select(Contract.id, Contract.filename, ContractFingerprint.signature)
+        .join(ContractFingerprint, ContractFingerprint.contract_id == Contract.id)
+        .where(Contract.id.in_(candidate_ids))
+    )
+    similar = []
+    for contract_id, filename, packed in rows:
+        similarity = estimate_similarity(signature, unpack_signature(packed))
+        if similarity >= min_similarity:
+            similar.append({"id": contract_id, "filename": filename, "similarity": round(similarity, 3)})
+    similar.sort(key=lambda item: (-item["similarity"], item["id"]))
+    return similar[:limit]
+
+
+def match_near_duplicate(db: Session, text: str, signature: list[int], reuse: bool) -> tuple[dict | None, dict | None]:
+    """
+    Procura o contrato mais semelhante ao texto. Retorna os dados dele
+    (id, filename, similarity e analysis_reused) e, com `reuse`, a análise
+    dele quando pode ser reaproveitada: texto quase idêntico (semelhança exata
+    de pelo menos NEAR_DUPLICATE_REUSE_SIMILARITY), mesmos valores, CNPJ/CPF e
+    datas, e análise do analisador atual ainda no cache.
+    """
+    similar = find_similar_contracts(db, signature, limit=1)
+    if not similar:
+        return None, None
+
+    match = {**similar[0], "analysis_reused": False}
+    if not reuse or match["similarity"] < NEAR_DUPLICATE_REUSE_SIMILARITY:
+        return match, None
+
+    document = load_document(db, match["id"])
+    if document is None:
+        return match, None
+    match["similarity"] = round(text_similarity(text, document.text), 3)
+    if match["similarity"] < NEAR_DUPLICATE_REUSE_SIMILARITY or key_facts(text) != key_facts(document.text):
+        return match, None
+
+    analysis = get_cached_analysis(db, make_cache_key(text_hash(document.text)))
+    match["analysis_reused"] = analysis is not None
+    return match, analysis
+
@@ -0,0 +1,132 @@
+import re
+from app.schemas.analysis import ContractAnalysis
+from app.services.chunking import split_sections
+
+
+# Versão das regras. Altere sempre que as regras mudarem, para não reaproveitar análises antigas do cache.
+RULES_VERSION = "1"
+
+CNPJ = r"\d{2}\.?\d{3}\.?\d{3}\s*/\s*\d{4}\s*-?\s*\d{2}"
+CPF = r"\d{3}\.?\d{3}\.?\d{3}\s*-?\s*\d{2}"
+
+# "... inscrita no CNPJ sob o nº 12.345.678/0001-90" / "portador do CPF 123.456.789-00"
+PARTY_DOCUMENT = re.compile(
+    rf"\b(?:CNPJ|CPF|C\.N\.P\.J\.|C\.P\.F\.)(?:/MF)?[^\d\n]{{0,25}}({CNPJ}|{CPF})",
+    re.IGNORECASE,
+)
+# Início do trecho que apresenta uma parte (quebra de linha, ponto, ponto e vírgula, "e,"/"de outro lado")
+PARTY_BOUNDARY = re.compile(r"[\n;.:]|\be,\s|\bde (?:um|outro) lado,?\s", re.IGNORECASE)
+# Papéis e expressões que antecedem o nome da parte
+PARTY_PREFIX = re.compile(
+    r"^(?:(?:o|a|os|as)\s+)?(?:contratante|contratada|contratado|locador[a]?|locat[áa]ri[oa]|"
+    r"comprador[a]?|vendedor[a]?|cedente|cession[áa]ri[oa]|outorgante|outorgad[oa]|partes?)\b[\s:,-]*",
+    re.IGNORECASE,
+)
+PARTY_NAME = re.compile(r"[A-ZÀ-Ý][\wÀ-ÿ&'´`.\- ]{2,119}")
+
+AMOUNT = re.compile(r"R\$\s?\d{1,3}(?:\.\d{3})*(?:,\d{2})?(?!\d)|R\$\s?\d+(?:,\d{2})?(?!\d)")
+
+DATE = r"\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}\s+de\s+[a-zç]+\s+de\s+\d{4}"
+VALIDITY = re.compile(
+    rf"[^.\n]*\b(?:vig[êe]ncia|vigorar[áa]?|prazo de dura[çc][ãa]o)\b[^.\n]*"
+    rf"(?:{DATE}|\d+\s*\(?[\w\s]*\)?\s*(?:dias|meses|anos))[^.\n]*",
+    re.IGNORECASE,
+)
+OBJECT_HEADING = re.compile(r"\bdo objeto\b|\bobjeto do contrato\b", re.IGNORECASE)
+OBJECT_SENTENCE = re.compile(r"[^.\n]*\bobjeto\b[^.\n]*(?:\.|$)", re.IGNORECASE)
+RESCISSION_HEADING = re.compile(r"rescis[ãa]o|resili[çc][ãa]o|extin[çc][ãa]o", re.IGNORECASE)
+OBLIGATIONS_HEADING = re.compile(r"obriga[çc][õo]es|responsabilidades", re.IGNORECASE)
+LIST_ITEM = re.compile(r"^\s*(?:[a-z]\)|\d+(?:\.\d+)+\.?|[-•–])\s*(.+)$", re.MULTILINE)
+
+MAX_OBLIGATIONS = 10
+
+
+def _section_heading(section: str) -> str:
+    return section.split("\n", 1)[0][:200]
+
+
+def _unique(values: list[str]) -> list[str]:
+    seen = set()
+    unique_values = []
+    for value in values:
+        key = " ".join(value.casefold().split())
+        if key not in seen:
+            seen.add(key)
+            unique_values.append(value)
+    return unique_values
+
+
+def find_parties(text: str) -> list[str]:
+    """
+    Nomes das partes identificadas por CNPJ/CPF: o nome é o início do trecho
+    que antecede o documento, até a primeira vírgula
+    ("EMPRESA X LTDA, pessoa jurídica ..., inscrita no CNPJ sob o nº ...").
+    """
+    parties = []
+    for match in PARTY_DOCUMENT.finditer(text):
+        window = text[max(0, match.start() - 300):match.start()]
+        boundaries = list(PARTY_BOUNDARY.finditer(window))
+        if boundaries:
+            window = window[boundaries[-1].end():]
+
+        candidate = PARTY_PREFIX.sub("", window.strip()).split(",")[0].strip(" -:")
+        name = PARTY_NAME.match(candidate)
+        if name and not re.search(r"\b(?:CNPJ|CPF)\b", name.group(0), re.IGNORECASE):
+            parties.append(" ".join(name.group(0).split()))
+    return _unique(parties)
+
+
+def find_amounts(text: str) -> list[str]:
+    return _unique([" ".join(match.group(0).split()) for match in AMOUNT.finditer(text)])
+
+
+def find_sections(text: str, heading: re.Pattern) -> list[str]:
+    return [section for section in split_sections(text) if heading.search(_section_heading(section))]
+
+
+def find_obligations(sections: list[str]) -> list[str]:
+    """
+    Itens (a), 1.1, -) das cláusulas de obrigações; sem itens, a cláusula inteira.
+    """
+    obligations = []
+    for section in sections:
+        items = [item.strip(" ;") for item in LIST_ITEM.findall(section) if item.strip(" ;")]
+        obligations.extend(items or [" ".join(section.split("\n", 1)[-1].split())])
+    return _unique(obligations)[:MAX_OBLIGATIONS]
+
+
+def find_additional_data(text: str) -> str:
+    """
+    Objeto do contrato e vigência (prazo ou datas).
+    """
+    details = []
+
+    object_sections = find_sections(text, OBJECT_HEADING)
+    if object_sections:
+        body = object_sections[0].split("\n", 1)[-1]
+        details.append("Objeto: " + " ".join(body.split())[:500])
+    else:
+        sentence = OBJECT_SENTENCE.search(text)
+        if sentence:
+            details.append("Objeto: " + " ".join(sentence.group(0).split())[:500])
+
+    validity = VALIDITY.search(text)
+    if validity:
+        details.append("Vigência: " + " ".join(validity.group(0).split()))
+
+    return "\n".join(details)
+
+
+def extract_contract_info_rules(contract_text: str) -> dict:
+    """
+    Extrai as informações do contrato com regras locais (expressões regulares),
+    sem IA: funciona offline e responde em milissegundos. Campos não encontrados ficam vazios.
+    """
+    rescission = find_sections(contract_text, RESCISSION_HEADING)
+    return ContractAnalysis(
+        nomes_partes=find_parties(contract_text),
+        valores_monetarios=find_amounts(contract_text),
+        obrigacoes_principais=find_obligations(find_sections(contract_text, OBLIGATIONS_HEADING)),
+        dados_adicionais=find_additional_data(contract_text),
+        clausulas_rescisao="\n".join(" ".join(section.split()) for section in rescission),
+    ).model_dump()
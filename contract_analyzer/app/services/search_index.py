@@ -0,0 +1,121 @@
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.models.contract import Contract
+
+
+# Colunas indexadas na tabela virtual FTS5 (rowid = id do contrato).
+# "texto" guarda o texto extraído do arquivo, que não fica na tabela contracts.
+# A tabela é criada pela migração v002_busca_textual.
+FTS_COLUMNS = [
+    "filename", "nomes_partes", "valores_monetarios", "obrigacoes_principais",
+    "dados_adicionais", "clausulas_rescisao", "texto"
+]
+
+# Pesos do ranking BM25, na ordem de FTS_COLUMNS (nome do arquivo e partes valem mais)
+BM25_WEIGHTS = "10.0, 5.0, 3.0, 2.0, 2.0, 2.0, 1.0"
+
+SEARCH_TERM = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def search_enabled(bind) -> bool:
+    """
+    A busca textual usa FTS5 e só está disponível no SQLite.
+    """
+    return bind.dialect.name == "sqlite"
+
+
+def index_contract(db: Session, contract: Contract, extracted_text: str | None = None):
+    """
+    Insere ou atualiza o contrato no índice de busca, na mesma transação da sessão.
+    Sem `extracted_text`, mantém o texto do arquivo já indexado.
+    """
+    if not search_enabled(db.get_bind()):
+        return
+
+    if extracted_text is None:
+        extracted_text = db.execute(
+            text("SELECT texto FROM contracts_fts WHERE rowid = :id"), {"id": contract.id}
+        ).scalar() or ""
+
+    values = {column: getattr(contract, column) or "" for column in FTS_COLUMNS if column != "texto"}
+    values["texto"] = extracted_text
+
+    db.execute(text("DELETE FROM contracts_fts WHERE rowid = :id"), {"id": contract.id})
+    db.execute(
+        text(f"""
+            INSERT INTO contracts_fts (rowid, {", ".join(FTS_COLUMNS)})
+            VALUES (:id, {", ".join(":" + column for column in FTS_COLUMNS)})
+        """),
+        {"id": contract.id, **values}
+    )
+
+
+def update_indexed_fields(db: Session, contract_id: int, values: dict):
+    """
+    Atualiza no índice de busca só as colunas alteradas do contrato (o texto do arquivo é mantido).
+    """
+    columns = [column for column in FTS_COLUMNS if column in values and column != "texto"]
+    if not columns or not search_enabled(db.get_bind()):
+        return
+    db.execute(
+        text(f"UPDATE contracts_fts SET {', '.join(f'{column} = :{column}' for column in columns)} WHERE rowid = :id"),
+        {"id": contract_id, **{column: values[column] or "" for column in columns}}
+    )
+
+
+def remove_contract(db: Session, contract_id: int):
+    if not search_enabled(db.get_bind()):
+        return
+    db.execute(text("DELETE FROM contracts_fts WHERE rowid = :id"), {"id": contract_id})
+
+
+def build_match_query(query: str) -> str:
+    """
+    Converte a busca do usuário em uma expressão FTS5 segura: cada palavra
+    (ou "frase entre aspas") vira um termo entre aspas e todos precisam
+    aparecer. Palavras terminadas em * buscam por prefixo (ex.: rescis*).
+    """
+    terms = []
+    for phrase, word in SEARCH_TERM.findall(query):
+        term = phrase or word
+        prefix = not phrase and term.endswith("*")
+        term = term.rstrip("*").replace('"', '""').strip()
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search_contracts(db: Session, query: str, limit: int, offset: int) -> tuple[list[dict], int]:
+    """
+    Busca os contratos pelo índice FTS5, ordenados por relevância (BM25).
+    Retorna a página de resultados com trechos destacados e o total encontrado.
+    """
+    match = build_match_query(query)
+    if not match:
+        return [], 0
+
+    total = db.execute(
+        text("SELECT count(*) FROM contracts_fts WHERE contracts_fts MATCH :match"), {"match": match}
+    ).scalar()
+
+    rows = db.execute(
+        text(f"""
+            SELECT rowid AS id,
+                   bm25(contracts_fts, {BM25_WEIGHTS}) AS score,
+                   highlight(contracts_fts, 0, '<mark>', '</mark>') AS filename,
+                   snippet(contracts_fts, -1, '<mark>', '</mark>', '…', 24) AS snippet
+            FROM contracts_fts
+            WHERE contracts_fts MATCH :match
+            ORDER BY score
+            LIMIT :limit OFFSET :offset
+        """),
+        {"match": match, "limit": limit, "offset": offset}
+    ).mappings().all()
+
+    # No BM25 do SQLite, quanto menor o valor, mais relevante
+    results = [
+        {"id": row["id"], "score": -row["score"], "filename": row["filename"], "snippet": row["snippet"]}
+        for row in rows
+    ]
+    return results, total
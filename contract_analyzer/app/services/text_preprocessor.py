@@ -0,0 +1,197 @@
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable
+from app.services.chunking import SECTION_HEADING, split_sections
+from app.services.file_parser import PAGE_BREAK
+from app.services.llm_client import estimate_tokens
+
+
+# Espaços (inclusive o não separável) e quebras de linha repetidas
+INLINE_SPACES = re.compile(r"[ \t\u00a0\u200b]+")
+BLANK_LINES = re.compile(r"\n{3,}")
+
+# Palavra quebrada com hífen no fim da linha ("contra-\ntante"): só quando a linha seguinte continua em minúscula
+HYPHENATION = re.compile(r"([A-Za-zÀ-ÿ])-\n([a-zà-ÿ])")
+
+# "3", "- 3 -", "Página 3", "Pág. 3 de 10", "3/10"
+PAGE_NUMBER = re.compile(r"^[-–—\s]*(?:p[áa]g(?:ina)?\.?\s*)?\d{1,4}(?:\s*(?:de|/)\s*\d{1,4})?[-–—\s]*$", re.IGNORECASE)
+
+# Número da página dentro de um cabeçalho/rodapé: "pág. 2", "página 2 de 9", "fl. 2", "fls. 2/9"
+PAGE_REFERENCE = re.compile(r"\b(?:p[áa]g(?:ina)?|fls?)\.?\s*\d+(?:\s*(?:de|/)\s*\d+)?", re.IGNORECASE)
+
+# Linhas de assinatura: campos sublinhados ("Nome: ________") e rótulos do bloco de assinaturas
+SIGNATURE_FILL = re.compile(r"[_.\-=]{5,}")
+SIGNATURE_LABEL = re.compile(r"^(?:testemunhas?|assinaturas?|local e data|rubricas?)\s*:?\s*$", re.IGNORECASE)
+
+# Cabeçalhos/rodapés: linhas curtas entre as EDGE_LINES primeiras ou últimas de cada página
+BOILERPLATE_MAX_CHARS = 100
+EDGE_LINES = 3
+
+# Palavras (sem acentos, minúsculas) do título que indicam o valor da seção para a análise
+HIGH_VALUE_HEADINGS = (
+    "objeto", "valor", "preco", "pagamento", "remunerac", "reajuste", "vigencia", "prazo",
+    "rescis", "obrigac", "responsabilidade", "multa", "penalidade", "partes",
+)
+LOW_VALUE_HEADINGS = (
+    "foro", "disposicoes gerais", "disposicoes finais", "confidencialidade", "sigilo", "notificac",
+    "comunicac", "protecao de dados", "lgpd", "casos omissos", "anexo", "tolerancia", "novacao",
+    "cessao", "anticorrupcao", "caso fortuito", "forca maior",
+)
+SECTION_TITLE_CHARS = 80
+HIGH_VALUE_CONTENT = re.compile(r"R\$|\bCNPJ\b|\bCPF\b", re.IGNORECASE)
+
+
+@dataclass
+class PreparedText:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    removed_lines: dict[str, int] = field(default_factory=dict)  # Linhas removidas por motivo
+    dropped_sections: list[str] = field(default_factory=list)  # Títulos das seções cortadas pelo orçamento de tokens
+
+
+def _fold(value: str) -> str:
+    without_accents = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    return without_accents.casefold()
+
+
+def _boilerplate_key(line: str) -> str:
+    # A referência à página varia ("Contrato 12/2024 - fl. 2"), então não distingue a linha
+    return PAGE_REFERENCE.sub("#", _fold(line))
+
+
+def _is_signature_line(line: str) -> bool:
+    if SIGNATURE_LABEL.match(line):
+        return True
+    filled = sum(len(match) for match in SIGNATURE_FILL.findall(line))
+    return filled >= len(line) / 2
+
+
+def _edge_lines(lines: list[str]) -> list[int]:
+    # Índices das primeiras e últimas linhas não vazias da página, onde ficam cabeçalhos e rodapés
+    filled = [index for index, line in enumerate(lines) if line]
+    return filled[:EDGE_LINES] + filled[-EDGE_LINES:]
+
+
+def clean_contract_pages(pages: Iterable[str], min_repeats: int) -> tuple[str, dict[str, int]]:
+    """
+    Remove o que não ajuda na análise: cabeçalhos e rodapés repetidos nas
+    páginas, números de página, linhas de assinatura, hifenização no fim da
+    linha e espaços repetidos. Retorna o texto e as linhas removidas por motivo.
+
+    As páginas são consumidas à medida que chegam (ex.: de iter_pdf_pages):
+    a normalização das linhas e a contagem das bordas de cada página são
+    feitas enquanto as seguintes ainda estão sendo extraídas. Cabeçalhos e
+    rodapés são as linhas das bordas da página que se repetem em pelo menos
+    `min_repeats` páginas.
+    """
+    page_lines = []
+    repeated = Counter()
+    for page in pages:
+        lines = [INLINE_SPACES.sub(" ", line).strip() for line in page.split("\n")]
+        edges = _edge_lines(lines)
+        page_lines.append((lines, set(edges)))
+        repeated.update({
+            _boilerplate_key(lines[index]) for index in edges
+            if len(lines[index]) <= BOILERPLATE_MAX_CHARS and not SECTION_HEADING.match(lines[index])
+        })
+
+    boilerplate = set()
+    if len(page_lines) > 1:
+        boilerplate = {key for key, count in repeated.items() if count >= min(min_repeats, len(page_lines))}
+
+    removed = Counter()
+    kept = []
+    for number, (lines, edges) in enumerate(page_lines):
+        if number:
+            kept.append("")  # A quebra de página separa parágrafos, como a linha em branco em volta do PAGE_BREAK
+        for index, line in enumerate(lines):
+            if not line:
+                kept.append(line)
+            elif index in edges and PAGE_NUMBER.match(line):
+                # Só nas bordas da página: no corpo, "2024" ou "12/2024" é conteúdo do contrato
+                removed["numero_pagina"] += 1
+            elif index in edges and _boilerplate_key(line) in boilerplate:
+                removed["cabecalho_rodape"] += 1
+            elif _is_signature_line(line):
+                removed["assinatura"] += 1
+            else:
+                kept.append(line)
+
+    # Junta as palavras hifenizadas só depois de remover os rodapés/cabeçalhos entre as páginas
+    text = HYPHENATION.sub(r"\1\2", "\n".join(kept))
+    text = BLANK_LINES.sub("\n\n", text).strip()
+    return text, dict(removed)
+
+
+def clean_contract_text(text: str, min_repeats: int) -> tuple[str, dict[str, int]]:
+    """
+    Como clean_contract_pages, para o texto já extraído: cabeçalhos e rodapés
+    só são procurados quando ele tem as quebras de página (PAGE_BREAK, usado
+    na extração de PDFs).
+    """
+    return clean_contract_pages(text.split(PAGE_BREAK), min_repeats)
+
+
+def _section_title(section: str) -> str:
+    # Início da seção, onde fica o título (às vezes quebrado em mais de uma linha: "CLÁUSULA 1ª\nDO OBJETO")
+    return " ".join(section[:SECTION_TITLE_CHARS].split())
+
+
+def _section_priority(index: int, section: str) -> int:
+    """
+    0 = manter sempre (preâmbulo com as partes, seções com valores, partes ou
+    títulos importantes), 1 = neutra, 2 = pouco relevante (cortada primeiro).
+    """
+    heading = _fold(_section_title(section))
+    if index == 0 or HIGH_VALUE_CONTENT.search(section) or any(word in heading for word in HIGH_VALUE_HEADINGS):
+        return 0
+    if any(word in heading for word in LOW_VALUE_HEADINGS):
+        return 2
+    return 1
+
+
+def fit_token_budget(text: str, token_budget: int) -> tuple[str, list[str]]:
+    """
+    Corta seções até o texto caber em `token_budget` tokens (estimados): primeiro
+    as pouco relevantes (foro, confidencialidade...), depois as neutras, sempre
+    do fim para o começo. Seções importantes nunca são cortadas; se ainda assim
+    o texto passar do orçamento, ele é dividido em trechos na análise.
+    """
+    tokens = estimate_tokens(text)
+    if token_budget <= 0 or tokens <= token_budget:
+        return text, []
+
+    sections = split_sections(text)
+    priorities = [_section_priority(index, section) for index, section in enumerate(sections)]
+    dropped = set()
+    for priority in (2, 1):
+        for index in reversed(range(len(sections))):
+            if tokens <= token_budget:
+                break
+            if priorities[index] == priority:
+                dropped.add(index)
+                tokens -= estimate_tokens(sections[index])
+
+    kept = [section for index, section in enumerate(sections) if index not in dropped]
+    titles = [_section_title(sections[index]) for index in sorted(dropped)]
+    return "\n\n".join(kept), titles
+
+
+def preprocess_contract_text(text: str, token_budget: int = 0, min_repeats: int = 3) -> PreparedText:
+    """
+    Prepara o texto extraído do arquivo para o prompt da IA: limpa o texto e
+    aplica o orçamento de tokens (0 = sem limite).
+    """
+    tokens_before = estimate_tokens(text)
+    cleaned, removed_lines = clean_contract_text(text, min_repeats)
+    fitted, dropped_sections = fit_token_budget(cleaned, token_budget)
+    return PreparedText(
+        text=fitted,
+        tokens_before=tokens_before,
+        tokens_after=estimate_tokens(fitted),
+        removed_lines=removed_lines,
+        dropped_sections=dropped_sections,
+    )
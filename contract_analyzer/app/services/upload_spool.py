@@ -0,0 +1,75 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from fastapi import UploadFile
+from app.core.config import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_SIZE, UPLOAD_SPOOL_DIR
+
+
+class UploadTooLargeError(Exception):
+    """
+    O arquivo enviado ultrapassa o tamanho máximo permitido.
+    """
+    def __init__(self, max_bytes: int):
+        super().__init__(f"O arquivo excede o tamanho máximo de {max_bytes // (1024 * 1024)} MB.")
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class SpooledUpload:
+    path: str  # Arquivo temporário com o conteúdo enviado
+    size: int
+    sha256: str
+
+    def cleanup(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> SpooledUpload:
+    """
+    Copia o arquivo recebido para um arquivo temporário próprio em blocos,
+    calculando o SHA-256 durante a cópia (em uma thread, sem bloquear o event loop).
+
+    O corpo da requisição já foi lido pelo Starlette quando a rota executa; o
+    tamanho dela é limitado antes disso pelo RequestBodyLimitMiddleware
+    (app/core/body_limit.py). Aqui o limite vale para cada arquivo do lote.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLargeError(max_bytes)
+
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    await file.seek(0)
+    return await asyncio.to_thread(spool_fileobj, file.file, suffix, max_bytes, chunk_size)
+
+
+def spool_fileobj(source, suffix: str, max_bytes: int = MAX_UPLOAD_BYTES, chunk_size: int = UPLOAD_CHUNK_SIZE) -> SpooledUpload:
+    """
+    Grava um arquivo já aberto (ex.: upload recebido ou item de um ZIP) em um
+    arquivo temporário, em blocos. Interrompe a cópia assim que o tamanho
+    máximo é ultrapassado.
+    """
+    fd, path = tempfile.mkstemp(prefix="contrato_", suffix=suffix, dir=UPLOAD_SPOOL_DIR)
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                spool.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return SpooledUpload(path=path, size=size, sha256=digest.hexdigest())
@@ -0,0 +1,156 @@
+"""
+Benchmarks reproduzíveis da API: extração de texto, upload de ponta a ponta
+(com a IA simulada) e listagem/busca com muitas linhas no banco.
+
+Uso (na pasta contract_analyzer):
+    python -m benchmarks                                   # todos, com os tamanhos padrão
+    python -m benchmarks --suites parse --sizes 1,10,100
+    python -m benchmarks --suites crud --rows 10000,100000,1000000
+    python -m benchmarks --output atual.json --baseline anterior.json --threshold 0.2
+
+Cada execução usa um banco SQLite novo em um diretório temporário (a menos
+que --database-url seja informado) e grava os resultados em JSON. Com
+--baseline, compara as medianas com uma execução anterior e termina com
+código 1 se alguma ficar mais lenta que o limite.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from benchmarks.common import environment_info, fake_llm_server, free_port
+
+
+SUITES = ["parse", "upload", "crud"]
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _format_list(value: str) -> list[str]:
+    formats = ["." + item.strip().lstrip(".").lower() for item in value.split(",") if item.strip()]
+    for extension in formats:
+        if extension not in (".pdf", ".docx"):
+            raise argparse.ArgumentTypeError(f"Formato não suportado: {extension}")
+    return formats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks da API de análise de contratos.")
+    parser.add_argument("--suites", default=",".join(SUITES), help="Benchmarks executados: parse, upload e/ou crud")
+    parser.add_argument("--formats", type=_format_list, default=[".pdf", ".docx"], help="Formatos dos contratos gerados")
+    parser.add_argument("--sizes", type=_int_list, default=[1, 10, 50], help="Tamanhos dos contratos, em páginas")
+    parser.add_argument("--repeat", type=int, default=20, help="Medições por caso (parse e crud)")
+    parser.add_argument("--uploads", type=int, default=10, help="Contratos enviados por caso no benchmark de upload")
+    parser.add_argument("--concurrency", type=int, default=1, help="Uploads enviados ao mesmo tempo")
+    parser.add_argument("--llm-delay", type=float, default=0.5, help="Atraso de cada resposta do servidor falso da IA, em segundos")
+    parser.add_argument("--rows", type=_int_list, default=[10000, 100000], help="Quantidades de contratos no banco (crud)")
+    parser.add_argument("--database-url", help="Banco usado (padrão: SQLite novo em um diretório temporário)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Arquivo JSON com os resultados")
+    parser.add_argument("--baseline", help="Resultados anteriores para comparação")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Aumento máximo aceito da mediana (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    args.suites = [suite.strip() for suite in args.suites.split(",") if suite.strip()]
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"Benchmarks desconhecidos: {', '.join(sorted(unknown))}")
+    return args
+
+
+def configure_environment(args, llm_base_url: str | None, workdir: str):
+    """
+    Define a configuração da aplicação antes de importá-la (ela é lida na importação).
+    """
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'benchmark.sqlite3')}"
+    os.environ["UPLOAD_SPOOL_DIR"] = workdir
+    if llm_base_url:
+        os.environ["GROQ_API_KEY"] = "benchmark"
+        os.environ["GROQ_API_BASE"] = f"{llm_base_url}/v1"
+        os.environ["ANALYSIS_MODE"] = "llm"
+        # Sem limites de taxa no cliente: a latência medida é a do servidor falso
+        os.environ["GROQ_REQUESTS_PER_MINUTE"] = "0"
+        os.environ["GROQ_TOKENS_PER_MINUTE"] = "0"
+
+
+def flatten(results: dict) -> dict[str, float]:
+    """
+    Medianas (p50, em ms) de cada caso, com chaves estáveis entre execuções.
+    """
+    medians = {}
+    suites = results.get("suites", {})
+    for case in suites.get("parse", {}).get("cases", []):
+        medians[f"parse.{case['format']}.{case['pages']}p"] = case["latency"]["p50_ms"]
+    for case in suites.get("upload", {}).get("cases", []):
+        if case["end_to_end_latency"]["n"]:
+            medians[f"upload.{case['format']}.{case['pages']}p"] = case["end_to_end_latency"]["p50_ms"]
+    for scale in suites.get("crud", {}).get("scales", []):
+        for name, stats in scale["queries"].items():
+            medians[f"crud.{scale['rows']}.{name}"] = stats["p50_ms"]
+    return medians
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """
+    Casos presentes nas duas execuções cuja mediana aumentou mais que `threshold`.
+    """
+    previous = flatten(baseline)
+    regressions = []
+    for key, value in flatten(current).items():
+        before = previous.get(key)
+        if before and value > before * (1 + threshold):
+            regressions.append({"case": key, "baseline_p50_ms": before, "p50_ms": value, "change": round(value / before - 1, 3)})
+    return regressions
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="benchmark-") as workdir:
+        results = {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "environment": environment_info(),
+            "arguments": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+            "suites": {},
+        }
+
+        with ExitStack() as stack:
+            # O servidor falso da IA só é necessário no benchmark de upload
+            base_url = None
+            if "upload" in args.suites:
+                base_url = stack.enter_context(fake_llm_server(free_port(), args.llm_delay))
+            configure_environment(args, base_url, workdir)
+
+            # Importados só agora, depois de configurar o ambiente
+            if "parse" in args.suites:
+                from benchmarks import parse_bench
+                results["suites"]["parse"] = parse_bench.run(args.formats, args.sizes, args.repeat)
+            if "upload" in args.suites:
+                from benchmarks import upload_bench
+                results["suites"]["upload"] = upload_bench.run(
+                    args.formats, args.sizes, args.uploads, args.concurrency, args.llm_delay
+                )
+            if "crud" in args.suites:
+                from benchmarks import crud_bench
+                results["suites"]["crud"] = crud_bench.run(args.rows, args.repeat)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        results["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSÃO {regression['case']}: {regression['baseline_p50_ms']} ms -> {regression['p50_ms']} ms")
+        exit_code = 1 if regressions else 0
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em {args.output}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+def percentile(sorted_samples: list[float], fraction: float) -> float:
+    # Percentil pelo posto mais próximo (nearest rank), estável com poucas amostras
+    index = max(0, min(len(sorted_samples) - 1, round(fraction * len(sorted_samples) + 0.5) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples: list[float]) -> dict:
+    """
+    Estatísticas de uma lista de durações em segundos, em milissegundos.
+    """
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def measure(function, repeat: int, warmup: int = 1) -> list[float]:
+    """
+    Executa `function` `warmup` vezes sem medir e depois `repeat` vezes, retornando as durações.
+    """
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def environment_info() -> dict:
+    """
+    Dados da máquina e do código, gravados junto com os resultados para comparar execuções.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def fake_llm_server(port: int, delay_seconds: float):
+    """
+    Sobe o servidor falso da API da IA (tests/fake_openai_server.py) em outro
+    processo, com o atraso de resposta informado, e o encerra ao final.
+    """
+    env = {**os.environ, "FAKE_LLM_DELAY_SECONDS": str(delay_seconds)}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "tests.fake_openai_server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_DIR,
+        env=env,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/stats", timeout=1)
+                break
+            except httpx.TransportError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("O servidor falso da IA não iniciou.")
+                time.sleep(0.1)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def login(client, username: str = "benchmark") -> tuple[int, dict]:
+    """
+    Cadastra (se necessário) e autentica o usuário do benchmark.
+    Retorna o ID do usuário e os cabeçalhos com o token.
+    """
+    # Importado aqui: a aplicação lê a configuração ao ser importada, depois que
+    # o benchmark define as variáveis de ambiente (ver benchmarks/__main__.py)
+    from app.database import SessionLocal
+    from app.models.user import User
+
+    email = f"{username}@example.com"
+    client.post("/users/register", json={
+        "username": username, "full_name": "Benchmark", "email": email, "password": "benchmark"
+    })
+    response = client.post("/login", json={"email": email, "password": "benchmark"})
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    with SessionLocal() as db:
+        user_id = db.query(User.id).filter(User.email == email).scalar()
+    return user_id, headers
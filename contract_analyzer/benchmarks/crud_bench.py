@@ -0,0 +1,126 @@
+"""
+Latência da listagem, consulta, busca e filtros de contratos com muitas linhas no banco.
+"""
+import random
+import time
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select, text
+from app.database import engine
+from app.main import app
+from app.models.contract import Contract, ContractParty, ContractAmount
+from app.services.contract_entities import normalize_party_name
+from app.services.search_index import FTS_COLUMNS, search_enabled
+from benchmarks.common import login, measure, summarize
+
+
+# Linhas inseridas por transação ao popular o banco
+SEED_BATCH_SIZE = 10000
+
+COMPANY_NAMES = ["Alfa", "Horizonte", "Atlântico", "Cerrado", "Pioneira", "Aurora", "Vale", "Serra", "Litoral", "Central"]
+COMPANY_SECTORS = ["Comércio", "Serviços", "Engenharia", "Logística", "Tecnologia", "Consultoria"]
+COMPANY_SUFFIXES = ["Ltda.", "S.A.", "ME", "EIRELI"]
+
+
+def _brl(cents: int) -> str:
+    return "R$ " + f"{cents // 100:,}".replace(",", ".") + f",{cents % 100:02d}"
+
+
+def _seed_rows(rng: random.Random, first_id: int, count: int, user_id: int):
+    contracts, parties, amounts = [], [], []
+    for contract_id in range(first_id, first_id + count):
+        names = [
+            f"{rng.choice(COMPANY_NAMES)} {rng.choice(COMPANY_SECTORS)} {contract_id % 1000:03d} {rng.choice(COMPANY_SUFFIXES)}"
+            for _ in range(2)
+        ]
+        values = [rng.randrange(10000, 100000000) for _ in range(rng.randint(1, 3))]
+        contracts.append({
+            "id": contract_id,
+            "filename": f"seed-{contract_id:07d}.pdf",
+            "uploaded_by": user_id,
+            "nomes_partes": "; ".join(names),
+            "valores_monetarios": "; ".join(_brl(value) for value in values),
+            "obrigacoes_principais": "Prestar os serviços no prazo acordado.\nEfetuar o pagamento na data de vencimento.",
+            "dados_adicionais": f"Objeto: prestação de serviços de {rng.choice(COMPANY_SECTORS).lower()}. Vigência: 12 meses.",
+            "clausulas_rescisao": "Rescisão por qualquer das partes mediante aviso prévio de 30 dias.",
+        })
+        parties.extend({"contract_id": contract_id, "name": name, "name_normalized": normalize_party_name(name)} for name in names)
+        amounts.extend({"contract_id": contract_id, "raw": _brl(value), "cents": value} for value in values)
+    return contracts, parties, amounts
+
+
+def seed_contracts(target_rows: int, user_id: int) -> float:
+    """
+    Insere contratos sintéticos (com partes, valores e índice de busca) até o
+    banco ter `target_rows` contratos. Retorna o tempo gasto.
+    """
+    start = time.perf_counter()
+    rng = random.Random(target_rows)
+    with engine.connect() as conn:
+        existing = conn.execute(select(func.count(Contract.id))).scalar()
+        next_id = (conn.execute(select(func.max(Contract.id))).scalar() or 0) + 1
+
+    while existing < target_rows:
+        count = min(SEED_BATCH_SIZE, target_rows - existing)
+        contracts, parties, amounts = _seed_rows(rng, next_id, count, user_id)
+        with engine.begin() as conn:
+            conn.execute(insert(Contract), contracts)
+            conn.execute(insert(ContractParty), parties)
+            conn.execute(insert(ContractAmount), amounts)
+            if search_enabled(conn):
+                conn.execute(text(f"""
+                    INSERT INTO contracts_fts (rowid, {", ".join(FTS_COLUMNS)})
+                    SELECT id, filename, nomes_partes, valores_monetarios, obrigacoes_principais,
+                           dados_adicionais, clausulas_rescisao, ''
+                    FROM contracts WHERE id >= :first_id
+                """), {"first_id": next_id})
+        existing += count
+        next_id += count
+
+    return time.perf_counter() - start
+
+
+def _queries(max_id: int, rng: random.Random, with_search: bool) -> dict:
+    """
+    Consultas medidas; as que recebem um ID sorteiam um contrato a cada chamada.
+    """
+    queries = {
+        "list_first_page": lambda: "/contracts?limit=50",
+        "list_last_page": lambda: f"/contracts?limit=50&cursor={max(0, max_id - 50)}",
+        "list_ids_500": lambda: "/contracts?limit=500&fields=id,filename",
+        "get_by_id": lambda: f"/contracts/{rng.randint(1, max_id)}",
+        "filter_parte": lambda: "/contracts/filter?parte=alfa%20comercio&limit=50",
+        "filter_valor": lambda: "/contracts/filter?valor_min=1000&valor_max=1500&limit=50",
+    }
+    if with_search:
+        queries["search_common"] = lambda: "/contracts/search?q=rescis%C3%A3o"
+        queries["search_rare"] = lambda: f"/contracts/search?q=seed-{rng.randint(1, max_id):07d}"
+    return queries
+
+
+def run(row_counts: list[int], repeat: int) -> dict:
+    """
+    Para cada quantidade de linhas (em ordem crescente, reaproveitando as já
+    inseridas), popula o banco e mede cada consulta pela API.
+    """
+    rng = random.Random(0)
+    scales = []
+    with TestClient(app) as client:
+        user_id, headers = login(client)
+        for rows in sorted(row_counts):
+            seed_seconds = seed_contracts(rows, user_id)
+            with engine.connect() as conn:
+                max_id = conn.execute(select(func.max(Contract.id))).scalar()
+                with_search = search_enabled(conn)
+            print(f"crud: {rows} contratos inseridos em {seed_seconds:.1f}s")
+
+            results = {}
+            for name, build_url in _queries(max_id, rng, with_search).items():
+                def call():
+                    response = client.get(build_url(), headers=headers)
+                    response.raise_for_status()
+                results[name] = summarize(measure(call, repeat))
+                print(f"crud {rows} linhas, {name}: p50 {results[name]['p50_ms']} ms")
+
+            scales.append({"rows": rows, "seed_seconds": round(seed_seconds, 3), "queries": results})
+
+    return {"config": {"database": engine.dialect.name}, "scales": scales}
@@ -0,0 +1,62 @@
+"""
+Vazão da extração de texto (app.services.file_parser.extract_document) por formato e tamanho.
+"""
+import os
+import tempfile
+import time
+from app.core.config import PDF_PARSE_WORKERS, PDF_PARALLEL_MIN_PAGES
+from app.services.file_parser import extract_document, iter_pdf_pages, shutdown_pdf_executor
+from benchmarks.common import measure, summarize
+from benchmarks.synthetic import make_contract_file
+
+
+def _first_page_seconds(path: str) -> float:
+    # Tempo até a primeira página chegar a quem consome iter_pdf_pages
+    start = time.perf_counter()
+    pages = iter_pdf_pages(path)
+    next(pages)
+    elapsed = time.perf_counter() - start
+    pages.close()
+    return elapsed
+
+
+def run(formats: list[str], sizes: list[int], repeat: int) -> dict:
+    """
+    Para cada formato e tamanho (em páginas), gera um contrato em disco (como
+    o upload gravado pela API) e mede a extração do texto.
+    """
+    cases = []
+    try:
+        for extension in formats:
+            for pages in sizes:
+                data = make_contract_file(extension, pages, seed=pages)
+                with tempfile.NamedTemporaryFile(suffix=extension, delete=False) as file:
+                    file.write(data)
+                try:
+                    text, page_count = extract_document(file.name, extension)
+                    samples = measure(lambda: extract_document(file.name, extension), repeat)
+                    first_page = summarize([_first_page_seconds(file.name) for _ in range(repeat)]) if extension == ".pdf" else None
+                finally:
+                    os.remove(file.name)
+
+                stats = summarize(samples)
+                median_seconds = stats["p50_ms"] / 1000
+                cases.append({
+                    "format": extension.lstrip("."),
+                    "pages": pages,
+                    "file_bytes": len(data),
+                    "text_chars": len(text),
+                    "page_count": page_count,
+                    "latency": stats,
+                    "first_page_p50_ms": first_page["p50_ms"] if first_page else None,
+                    "mb_per_second": round(len(data) / 1024 / 1024 / median_seconds, 3),
+                    "chars_per_second": round(len(text) / median_seconds),
+                })
+                print(f"parse {extension} {pages} páginas: p50 {stats['p50_ms']} ms")
+    finally:
+        shutdown_pdf_executor()
+
+    return {
+        "config": {"pdf_parse_workers": PDF_PARSE_WORKERS, "pdf_parallel_min_pages": PDF_PARALLEL_MIN_PAGES},
+        "cases": cases,
+    }
@@ -0,0 +1,142 @@
+"""
+Geração de contratos sintéticos (PDF e DOCX) a partir dos exemplos da pasta Contratos/.
+
+Cada contrato recebe um número próprio no cabeçalho, para que o texto (e o
+hash usado pelo cache de análises) seja diferente a cada arquivo gerado.
+"""
+import io
+import random
+import re
+import textwrap
+from functools import lru_cache
+from pathlib import Path
+from docx import Document
+
+
+CONTRACTS_DIR = Path(__file__).resolve().parents[2] / "Contratos"
+
+# Aproximação de uma página de contrato impresso
+CHARS_PER_PAGE = 3000
+
+# Layout do PDF gerado: A4 com Helvetica 10
+PDF_LINES_PER_PAGE = 60
+PDF_LINE_WIDTH = 95
+
+CLAUSE_HEADING = re.compile(r"^\s*CL[ÁA]USULA\b", re.IGNORECASE)
+
+
+@lru_cache
+def load_sample_paragraphs() -> tuple[tuple[str, ...], tuple[tuple[str, ...], ...]]:
+    """
+    Lê os DOCX de exemplo e retorna o preâmbulo do primeiro contrato e as
+    cláusulas de todos eles (cada cláusula com seus parágrafos).
+    """
+    samples = sorted(CONTRACTS_DIR.glob("*.docx"))
+    if not samples:
+        raise FileNotFoundError(f"Nenhum contrato de exemplo em {CONTRACTS_DIR}.")
+
+    preamble = []
+    clauses = []
+    for index, path in enumerate(samples):
+        paragraphs = [p.text.strip() for p in Document(str(path)).paragraphs if p.text.strip()]
+        current = None
+        for paragraph in paragraphs:
+            if CLAUSE_HEADING.match(paragraph):
+                current = [paragraph]
+                clauses.append(current)
+            elif current is not None:
+                current.append(paragraph)
+            elif index == 0:
+                preamble.append(paragraph)
+
+    if not clauses:
+        raise ValueError("Os contratos de exemplo não têm cláusulas identificáveis.")
+    return tuple(preamble), tuple(tuple(clause[1:]) for clause in clauses if len(clause) > 1)
+
+
+def build_contract_text(pages: int, seed: int) -> str:
+    """
+    Monta um contrato com aproximadamente `pages` páginas: o preâmbulo do
+    exemplo seguido de cláusulas sorteadas dos exemplos, renumeradas.
+    """
+    preamble, clauses = load_sample_paragraphs()
+    rng = random.Random(seed)
+
+    lines = [f"CONTRATO SINTÉTICO Nº {seed:08d}", *preamble]
+    size = sum(len(line) for line in lines)
+    number = 0
+    while size < pages * CHARS_PER_PAGE:
+        number += 1
+        clause = [f"CLÁUSULA {number}ª", *rng.choice(clauses)]
+        lines.extend(clause)
+        size += sum(len(line) for line in clause)
+    return "\n".join(lines)
+
+
+def make_docx(text: str) -> bytes:
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_string(line: str) -> bytes:
+    encoded = line.encode("cp1252", errors="replace")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def make_pdf(text: str) -> bytes:
+    """
+    Gera um PDF de texto simples (sem dependências além da biblioteca padrão),
+    com fonte Helvetica e codificação WinAnsi para os acentos.
+    """
+    lines = []
+    for paragraph in text.split("\n"):
+        lines.extend(textwrap.wrap(paragraph, PDF_LINE_WIDTH) or [""])
+    pages = [lines[start:start + PDF_LINES_PER_PAGE] for start in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+
+    # Objetos: 1 catálogo, 2 árvore de páginas, 3 fonte e, para cada página, a página e o conteúdo
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for page_lines in pages:
+        content = b"BT /F1 10 Tf 12 TL 50 800 Td " + b" ".join(_pdf_string(line) + b" '" for line in page_lines) + b" ET"
+        page_number = len(objects) + 1
+        page_refs.append(f"{page_number} 0 R".encode())
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents " + f"{page_number + 1} 0 R".encode() + b" >>"
+        )
+        objects.append(b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n" + content + b"\nendstream")
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(page_refs) + b"] /Count " + str(len(pages)).encode() + b" >>"
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    xref = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        output.write(f"{offset:010d} 00000 n \n".encode())
+    output.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return output.getvalue()
+
+
+def make_contract_file(extension: str, pages: int, seed: int) -> bytes:
+    """
+    Gera um contrato sintético em `.pdf` ou `.docx`.
+    """
+    text = build_contract_text(pages, seed)
+    if extension == ".pdf":
+        return make_pdf(text)
+    if extension == ".docx":
+        return make_docx(text)
+    raise ValueError(f"Extensão de arquivo não suportada: {extension}")
@@ -0,0 +1,101 @@
+"""
+Latência de ponta a ponta do POST /contracts/upload, com a IA simulada pelo servidor falso.
+"""
+import time
+from fastapi.testclient import TestClient
+from app.core.config import UPLOAD_WORKERS
+from app.core.metrics import STAGE_SECONDS
+from app.main import app
+from benchmarks.common import login, summarize
+from benchmarks.synthetic import make_contract_file
+
+
+STAGES = ["spool", "cache", "parse", "rules", "llm", "db"]
+
+# Intervalo entre as consultas ao status dos jobs
+POLL_INTERVAL_SECONDS = 0.01
+
+
+def _stage_snapshot() -> dict:
+    return {stage: STAGE_SECONDS.snapshot(stage=stage) for stage in STAGES}
+
+
+def _stage_means(before: dict, after: dict) -> dict:
+    # Média de cada etapa no intervalo, a partir do histograma pipeline_stage_duration_seconds
+    means = {}
+    for stage in STAGES:
+        count = after[stage][0] - before[stage][0]
+        if count:
+            means[stage] = round((after[stage][1] - before[stage][1]) / count * 1000, 3)
+    return means
+
+
+def _wait_job(client: TestClient, headers: dict, job_id: str) -> dict:
+    while True:
+        job = client.get(f"/contracts/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("concluido", "erro"):
+            return job
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+
+def run(formats: list[str], sizes: list[int], uploads: int, concurrency: int, llm_delay: float) -> dict:
+    """
+    Para cada formato e tamanho, envia `uploads` contratos diferentes (sem
+    acerto no cache), em ondas de `concurrency` envios simultâneos, e mede:
+    - o tempo de resposta do POST (202 com o job);
+    - o tempo do início do POST até o fim do job (ponta a ponta);
+    - a média de cada etapa do processamento, pelas métricas da aplicação.
+    """
+    cases = []
+    seed = 0
+    with TestClient(app) as client:
+        _, headers = login(client)
+
+        for extension in formats:
+            for pages in sizes:
+                files = []
+                for _ in range(uploads):
+                    seed += 1
+                    files.append((f"benchmark-{seed:06d}{extension}", make_contract_file(extension, pages, seed)))
+
+                accept_samples, total_samples, errors = [], [], 0
+                before = _stage_snapshot()
+                started = time.time()
+                for start in range(0, len(files), concurrency):
+                    wave = []
+                    for filename, data in files[start:start + concurrency]:
+                        posted_at = time.time()
+                        response = client.post("/contracts/upload", files={"file": (filename, data)}, headers=headers)
+                        accept_samples.append(time.time() - posted_at)
+                        if response.status_code == 202:
+                            wave.append((posted_at, response.json()["job_id"]))
+                        else:
+                            errors += 1
+
+                    for posted_at, job_id in wave:
+                        job = _wait_job(client, headers, job_id)
+                        if job["status"] == "concluido":
+                            # finished_at é registrado pela fila, no mesmo relógio do processo
+                            total_samples.append(job["finished_at"] - posted_at)
+                        else:
+                            errors += 1
+                elapsed = time.time() - started
+
+                stats = summarize(total_samples)
+                cases.append({
+                    "format": extension.lstrip("."),
+                    "pages": pages,
+                    "file_bytes": len(files[0][1]),
+                    "uploads": uploads,
+                    "errors": errors,
+                    "accept_latency": summarize(accept_samples),
+                    "end_to_end_latency": stats,
+                    "stage_mean_ms": _stage_means(before, _stage_snapshot()),
+                    "uploads_per_second": round(len(total_samples) / elapsed, 3),
+                })
+                print(f"upload {extension} {pages} páginas: p50 {stats.get('p50_ms')} ms, {errors} erro(s)")
+
+    return {
+        "config": {"llm_delay_seconds": llm_delay, "concurrency": concurrency, "upload_workers": UPLOAD_WORKERS},
+        "cases": cases,
+    }
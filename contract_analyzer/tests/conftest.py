@@ -0,0 +1,2 @@
+# test_groq.py e generate_hash.py são scripts manuais (chamam a API do Groq / imprimem um hash), não testes do pytest
+collect_ignore = ["test_groq.py", "generate_hash.py", "fake_openai_server.py"]
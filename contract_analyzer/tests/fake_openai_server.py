@@ -0,0 +1,94 @@
+"""
+Servidor local compatível com a API da OpenAI/Groq para testes sem custo.
+
+Uso:
+    uvicorn tests.fake_openai_server:app --port 9000
+    # no .env da API: GROQ_API_BASE=http://localhost:9000/v1 e GROQ_API_KEY=qualquer-valor
+
+Variáveis de ambiente:
+    FAKE_LLM_DELAY_SECONDS  atraso de cada resposta (padrão 0.5)
+    FAKE_LLM_429_RATE       fração das chamadas respondidas com 429 (padrão 0)
+    FAKE_LLM_MALFORMED_RATE fração das respostas com JSON malformado e um campo faltando (padrão 0)
+"""
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+DELAY_SECONDS = float(os.getenv("FAKE_LLM_DELAY_SECONDS", 0.5))
+RATE_LIMIT_RATE = float(os.getenv("FAKE_LLM_429_RATE", 0))
+MALFORMED_RATE = float(os.getenv("FAKE_LLM_MALFORMED_RATE", 0))
+
+ANALYSIS = {
+    "nomes_partes": ["Empresa X Ltda.", "Cliente Y S.A."],
+    "valores_monetarios": ["R$ 100.000,00", "R$ 50.000,00"],
+    "obrigacoes_principais": [
+        "Entrega do serviço no prazo de 12 meses.",
+        "Pagamento em 5 parcelas iguais com vencimento mensal."
+    ],
+    "dados_adicionais": "Objeto: Prestação de serviços de consultoria em TI. Vigência: 01/01/2024 a 31/12/2024.",
+    "clausulas_rescisao": "Contrato pode ser rescindido por qualquer uma das partes mediante aviso prévio de 30 dias."
+}
+
+app = FastAPI()
+stats = {"requests": 0, "rate_limited": 0, "malformed": 0}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["requests"] += 1
+
+    if random.random() < RATE_LIMIT_RATE:
+        stats["rate_limited"] += 1
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+            headers={"retry-after": "1"}
+        )
+
+    await asyncio.sleep(DELAY_SECONDS)
+
+    prompt_tokens = sum(len(message["content"]) for message in body["messages"]) // 4
+    # Responde apenas os campos pedidos no prompt (o cliente pode pedir só os que faltaram)
+    prompt = body["messages"][-1]["content"]
+    analysis = {field: value for field, value in ANALYSIS.items() if field in prompt}
+
+    if random.random() < MALFORMED_RATE:
+        # Bloco ```json com vírgula sobrando e sem um dos campos
+        stats["malformed"] += 1
+        analysis.pop(random.choice(list(analysis)), None)
+        content = "```json\n" + json.dumps(analysis, ensure_ascii=False)[:-1] + ",}\n```"
+    else:
+        content = "Aqui está o resultado:\n" + json.dumps(analysis, ensure_ascii=False)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_tokens + len(content) // 4
+        }
+    }
+
+
+@app.get("/stats")
+def get_stats():
+    return stats
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=int(os.getenv("FAKE_LLM_PORT", 9000)))
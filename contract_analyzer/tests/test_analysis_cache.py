@@ -0,0 +1,80 @@
+import threading
+import time
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, create_db_engine
+from app.models.analysis_cache import AnalysisCache
+from app.services import analysis_cache
+from app.services.analysis_cache import get_cached_analysis, store_analysis, text_cache_key
+
+
+@pytest.fixture
+def make_session(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'cache.sqlite3'}")
+    Base.metadata.create_all(engine, tables=[AnalysisCache.__table__])
+    analysis_cache._pending_hits.clear()
+    yield sessionmaker(bind=engine, autoflush=False)
+    analysis_cache._pending_hits.clear()
+    engine.dispose()
+
+
+def test_store_same_key_from_two_sessions(make_session):
+    first, second = make_session(), make_session()
+    errors = []
+
+    # A primeira sessão insere a chave sem confirmar; a segunda tenta gravar a
+    # mesma chave nesse meio tempo, como dois jobs que analisaram o mesmo conteúdo
+    first.add(AnalysisCache(cache_key="chave", analysis='{"origem": "primeira"}'))
+    first.flush()
+
+    def store_second():
+        try:
+            store_analysis(second, ["chave"], {"origem": "segunda"})
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=store_second)
+    thread.start()
+    time.sleep(0.3)
+    first.commit()
+    thread.join()
+
+    assert errors == []
+    check = make_session()
+    rows = check.scalars(select(AnalysisCache)).all()
+    assert [row.cache_key for row in rows] == ["chave"]
+    assert get_cached_analysis(check, "chave") == {"origem": "segunda"}
+    for session in (first, second, check):
+        session.close()
+
+
+def test_store_repeated_keys_in_one_call(make_session):
+    db = make_session()
+    store_analysis(db, ["chave", "chave"], {"valor": 1})
+    store_analysis(db, ["chave"], {"valor": 2})
+    assert db.scalar(select(AnalysisCache.analysis)) == '{"valor": 2}'
+    db.close()
+
+
+def test_read_does_not_write_until_flush(make_session):
+    db = make_session()
+    store_analysis(db, ["chave"], {"valor": 1})
+
+    reader = make_session()
+    assert get_cached_analysis(reader, "chave") == {"valor": 1}
+    assert get_cached_analysis(reader, "chave") == {"valor": 1}
+    assert db.scalar(select(AnalysisCache.hits)) == 0
+
+    # Os acertos são gravados junto com a próxima gravação do cache
+    store_analysis(db, ["outra"], {"valor": 2})
+    db.expire_all()
+    assert db.scalar(select(AnalysisCache.hits).where(AnalysisCache.cache_key == "chave")) == 2
+    reader.close()
+    db.close()
+
+
+def test_empty_text_has_no_cache_key():
+    assert text_cache_key("") is None
+    assert text_cache_key(" \n\f\n ") is None
+    assert text_cache_key("Contrato de prestação de serviços") == text_cache_key("Contrato  de prestação\nde serviços")
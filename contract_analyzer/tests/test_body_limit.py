@@ -0,0 +1,49 @@
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from app.core.body_limit import RequestBodyLimitMiddleware
+
+app = FastAPI()
+app.add_middleware(RequestBodyLimitMiddleware, limits={"/upload": 10_000})
+received = []
+
+
+@app.post("/upload")
+async def upload(file: UploadFile = File(...)):
+    received.append(file.filename)
+    return {"size": len(await file.read())}
+
+
+client = TestClient(app)
+
+
+def _chunks(size: int):
+    # Gerador: o corpo vai em partes (chunked), sem Content-Length
+    boundary = b"limite"
+    yield b"--" + boundary + b'\r\nContent-Disposition: form-data; name="file"; filename="a.pdf"\r\n\r\n'
+    for _ in range(size // 1000):
+        yield b"x" * 1000
+    yield b"\r\n--" + boundary + b"--\r\n"
+
+
+def test_accepts_body_within_limit():
+    response = client.post("/upload", files={"file": ("a.pdf", b"x" * 5_000)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 5_000}
+
+
+def test_rejects_by_content_length_before_reading():
+    received.clear()
+    response = client.post("/upload", files={"file": ("a.pdf", b"x" * 20_000)})
+    assert response.status_code == 413
+    assert received == []
+
+
+def test_rejects_chunked_body_over_limit():
+    received.clear()
+    response = client.post(
+        "/upload",
+        content=_chunks(50_000),
+        headers={"Content-Type": "multipart/form-data; boundary=limite"}
+    )
+    assert response.status_code == 413
+    assert received == []
@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.database import create_db_engine
+from app.migrations import run_migrations
+from app.services import bulk_reanalysis
+from app.services.bulk_reanalysis import Checkpoint, build_query, run_bulk_reanalysis
+from app.services.job_queue import JobError
+
+
+@pytest.fixture
+def contract_ids(tmp_path, monkeypatch):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'contratos.sqlite3'}")
+    run_migrations(engine)
+    ids = [1, 2, 3, 4, 5]
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, username, hashed_password, full_name, email) VALUES (1, 'a', 'x', 'A', 'a@a.com')"))
+        for contract_id in ids:
+            conn.execute(text("INSERT INTO contracts (id, filename, uploaded_by) VALUES (:id, :filename, 1)"), {"id": contract_id, "filename": f"{contract_id}.pdf"})
+            conn.execute(text("""
+                INSERT INTO contract_documents (contract_id, extension, file_sha256, file_size, text_sha256, text_size, compression, content, created_at)
+                VALUES (:id, '.pdf', :id, 1, :id, 1, 'gzip', x'00', CURRENT_TIMESTAMP)
+            """), {"id": contract_id})
+    monkeypatch.setattr(bulk_reanalysis, "SessionLocal", sessionmaker(bind=engine))
+    yield ids
+    engine.dispose()
+
+
+def _run(monkeypatch, checkpoint, path, failing: set[int], calls: list[int]):
+    async def fake_reanalyze(contract_id, force):
+        calls.append(contract_id)
+        if contract_id in failing:
+            raise JobError(503, "Limite de requisições da IA atingido. Tente novamente em instantes.")
+        return {"cached": False}
+
+    monkeypatch.setattr(bulk_reanalysis, "reanalyze_contract", fake_reanalyze)
+    return asyncio.run(run_bulk_reanalysis(build_query(True, None, None), checkpoint, path, 2, 2, False))
+
+
+def test_resume_retries_failed_contracts(contract_ids, tmp_path, monkeypatch):
+    path = str(tmp_path / "checkpoint.json")
+
+    calls = []
+    first = _run(monkeypatch, Checkpoint(), path, {2, 4}, calls)
+    assert sorted(calls) == contract_ids
+    assert (first.last_id, first.done, first.failed_ids) == (5, 3, [2, 4])
+
+    # Retomando: só as falhas são refeitas; a que falhar de novo continua na lista
+    calls = []
+    second = _run(monkeypatch, Checkpoint.load(path), path, {4}, calls)
+    assert calls == [2, 4]
+    assert (second.last_id, second.done, second.failed_ids) == (5, 4, [4])
+
+    calls = []
+    third = _run(monkeypatch, Checkpoint.load(path), path, set(), calls)
+    assert calls == [4]
+    assert (third.done, third.failed_ids) == (5, [])
+    assert Checkpoint.load(path).failed_ids == []
+
+
+def test_resume_skips_failed_contracts_that_no_longer_need_it(contract_ids, tmp_path, monkeypatch):
+    path = str(tmp_path / "checkpoint.json")
+    Checkpoint(last_id=5, done=4, failed_ids=[3, 99]).save(path)
+
+    calls = []
+    checkpoint = _run(monkeypatch, Checkpoint.load(path), path, set(), calls)
+    assert calls == [3]
+    assert checkpoint.failed_ids == []
@@ -0,0 +1,35 @@
+import pytest
+from app.services.contract_entities import normalize_party_name, parse_brl_cents
+
+
+@pytest.mark.parametrize("value, cents", [
+    ("R$ 1.000,00", 100000),
+    ("R$1000", 100000),
+    ("R$ 1.234.567,8", 123456780),
+    ("R$ 1000.50", 100050),
+    ("R$ 1.000", 100000),
+    ("12 parcelas de R$ 1.000,00", 100000),
+    ("Multa de 2% sobre R$ 50.000,00", 5000000),
+    ("1.500,00 (mil e quinhentos reais)", 150000),
+    ("12 parcelas de 1.000,00", 100000),
+    ("Pagamento em 05/01/2024 de 300,00", 30000),
+    ("250 reais", 25000),
+    ("R$ 1.000,00.", 100000),
+])
+def test_parse_brl_cents(value, cents):
+    assert parse_brl_cents(value) == cents
+
+
+@pytest.mark.parametrize("value", [
+    "10% do valor",
+    "10,5 % de multa",
+    "05/01/2024",
+    "valor a combinar",
+    "",
+])
+def test_parse_brl_cents_without_amount(value):
+    assert parse_brl_cents(value) is None
+
+
+def test_normalize_party_name():
+    assert normalize_party_name("  Comércio   LTDA ") == "comercio ltda"
@@ -0,0 +1,102 @@
+import asyncio
+import os
+from app.services import contract_pipeline
+from app.services.analysis_cache import make_cache_key
+from app.services.contract_pipeline import analyze_cached_upload, analyze_text_once, analyze_upload
+from app.services.document_store import ExtractedDocument
+from app.services.upload_spool import SpooledUpload
+
+
+def test_same_text_is_analyzed_once(monkeypatch):
+    calls = []
+
+    async def fake_analyze_contract(text):
+        calls.append(text)
+        await asyncio.sleep(0.05)
+        return {"texto": text}
+
+    monkeypatch.setattr(contract_pipeline, "analyze_contract", fake_analyze_contract)
+
+    async def run():
+        return await asyncio.gather(
+            analyze_text_once("chave", "contrato"),
+            analyze_text_once("chave", "contrato"),
+            analyze_text_once("outra", "outro contrato"),
+        )
+
+    results = asyncio.run(run())
+    assert results == [{"texto": "contrato"}, {"texto": "contrato"}, {"texto": "outro contrato"}]
+    assert sorted(calls) == ["contrato", "outro contrato"]
+    assert contract_pipeline._pending_analyses == {}
+
+
+def test_cancelled_caller_does_not_cancel_shared_analysis(monkeypatch):
+    async def fake_analyze_contract(text):
+        await asyncio.sleep(0.05)
+        return {"texto": text}
+
+    monkeypatch.setattr(contract_pipeline, "analyze_contract", fake_analyze_contract)
+
+    async def run():
+        first = asyncio.create_task(analyze_text_once("chave", "contrato"))
+        second = asyncio.create_task(analyze_text_once("chave", "contrato"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == {"texto": "contrato"}
+
+
+def _cached_file_without_document(monkeypatch, tmp_path):
+    """
+    Arquivo já analisado (chave do arquivo no cache) cujo contrato foi
+    excluído: o texto dele não está mais guardado.
+    """
+    path = tmp_path / "contrato.docx"
+    path.write_bytes(b"conteudo")
+    upload = SpooledUpload(path=str(path), size=8, sha256="abc")
+    parsed = []
+
+    def fake_extract(file_path, extension):
+        assert os.path.exists(file_path)
+        parsed.append(file_path)
+        return "texto do contrato", 1
+
+    async def unexpected_analysis(text):
+        raise AssertionError("a análise em cache deveria ser reaproveitada")
+
+    monkeypatch.setattr(contract_pipeline, "load_cached_analysis", lambda key: {"origem": "cache"} if key == make_cache_key("abc") else None)
+    monkeypatch.setattr(contract_pipeline, "load_document_by_file", lambda sha256: None)
+    monkeypatch.setattr(contract_pipeline, "extract_document", fake_extract)
+    monkeypatch.setattr(contract_pipeline, "find_near_duplicate", lambda document, reuse: (None, None))
+    monkeypatch.setattr(contract_pipeline, "save_cached_analysis", lambda keys, analysis: None)
+    monkeypatch.setattr(contract_pipeline, "analyze_contract", unexpected_analysis)
+    return upload, parsed
+
+
+def test_cached_file_without_stored_text_is_parsed_again(monkeypatch, tmp_path):
+    upload, parsed = _cached_file_without_document(monkeypatch, tmp_path)
+
+    # O atalho da rota não se aplica e mantém o arquivo temporário para a extração
+    assert asyncio.run(analyze_cached_upload(upload)) is None
+    assert os.path.exists(upload.path)
+
+    analyzed = asyncio.run(analyze_upload(upload, ".docx"))
+    assert parsed == [upload.path]
+    assert analyzed.cached is True
+    assert analyzed.analysis == {"origem": "cache"}
+    assert analyzed.document.text == "texto do contrato"
+    assert analyzed.document.file_sha256 == "abc"
+    assert not os.path.exists(upload.path)
+
+
+def test_cached_file_with_stored_text_skips_parsing(monkeypatch, tmp_path):
+    upload, parsed = _cached_file_without_document(monkeypatch, tmp_path)
+    stored = ExtractedDocument(text="texto guardado", extension=".docx", file_sha256="abc", file_size=8)
+    monkeypatch.setattr(contract_pipeline, "load_document_by_file", lambda sha256: stored)
+
+    analyzed = asyncio.run(analyze_cached_upload(upload))
+    assert parsed == []
+    assert analyzed.cached is True
+    assert analyzed.document is stored
+    assert not os.path.exists(upload.path)
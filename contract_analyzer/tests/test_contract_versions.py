@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.api import contracts
+from app.core.security import get_current_user
+from app.core.user_cache import CurrentUser
+from app.database import create_async_db_engine, create_db_engine, get_db
+from app.migrations import run_migrations
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'contratos.sqlite3'}"
+    engine = create_db_engine(url)
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, username, hashed_password, full_name, email) VALUES (1, 'a', 'x', 'A', 'a@a.com')"))
+        conn.execute(text("INSERT INTO contracts (id, filename, uploaded_by, dados_adicionais, version) VALUES (1, 'contrato.pdf', 1, 'original', 5)"))
+    engine.dispose()
+
+    async_engine = create_async_db_engine(url)
+    make_session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def test_db():
+        async with make_session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(contracts.router)
+    app.dependency_overrides[get_db] = test_db
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(id=1, username="a", full_name="A", email="a@a.com")
+    published = []
+    monkeypatch.setattr(contracts.contract_events, "publish", lambda event, data: published.append(event))
+    with TestClient(app) as test_client:
+        test_client.published = published
+        yield test_client
+    asyncio.run(async_engine.dispose())
+
+
+def test_unchanged_contract_answers_304(client):
+    etag = client.get("/contracts/1").headers["etag"]
+    response = client.get("/contracts/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_update_changes_etag(client):
+    etag = client.get("/contracts/1").headers["etag"]
+    response = client.put("/contracts/1", json={"dados_adicionais": "novo"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert client.get("/contracts/1", headers={"If-None-Match": etag}).status_code == 200
+    assert client.published == ["contract_updated"]
+
+
+def test_stale_if_match_answers_412(client):
+    etag = client.get("/contracts/1").headers["etag"]
+    current = client.put("/contracts/1", json={"dados_adicionais": "primeira"}).headers["etag"]
+
+    response = client.put("/contracts/1", json={"dados_adicionais": "segunda"}, headers={"If-Match": etag})
+    assert response.status_code == 412
+    assert response.headers["etag"] == current
+    assert client.get("/contracts/1").json()["dados_adicionais"] == "primeira"
+
+
+def test_empty_body_does_not_write(client):
+    etag = client.get("/contracts/1").headers["etag"]
+    response = client.put("/contracts/1", json={}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+    assert response.json()["updated_contract"]["dados_adicionais"] == "original"
+    assert client.published == []
+    assert client.put("/contracts/1", json={}, headers={"If-Match": '"1-1"'}).status_code == 412
+    assert client.put("/contracts/2", json={}).status_code == 404
+
+
+def test_null_filename_is_rejected(client):
+    response = client.put("/contracts/1", json={"filename": None})
+    assert response.status_code == 422
+    assert client.get("/contracts/1").json()["filename"] == "contrato.pdf"
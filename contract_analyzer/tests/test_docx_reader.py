@@ -0,0 +1,47 @@
+import io
+from pathlib import Path
+import pytest
+from docx import Document
+from app.services.docx_reader import read_docx_text
+from benchmarks.synthetic import make_contract_file
+
+SAMPLE_CONTRACTS = sorted((Path(__file__).resolve().parents[2] / "Contratos").glob("*.docx"))
+
+
+def _python_docx_text(data: bytes) -> str:
+    # Extração anterior (python-docx), que só lia os parágrafos do corpo
+    return "\n".join(paragraph.text for paragraph in Document(io.BytesIO(data)).paragraphs).strip()
+
+
+@pytest.mark.parametrize("path", SAMPLE_CONTRACTS, ids=lambda path: path.name)
+def test_sample_contracts_match_python_docx(path):
+    data = path.read_bytes()
+    assert read_docx_text(io.BytesIO(data)) == _python_docx_text(data)
+
+
+def test_synthetic_contract_matches_python_docx():
+    data = make_contract_file(".docx", 5, seed=5)
+    assert read_docx_text(io.BytesIO(data)) == _python_docx_text(data)
+
+
+def test_tables_headers_and_footers_are_included():
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = "Contrato nº 12/2024"
+    document.sections[0].footer.paragraphs[0].text = "Confidencial"
+    document.add_paragraph("CLÁUSULA 1ª - DO PREÇO")
+    table = document.add_table(rows=2, cols=2)
+    for row, values in zip(table.rows, [("Item", "Valor"), ("Manutenção", "R$ 4.500,00")]):
+        for cell, value in zip(row.cells, values):
+            cell.text = value
+    document.add_paragraph("CLÁUSULA 2ª - DA VIGÊNCIA")
+    stream = io.BytesIO()
+    document.save(stream)
+
+    assert read_docx_text(io.BytesIO(stream.getvalue())).split("\n") == [
+        "Contrato nº 12/2024",
+        "CLÁUSULA 1ª - DO PREÇO",
+        "Item | Valor",
+        "Manutenção | R$ 4.500,00",
+        "CLÁUSULA 2ª - DA VIGÊNCIA",
+        "Confidencial",
+    ]
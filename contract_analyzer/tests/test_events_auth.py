@@ -0,0 +1,28 @@
+import asyncio
+import logging
+import pytest
+from fastapi import HTTPException
+from app.core.request_log import RedactTokenFilter
+from app.core.security import _authenticate, create_access_token, create_events_token, get_events_user
+
+
+def test_events_token_is_not_a_login_token():
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(_authenticate(create_events_token(1)))
+    assert error.value.status_code == 401
+
+
+def test_login_token_is_not_accepted_in_the_url():
+    login_token = create_access_token({"sub": "1"})
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(get_events_user(token=login_token, credentials=None))
+    assert error.value.status_code == 401
+
+
+def test_access_log_hides_token():
+    record = logging.LogRecord(
+        "uvicorn.access", logging.INFO, __file__, 0, '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:5000", "GET", "/contracts/events?token=abc.def&last_event_id=1-2", "1.1", 200), None
+    )
+    RedactTokenFilter().filter(record)
+    assert record.getMessage() == '127.0.0.1:5000 - "GET /contracts/events?token=***&last_event_id=1-2 HTTP/1.1" 200'
@@ -0,0 +1,48 @@
+from app.services import file_parser
+from app.services.file_parser import extract_pdf_document, iter_pdf_pages, shutdown_pdf_executor
+from app.services.text_preprocessor import clean_contract_pages, clean_contract_text
+from benchmarks.synthetic import make_contract_file
+
+
+def _pdf_file(tmp_path, pages):
+    path = tmp_path / "contrato.pdf"
+    path.write_bytes(make_contract_file(".pdf", pages, seed=pages))
+    return str(path)
+
+
+def test_pages_are_generated_before_the_last_one_is_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_parser, "PDF_PARSE_WORKERS", 1)
+    read = []
+    original = file_parser._iter_pages
+
+    def tracked(pdf, start, end):
+        for page in original(pdf, start, end):
+            read.append(page)
+            yield page
+
+    monkeypatch.setattr(file_parser, "_iter_pages", tracked)
+    pages = iter_pdf_pages(_pdf_file(tmp_path, 5))
+    next(pages)
+    assert len(read) == 1
+    pages.close()
+
+
+def test_parallel_pages_match_serial(tmp_path, monkeypatch):
+    path = _pdf_file(tmp_path, 6)
+    monkeypatch.setattr(file_parser, "PDF_PARSE_WORKERS", 1)
+    serial = list(iter_pdf_pages(path))
+
+    monkeypatch.setattr(file_parser, "PDF_PARSE_WORKERS", 3)
+    monkeypatch.setattr(file_parser, "PDF_PARALLEL_MIN_PAGES", 2)
+    try:
+        assert list(iter_pdf_pages(path)) == serial
+    finally:
+        shutdown_pdf_executor()
+    assert len(serial) == 6
+
+
+def test_preprocessor_consumes_generated_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_parser, "PDF_PARSE_WORKERS", 1)
+    path = _pdf_file(tmp_path, 4)
+    text, _ = extract_pdf_document(path)
+    assert clean_contract_pages(iter_pdf_pages(path), 3) == clean_contract_text(text, 3)
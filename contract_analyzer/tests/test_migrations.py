@@ -0,0 +1,59 @@
+import gzip
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import insert, text
+from app.database import create_db_engine
+from app.migrations import load_migrations, run_migrations, schema_version
+from app.services.near_duplicates import lsh_buckets, minhash_signature, pack_signature
+
+CONTRACT_TEXT = "Contrato de prestação de serviços entre Empresa X Ltda. e Cliente Y S.A. " * 20
+
+
+def _migrate(engine, first_version: int, last_version: int):
+    schema_version.create(engine, checkfirst=True)
+    for version, name, module in load_migrations():
+        if not first_version <= version <= last_version:
+            continue
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(insert(schema_version).values(version=version, name=name, applied_at=datetime.now(timezone.utc)))
+
+
+def test_migrations_backfill_existing_contracts(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'legado.sqlite3'}")
+    _migrate(engine, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, username, hashed_password, full_name, email) VALUES (1, 'a', 'x', 'A', 'a@a.com')"))
+        conn.execute(text("""
+            INSERT INTO contracts (id, filename, uploaded_by, nomes_partes, valores_monetarios)
+            VALUES (1, 'contrato.pdf', 1, 'Empresa X Ltda.; Cliente Y S.A.', '12 parcelas de R$ 1.000,00; 10% do valor')
+        """))
+
+    _migrate(engine, 2, 4)
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO contract_documents (contract_id, extension, file_sha256, file_size, text_sha256, text_size, compression, content, created_at)
+            VALUES (1, '.pdf', 'a', 1, 'b', 1, 'gzip', :content, CURRENT_TIMESTAMP)
+        """), {"content": gzip.compress(CONTRACT_TEXT.encode("utf-8"))})
+
+    assert run_migrations(engine)  # Demais migrações, a partir da v005
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT rowid FROM contracts_fts WHERE contracts_fts MATCH 'empresa'")).scalars().all() == [1]
+        assert conn.execute(text("SELECT name_normalized FROM contract_parties ORDER BY id")).scalars().all() == [
+            "empresa x ltda.", "cliente y s.a."
+        ]
+        # A v008 corrige os centavos convertidos pela v003 e remove o percentual
+        assert conn.execute(text("SELECT raw, cents FROM contract_amounts")).all() == [("12 parcelas de R$ 1.000,00", 100000)]
+        # As assinaturas da v006 são as mesmas calculadas para os novos uploads
+        signature = minhash_signature(CONTRACT_TEXT)
+        assert conn.execute(text("SELECT signature FROM contract_fingerprints")).scalar() == pack_signature(signature)
+        assert sorted(conn.execute(text("SELECT bucket FROM contract_similarity_buckets")).scalars()) == sorted(lsh_buckets(signature))
+    engine.dispose()
+
+
+def test_in_memory_sqlite_is_rejected():
+    with pytest.raises(ValueError):
+        create_db_engine("sqlite://")
+    with pytest.raises(ValueError):
+        create_db_engine("sqlite:///:memory:")
@@ -0,0 +1,19 @@
+import asyncio
+from app.core.metrics import PASSWORD_HASH_SECONDS, PASSWORD_OPERATIONS
+from app.core.passwords import hash_password, verify_password
+
+
+def test_hash_and_verify_are_timed_and_counted_separately():
+    hashes, _ = PASSWORD_HASH_SECONDS.snapshot(operation="hash")
+    verifications, _ = PASSWORD_HASH_SECONDS.snapshot(operation="verify")
+    failed = PASSWORD_OPERATIONS.get(operation="verify", result="failed")
+
+    async def run():
+        hashed = await hash_password("segredo")
+        assert (await verify_password("segredo", hashed)) == (True, None)
+        assert (await verify_password("errada", hashed)) == (False, None)
+
+    asyncio.run(run())
+    assert PASSWORD_HASH_SECONDS.snapshot(operation="hash")[0] == hashes + 1
+    assert PASSWORD_HASH_SECONDS.snapshot(operation="verify")[0] == verifications + 2
+    assert PASSWORD_OPERATIONS.get(operation="verify", result="failed") == failed + 1
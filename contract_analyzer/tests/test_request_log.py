@@ -0,0 +1,39 @@
+import io
+import json
+import logging
+import pytest
+from app.core.request_log import JsonFormatter, log_event, logger, request_id_var
+
+
+@pytest.fixture
+def output():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    logger.addHandler(handler)
+    level = logger.level
+    yield stream
+    logger.removeHandler(handler)
+    logger.setLevel(level)
+
+
+def test_event_is_one_json_line_with_request_id(output):
+    token = request_id_var.set("abc123")
+    try:
+        log_event("contract_saved", contract_id=7, filename="contrato.pdf")
+    finally:
+        request_id_var.reset(token)
+
+    record = json.loads(output.getvalue())
+    assert record["event"] == "contract_saved"
+    assert record["level"] == "info"
+    assert record["request_id"] == "abc123"
+    assert (record["contract_id"], record["filename"]) == (7, "contrato.pdf")
+
+
+def test_events_are_filtered_by_level(output):
+    logger.setLevel(logging.WARNING)
+    log_event("http_request", status=200)
+    log_event("llm_retry", logging.WARNING, attempt=2)
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [(line["event"], line["level"]) for line in lines] == [("llm_retry", "warning")]
@@ -0,0 +1,53 @@
+from app.services.rule_extractor import extract_contract_info_rules
+
+SAMPLE_CONTRACT = """CONTRATO DE PRESTAÇÃO DE SERVIÇOS
+
+CONTRATANTE: ALFA COMÉRCIO LTDA, pessoa jurídica de direito privado, inscrita no CNPJ sob o nº 12.345.678/0001-90, com sede em São Paulo/SP;
+CONTRATADA: Maria da Silva, brasileira, engenheira, portadora do CPF 123.456.789-00, residente em Campinas/SP.
+
+CLÁUSULA PRIMEIRA - DO OBJETO
+A prestação de serviços de manutenção preventiva dos equipamentos de ar-condicionado da CONTRATANTE.
+
+CLÁUSULA SEGUNDA - DO PREÇO
+Pelos serviços, a CONTRATANTE pagará R$ 4.500,00 mensais, além de R$ 1.200,00 na assinatura e R$ 4.500,00 de multa.
+
+CLÁUSULA TERCEIRA - DAS OBRIGAÇÕES DA CONTRATADA
+a) executar as visitas mensais de manutenção;
+b) fornecer relatório técnico após cada visita;
+c) manter sigilo sobre as informações da CONTRATANTE.
+
+CLÁUSULA QUARTA - DA VIGÊNCIA
+O presente contrato terá vigência de 12 (doze) meses a partir da assinatura.
+
+CLÁUSULA QUINTA - DA RESCISÃO
+O contrato poderá ser rescindido por qualquer das partes mediante aviso prévio de 30 dias.
+"""
+
+
+def test_extracts_fields_from_sample_contract():
+    analysis = extract_contract_info_rules(SAMPLE_CONTRACT)
+    assert analysis["nomes_partes"] == ["ALFA COMÉRCIO LTDA", "Maria da Silva"]
+    assert analysis["valores_monetarios"] == ["R$ 4.500,00", "R$ 1.200,00"]
+    assert analysis["obrigacoes_principais"] == [
+        "executar as visitas mensais de manutenção",
+        "fornecer relatório técnico após cada visita",
+        "manter sigilo sobre as informações da CONTRATANTE.",
+    ]
+    assert analysis["dados_adicionais"] == (
+        "Objeto: A prestação de serviços de manutenção preventiva dos equipamentos de ar-condicionado da CONTRATANTE.\n"
+        "Vigência: O presente contrato terá vigência de 12 (doze) meses a partir da assinatura"
+    )
+    assert analysis["clausulas_rescisao"] == (
+        "CLÁUSULA QUINTA - DA RESCISÃO O contrato poderá ser rescindido por qualquer das partes mediante aviso prévio de 30 dias."
+    )
+
+
+def test_missing_fields_stay_empty():
+    analysis = extract_contract_info_rules("Termo simples, sem partes identificadas nem valores.")
+    assert analysis == {
+        "nomes_partes": [],
+        "valores_monetarios": [],
+        "obrigacoes_principais": [],
+        "dados_adicionais": "",
+        "clausulas_rescisao": "",
+    }
@@ -0,0 +1,47 @@
+from app.services.file_parser import PAGE_BREAK
+from app.services.text_preprocessor import clean_contract_text
+
+
+def _join_pages(pages: list[list[str]]) -> str:
+    return f"\n{PAGE_BREAK}\n".join("\n".join(lines) for lines in pages)
+
+
+def test_numeric_body_lines_are_kept():
+    pages = [
+        [
+            "CONTRATO DE LOCAÇÃO",
+            f"CLÁUSULA {number}ª - DAS CONDIÇÕES",
+            f"Condição {number}: o prazo termina no fim do ano de",
+            "2024",
+            "e a parcela correspondente vence em",
+            "12/2024",
+            "sendo a quantidade de equipamentos locados igual a",
+            "15",
+            f"unidades, conforme o anexo {number}, entregues pelo locador",
+            f"no endereço indicado pelo locatário na proposta {number}.",
+            "As partes declaram estar de acordo com as condições acima.",
+            f"Página {number} de 3",
+        ]
+        for number in (1, 2, 3)
+    ]
+
+    cleaned, removed = clean_contract_text(_join_pages(pages), min_repeats=3)
+    lines = cleaned.split("\n")
+    assert lines.count("2024") == 3
+    assert lines.count("12/2024") == 3
+    assert lines.count("15") == 3
+    assert "CONTRATO DE LOCAÇÃO" not in lines
+    assert removed == {"numero_pagina": 3, "cabecalho_rodape": 6}
+
+
+def test_bare_page_numbers_at_the_page_edges_are_removed():
+    pages = [
+        ["1", "Cláusula 1: objeto do contrato.", "O valor é pago em", "30", "dias após a entrega.", "Sem reajuste.", "- 1 -"],
+        ["2", "Cláusula 2: da vigência.", "O prazo é de", "12", "meses, prorrogáveis.", "Com aviso prévio.", "- 2 -"],
+    ]
+    cleaned, removed = clean_contract_text(_join_pages(pages), min_repeats=3)
+    assert cleaned.split("\n\n") == [
+        "Cláusula 1: objeto do contrato.\nO valor é pago em\n30\ndias após a entrega.\nSem reajuste.",
+        "Cláusula 2: da vigência.\nO prazo é de\n12\nmeses, prorrogáveis.\nCom aviso prévio.",
+    ]
+    assert removed == {"numero_pagina": 4}
@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.core import security
+from app.core.security import _authenticate, create_access_token
+from app.core.user_cache import CurrentUser, UserCache, user_cache
+from app.database import Base, create_db_engine
+from app.models.user import User
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'usuarios.sqlite3'}")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    user_cache.clear()
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+    user_cache.clear()
+    engine.dispose()
+
+
+def _cached_user(db) -> User:
+    user = User(username="ana", full_name="Ana", email="ana@a.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_cache.set(CurrentUser.from_model(user))
+    assert user_cache.get(user.id) is not None
+    return user
+
+
+def test_update_invalidates_cached_user(session):
+    user = _cached_user(session)
+    user.full_name = "Ana Souza"
+    session.commit()
+    assert user_cache.get(user.id) is None
+
+
+def test_delete_invalidates_cached_user(session):
+    user = _cached_user(session)
+    user_id = user.id
+    session.delete(user)
+    session.commit()
+    assert user_cache.get(user_id) is None
+
+
+def test_authenticated_user_is_loaded_once(monkeypatch):
+    user_cache.clear()
+    loads = []
+
+    async def fake_load_user(user_id):
+        loads.append(user_id)
+        return CurrentUser(id=user_id, username="ana", full_name="Ana", email="ana@a.com")
+
+    monkeypatch.setattr(security, "_load_user", fake_load_user)
+    token = create_access_token({"sub": "42"})
+    try:
+        first = asyncio.run(_authenticate(token))
+        second = asyncio.run(_authenticate(token))
+    finally:
+        user_cache.clear()
+    assert first == second
+    assert loads == [42]
+
+
+def test_entries_expire_and_least_recent_is_evicted(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.user_cache.time.monotonic", lambda: now[0])
+    cache = UserCache(ttl_seconds=60, max_entries=2)
+    users = [CurrentUser(id=user_id, username=f"u{user_id}", full_name="U", email=f"u{user_id}@a.com") for user_id in (1, 2, 3)]
+
+    cache.set(users[0])
+    cache.set(users[1])
+    assert cache.get(1) == users[0]  # 1 passa a ser o mais recente
+    cache.set(users[2])
+    assert (cache.get(1), cache.get(2), cache.get(3)) == (users[0], None, users[2])
+
+    now[0] += 61
+    assert cache.get(1) is None
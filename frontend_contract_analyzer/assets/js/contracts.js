@@ -19,6 +19,37 @@ function logout() {
 
 // ------------ C O N T R A T O S  -  DELETE, VER DETALHES E LISTAR  ---------------------------------------------
 
+// Contratos já carregados (por ID) com o ETag da versão: as próximas leituras enviam
+// If-None-Match e reaproveitam o contrato quando a API responde 304 (não mudou)
+const contractCache = new Map();
+
+async function fetchContract(id, token) {
+    const cached = contractCache.get(String(id));
+    const headers = {
+        "Authorization": `Bearer ${token}`
+    };
+    if (cached) {
+        headers["If-None-Match"] = cached.etag;
+    }
+
+    const res = await fetch(`${apiBaseUrl}/contracts/${id}`, { headers, cache: "no-store" });
+
+    if (res.status === 304 && cached) {
+        return { res, contract: cached.contract };
+    }
+    if (!res.ok) {
+        contractCache.delete(String(id));
+        return { res, contract: null };
+    }
+
+    const contract = await res.json();
+    const etag = res.headers.get("ETag");
+    if (etag) {
+        contractCache.set(String(id), { etag, contract });
+    }
+    return { res, contract };
+}
+
 async function deleteContract(id) {
     id = parseInt(id); // garante que o ID é número
     if (isNaN(id)) {
@@ -43,8 +74,9 @@ async function deleteContract(id) {
             });
 
             if (res.ok) {
+                contractCache.delete(String(id));
                 alert("Contrato excluído com sucesso!");
-                loadContracts(); // Atualiza a lista
+                refreshContracts(); // Atualiza a lista
             } else if (res.status === 401 || res.status === 403) {
                 alert("Sessão expirada. Faça login novamente.");
                 localStorage.removeItem("accessToken");
@@ -60,21 +92,52 @@ async function deleteContract(id) {
     }
 }
 
-async function viewDetails(id) {
+// Refaz a análise com o texto guardado no upload, sem reenviar o arquivo
+async function reanalyzeContract(id) {
+    if (!confirm("Deseja analisar este contrato novamente com a IA?")) {
+        return;
+    }
+
     try {
         const token = localStorage.getItem("accessToken");
-        const res = await fetch(`${apiBaseUrl}/contracts/${id}`, {
+        const res = await fetch(`${apiBaseUrl}/contracts/${id}/reanalyze`, {
+            method: "POST",
             headers: {
                 "Authorization": `Bearer ${token}`
             }
         });
 
+        if (res.status === 409) {
+            alert("O texto deste contrato não foi armazenado. Envie o arquivo novamente.");
+            return;
+        }
         if (!res.ok) {
-            alert("Erro ao buscar detalhes do contrato.");
+            alertUploadError(res.status);
             return;
         }
 
-        const contract = await res.json();
+        const job = await waitForJob((await res.json()).job_id, token);
+        if (job.status !== "concluido") {
+            alertUploadError(job.status_code);
+            return;
+        }
+
+        alert("Contrato reanalisado com sucesso!");
+        refreshContracts(); // Atualiza a lista
+    } catch (error) {
+        alert("Erro ao reanalisar contrato.");
+    }
+}
+
+async function viewDetails(id) {
+    try {
+        const token = localStorage.getItem("accessToken");
+        const { contract } = await fetchContract(id, token);
+
+        if (!contract) {
+            alert("Erro ao buscar detalhes do contrato.");
+            return;
+        }
 
         // Preencher os campos do modal
         document.getElementById("detailId").textContent = contract.id;
@@ -94,44 +157,114 @@ async function viewDetails(id) {
 }
 
 // Listar Contratos
-async function loadContracts() {
+const CONTRACTS_PAGE_SIZE = 500;
+
+// ------------ E V E N T O S   E M   T E M P O   R E A L   ---------------------------------------------
+
+// A API envia as criações, edições, análises e exclusões de contratos (Server-Sent Events)
+// e a tabela é atualizada linha a linha, sem recarregar a lista
+const CONTRACT_EVENTS_RECONNECT_MS = 3000;
+let contractEvents = null;
+let lastContractEventId = null;
+let contractEventsReconnect = null;
+
+function upsertContractRow(contract) {
+    const table = document.getElementById("contractsTable");
+    const row = table.querySelector(`tr[data-contract-id="${contract.id}"]`);
+    if (row) {
+        row.outerHTML = renderContractRow(contract);
+    } else {
+        table.insertAdjacentHTML("beforeend", renderContractRow(contract));
+    }
+}
 
-    try {
-        const token = localStorage.getItem("accessToken");
-        if (!token) {
-            alert("Usuário não autenticado. Faça login novamente.");
-            window.location.href = "login.html";
-            return;
-        }
+function removeContractRow(id) {
+    const row = document.querySelector(`#contractsTable tr[data-contract-id="${id}"]`);
+    if (row) {
+        row.remove();
+    }
+}
 
-        const res = await fetch(`${apiBaseUrl}/contracts`, {
-            headers: {
-                "Authorization": `Bearer ${token}`
-            }
-        });
+async function connectContractEvents() {
+    const token = localStorage.getItem("accessToken");
+    if (!token || contractEvents) {
+        return;
+    }
+    contractEventsReconnect = null;
 
-        
-        if (res.status === 401 || res.status === 403) {
-            alert("Sessão expirada. Faça login novamente.");
-            localStorage.removeItem("accessToken");
-            window.location.href = "login.html";
+    // O EventSource não envia cabeçalhos: a URL leva um token de curta duração,
+    // válido só para esta rota (o token de login não vai na URL)
+    let eventsToken;
+    try {
+        const response = await fetch(`${apiBaseUrl}/contracts/events/token`, {
+            method: "POST",
+            headers: { Authorization: `Bearer ${token}` }
+        });
+        if (!response.ok) {
+            // Sessão expirada: as ações do usuário voltam a recarregar a lista
             return;
         }
+        eventsToken = (await response.json()).token;
+    } catch (error) {
+        scheduleContractEventsReconnect();
+        return;
+    }
 
-        if (res.status === 404) {
-            alert("Você não possui nenhum contrato carregado!");
-            return;
-        }
+    const params = new URLSearchParams({ token: eventsToken });
+    if (lastContractEventId) {
+        // Retoma do último evento recebido (a API envia os perdidos ou "resync")
+        params.set("last_event_id", lastContractEventId);
+    }
+    contractEvents = new EventSource(`${apiBaseUrl}/contracts/events?${params}`);
+
+    const track = (handler) => (event) => {
+        lastContractEventId = event.lastEventId;
+        handler(event);
+    };
+    const onContractChanged = (event) => {
+        const contract = JSON.parse(event.data);
+        contractCache.delete(String(contract.id));
+        upsertContractRow(contract);
+    };
+    contractEvents.addEventListener("contract_created", track(onContractChanged));
+    contractEvents.addEventListener("contract_updated", track(onContractChanged));
+    contractEvents.addEventListener("contract_analyzed", track(onContractChanged));
+    contractEvents.addEventListener("contract_deleted", track((event) => {
+        const { id } = JSON.parse(event.data);
+        contractCache.delete(String(id));
+        removeContractRow(id);
+    }));
+    contractEvents.addEventListener("ready", track(() => {}));
+
+    // A API não tem mais os eventos perdidos (ex.: foi reiniciada): recarrega a lista
+    contractEvents.addEventListener("resync", track(loadContracts));
+
+    contractEvents.onerror = () => {
+        // Conexão encerrada (ex.: duração máxima atingida): reconecta com um novo token,
+        // em vez de deixar o navegador repetir a URL com o token já expirado
+        contractEvents.close();
+        contractEvents = null;
+        scheduleContractEventsReconnect();
+    };
+}
 
-        const data = await res.json();
-        const contracts = data.contracts;
-        const table = document.getElementById("contractsTable");
-        table.innerHTML = "";
+function scheduleContractEventsReconnect() {
+    if (!contractEventsReconnect) {
+        contractEventsReconnect = setTimeout(connectContractEvents, CONTRACT_EVENTS_RECONNECT_MS);
+    }
+}
 
+// Atualiza a tabela após uma ação do usuário; com o fluxo de eventos conectado,
+// a linha alterada já chega pelo evento correspondente
+function refreshContracts() {
+    if (!contractEvents || contractEvents.readyState !== EventSource.OPEN) {
+        loadContracts();
+    }
+}
 
-        contracts.forEach(contract => {
-            const row = `
-            <tr>
+function renderContractRow(contract) {
+    return `
+            <tr data-contract-id="${contract.id}">
                 <td>${contract.id}</td>
                 <td title="${contract.filename}">${contract.filename}</td>
                 <td title="${contract.nomes_partes}">${contract.nomes_partes || ""}</td>
@@ -146,13 +279,59 @@ async function loadContracts() {
                     <button class="btn btn-sm btn-warning" onclick="openEditModal(${contract.id})">
                         <i class="fas fa-edit"></i>
                     </button>
+                    <button class="btn btn-sm btn-secondary" title="Reanalisar com a IA" onclick="reanalyzeContract(${contract.id})">
+                        <i class="fas fa-sync-alt"></i>
+                    </button>
                     <button class="btn btn-sm btn-danger" onclick="deleteContract(${contract.id})">
                         <i class="fas fa-trash"></i>
                     </button>
                 </td>
             </tr>`;
-            table.innerHTML += row;
-        });
+}
+
+async function loadContracts() {
+
+    try {
+        const token = localStorage.getItem("accessToken");
+        if (!token) {
+            alert("Usuário não autenticado. Faça login novamente.");
+            window.location.href = "login.html";
+            return;
+        }
+
+        const table = document.getElementById("contractsTable");
+        table.innerHTML = "";
+
+        // A API retorna os contratos em páginas; segue o cursor até a última
+        let cursor = null;
+        do {
+            const params = new URLSearchParams({ limit: CONTRACTS_PAGE_SIZE });
+            if (cursor !== null) {
+                params.set("cursor", cursor);
+            }
+
+            const res = await fetch(`${apiBaseUrl}/contracts?${params}`, {
+                headers: {
+                    "Authorization": `Bearer ${token}`
+                }
+            });
+
+            if (res.status === 401 || res.status === 403) {
+                alert("Sessão expirada. Faça login novamente.");
+                localStorage.removeItem("accessToken");
+                window.location.href = "login.html";
+                return;
+            }
+
+            if (res.status === 404) {
+                alert("Você não possui nenhum contrato carregado!");
+                return;
+            }
+
+            const data = await res.json();
+            table.insertAdjacentHTML("beforeend", data.contracts.map(renderContractRow).join(""));
+            cursor = data.next_cursor;
+        } while (cursor !== null);
 
     } catch (error) {
         //console.error("Erro ao carregar contratos:", error);
@@ -173,6 +352,49 @@ fileInput.addEventListener("change", () => {
 });
 
 //U P L O A D 
+const JOB_POLL_INTERVAL_MS = 1500;
+
+// Exibe a mensagem correspondente ao status de erro do upload/análise
+function alertUploadError(status) {
+    if (status === 409) {
+        // Arquivo duplicado
+        alert("Já existe um contrato com este nome no sistema.");
+    } else if (status === 422) {
+        // Erro na extração de dados
+        alert("Erro ao extrair o texto do contrato. Verifique o formato do arquivo e tente novamente.");
+    } else if (status === 500) {
+        // Erro ao processo o texto do contrato com a IA
+        alert("Erro ao processar o contrato com a IA.");
+    } else if (status === 503) {
+        // Erro na habilitação do serviço de IA ou fila cheia
+        alert("Serviço de IA indisponível no momento. Tente novamente mais tarde.");
+    } else {
+        alert("Erro inesperado ao enviar o arquivo.");
+    }
+}
+
+// Consulta o status do job até que ele seja concluído ou falhe
+async function waitForJob(jobId, token) {
+    while (true) {
+        const res = await fetch(`${apiBaseUrl}/contracts/jobs/${jobId}`, {
+            headers: {
+                "Authorization": `Bearer ${token}`
+            }
+        });
+
+        if (!res.ok) {
+            return { status: "erro", status_code: res.status };
+        }
+
+        const job = await res.json();
+        if (job.status === "concluido" || job.status === "erro") {
+            return job;
+        }
+
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+}
+
 async function uploadAndExtract() {
     const fileInput = document.getElementById("filename");
     const formData = new FormData();
@@ -198,41 +420,27 @@ async function uploadAndExtract() {
             body: formData
         });
 
-        if (uploadRes.status === 409) {
-            // Arquivo duplicado
-            alert("Já existe um contrato com este nome no sistema.");
+        if (!uploadRes.ok) {
+            alertUploadError(uploadRes.status);
             saveButton.disabled = true; // mantém desativado
             return;
         }
 
-        if (uploadRes.status === 422) {
-            // Erro na extração de dados
-            alert("Erro ao extrair o texto do contrato. Verifique o formato do arquivo e tente novamente.");
-            saveButton.disabled = true; // mantém desativado
-            return;
-        }
-        
-        if (uploadRes.status === 500) {
-            // Erro ao processo o texto do contrato com a IA
-            alert("Erro ao processar o contrato com a IA.");
-            saveButton.disabled = true; // mantém desativado
-            return;
-        }
+        let uploadData = await uploadRes.json();
 
-        if (uploadRes.status === 503) {
-            // Erro na habilitação do serviço de IA (Gemini)
-            alert("Serviço de IA (Gemini) não está habilitado. Configure a chave API para usar esta funcionalidade.");
-            saveButton.disabled = true; // mantém desativado
-            return;
-        }
+        // 202: o upload retornou um job; aguarda a análise terminar
+        // (201: contrato já analisado antes, o resultado veio do cache)
+        if (uploadRes.status === 202) {
+            const finishedJob = await waitForJob(uploadData.job_id, token);
 
-        if (!uploadRes.ok) {
-            alert("Erro inesperado ao enviar o arquivo.");
-            saveButton.disabled = true; // mantém desativado
-            return;
-        }
+            if (finishedJob.status !== "concluido") {
+                alertUploadError(finishedJob.status_code);
+                saveButton.disabled = true; // mantém desativado
+                return;
+            }
 
-        const uploadData = await uploadRes.json();
+            uploadData = finishedJob.result;
+        }
 
         // Preenche os campos do modal com os dados extraídos
         document.getElementById("contractId").value = uploadData.id;
@@ -242,7 +450,16 @@ async function uploadAndExtract() {
         document.getElementById("dadosAdicionais").value = uploadData.analysis.dados_adicionais || "";
         document.getElementById("clausulasRescisao").value = uploadData.analysis.clausulas_rescisao || "";
 
-        alert("Dados extraídos com sucesso! Revise e clique em Salvar para confirmar.");
+        let message = "Dados extraídos com sucesso! Revise e clique em Salvar para confirmar.";
+
+        // Avisa quando já existe um contrato semelhante (cópia renomeada ou versão editada)
+        const similar = uploadData.similar_contract;
+        if (similar) {
+            message += `\n\nEste contrato é ${Math.round(similar.similarity * 100)}% semelhante ao contrato #${similar.id} (${similar.filename})`;
+            message += similar.analysis_reused ? ", e a análise dele foi reaproveitada." : ".";
+        }
+
+        alert(message);
 
         saveButton.disabled = false; // habilita somente após sucesso
     } catch (error) {
@@ -296,18 +513,33 @@ document.getElementById("contractForm").addEventListener("submit", async (e) =>
             clausulas_rescisao: document.getElementById("clausulasRescisao").value
         };
 
+        const headers = {
+            "Content-Type": "application/json",
+            "Authorization": `Bearer ${token}`
+        };
+
+        // Só grava se o contrato não foi alterado por outra pessoa desde que foi aberto
+        const cached = contractCache.get(id);
+        if (cached) {
+            headers["If-Match"] = cached.etag;
+        }
+
         const updateRes = await fetch(`${apiBaseUrl}/contracts/${id}`, {
             method: "PUT",
-            headers: {
-                "Content-Type": "application/json",
-                "Authorization": `Bearer ${token}`
-            },
+            headers,
             body: JSON.stringify(updateData)
         });
 
-        if (updateRes.ok) {
+        // A próxima leitura busca a versão nova
+        contractCache.delete(id);
+
+        if (updateRes.status === 412) {
+            alert("Este contrato foi alterado por outra pessoa desde que foi aberto. Abra-o novamente para ver a versão atual.");
+            $('#contractModal').modal('hide');
+            refreshContracts();
+        } else if (updateRes.ok) {
             $('#contractModal').modal('hide');
-            loadContracts();
+            refreshContracts();
             alert("Contrato salvo com sucesso!");
         } else {
             alert("Erro ao salvar contrato.");
@@ -333,13 +565,9 @@ async function openEditModal(id) {
             return;
         }
 
-        const res = await fetch(`${apiBaseUrl}/contracts/${id}`, {
-            headers: {
-                "Authorization": `Bearer ${token}`
-            }
-        });
+        const { res, contract } = await fetchContract(id, token);
 
-        if (!res.ok) {
+        if (!contract) {
             if (res.status === 401 || res.status === 403) {
                 alert("Sessão expirada. Faça login novamente.");
                 localStorage.removeItem("accessToken");
@@ -352,8 +580,6 @@ async function openEditModal(id) {
             return;
         }
 
-        const contract = await res.json();
-
         // Oculta o campo de upload
         document.getElementById("fileUploadGroup").style.display = "none";
 
@@ -383,4 +609,7 @@ async function openEditModal(id) {
 }
 
 
-document.addEventListener("DOMContentLoaded", loadContracts);
+document.addEventListener("DOMContentLoaded", () => {
+    connectContractEvents();
+    loadContracts();
+});